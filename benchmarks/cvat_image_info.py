@@ -0,0 +1,54 @@
+"""
+Compares parsing the <image> tag once per shape (how the CVAT parsers used to work)
+with parsing it once per image and sharing it between the shapes.
+
+Usage:
+    python benchmarks/cvat_image_info.py [--images 2000] [--shapes 100]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from cvat_import import generate_cvat_xml
+
+from dagshub_annotation_converter.converters.cvat import _iter_image_elements, parse_image_annotations
+from dagshub_annotation_converter.formats.cvat import annotation_parsers
+from dagshub_annotation_converter.formats.cvat.context import parse_image_tag
+
+
+def parse_per_shape(img):
+    return [annotation_parsers[elem.tag](elem, parse_image_tag(img)) for elem in img]
+
+
+def parse_per_image(img):
+    return parse_image_annotations(img, parse_image_tag(img))
+
+
+def measure(name, fn, path: Path):
+    start = time.perf_counter()
+    count = sum(len(fn(img)) for img in _iter_image_elements(path))
+    elapsed = time.perf_counter() - start
+    print(f"{name:>10}: {elapsed:.2f}s ({count / elapsed:,.0f} shapes/s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=2_000)
+    parser.add_argument("--shapes", type=int, default=100, help="Shapes per image")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "annotations.xml"
+        generate_cvat_xml(path, args.images, args.shapes)
+        print(f"{args.images} images, {args.shapes} shapes each")
+
+        per_shape = measure("per shape", parse_per_shape, path)
+        per_image = measure("per image", parse_per_image, path)
+        print(f"Speedup: {per_shape / per_image:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Measures the peak memory of importing a synthetic CVAT export,
+comparing building the whole XML tree with the streaming loader.
+
+Every measurement runs in a fresh subprocess, so the peak RSS of one doesn't affect the others.
+
+Usage:
+    python benchmarks/cvat_import.py [--images 1000 10000 100000] [--shapes 10]
+"""
+
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def generate_cvat_xml(path: Path, image_count: int, shapes_per_image: int):
+    rng = random.Random(42)
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<annotations>\n  <version>1.1</version>\n')
+        for i in range(image_count):
+            f.write(f'  <image id="{i}" name="images/{i:07d}.jpg" width="1920" height="1080">\n')
+            for j in range(shapes_per_image):
+                x, y = rng.uniform(0, 1800), rng.uniform(0, 1000)
+                if j % 2 == 0:
+                    f.write(
+                        f'    <box label="cat" source="manual" occluded="0" '
+                        f'xtl="{x:.2f}" ytl="{y:.2f}" xbr="{x + 100:.2f}" ybr="{y + 50:.2f}" z_order="0">\n'
+                        f"    </box>\n"
+                    )
+                else:
+                    points = ";".join(f"{x + rng.uniform(0, 100):.2f},{y + rng.uniform(0, 50):.2f}" for _ in range(8))
+                    f.write(
+                        f'    <polygon label="dog" source="manual" occluded="0" points="{points}" z_order="0">\n'
+                        f"    </polygon>\n"
+                    )
+            f.write("  </image>\n")
+        f.write("</annotations>\n")
+
+
+def run_tree(path: Path) -> int:
+    # How the loader worked before streaming: read everything, build the full tree, then walk it
+    import lxml.etree
+
+    from dagshub_annotation_converter.converters.cvat import parse_image_annotations
+
+    count = 0
+    with open(path, "rb") as f:
+        root = lxml.etree.XML(f.read())
+    for image_node in root.xpath("//image"):
+        count += len(parse_image_annotations(image_node))
+    return count
+
+
+def run_stream(path: Path) -> int:
+    from dagshub_annotation_converter.converters.cvat import iter_cvat_from_xml_file
+
+    return sum(len(anns) for _, anns in iter_cvat_from_xml_file(path))
+
+
+MODES = {"tree": run_tree, "stream": run_stream}
+
+
+def measure_in_subprocess(mode: str, path: Path):
+    out = subprocess.run(
+        [sys.executable, __file__, "--measure", mode, str(path)], check=True, capture_output=True, text=True
+    ).stdout
+    elapsed, peak_kb = out.split()
+    return float(elapsed), int(peak_kb)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--shapes", type=int, default=10, help="Shapes per image")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure is not None:
+        mode, path = args.measure
+        start = time.perf_counter()
+        MODES[mode](Path(path))
+        elapsed = time.perf_counter() - start
+        print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for image_count in args.images:
+            path = Path(tmp) / f"annotations_{image_count}.xml"
+            generate_cvat_xml(path, image_count, args.shapes)
+            size_mb = path.stat().st_size / 2**20
+            print(f"{image_count} images, {args.shapes} shapes each ({size_mb:.1f} MB):")
+            for mode in MODES:
+                elapsed, peak_kb = measure_in_subprocess(mode, path)
+                print(f"  {mode:>6}: {elapsed:.2f}s, peak RSS {peak_kb / 1024:.0f} MB")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
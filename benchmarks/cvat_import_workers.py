@@ -0,0 +1,46 @@
+"""
+Measures how CVAT import scales with the amount of worker processes,
+both for loading IR annotation objects and for loading a columnar table.
+
+Usage:
+    python benchmarks/cvat_import_workers.py [--images 20000] [--shapes 20] [--workers 1 2 4 8]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from cvat_import import generate_cvat_xml
+
+from dagshub_annotation_converter.converters.cvat import load_cvat_from_xml_file, load_cvat_table_from_xml_file
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=20_000)
+    parser.add_argument("--shapes", type=int, default=20, help="Shapes per image")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "annotations.xml"
+        print(f"Generating {args.images} images with {args.shapes} shapes each")
+        generate_cvat_xml(path, args.images, args.shapes)
+
+        for name, load_fn in (("IR", load_cvat_from_xml_file), ("table", load_cvat_table_from_xml_file)):
+            baseline = None
+            for workers in args.workers:
+                start = time.perf_counter()
+                load_fn(path, workers=workers)
+                elapsed = time.perf_counter() - start
+                if baseline is None:
+                    baseline = elapsed
+                print(
+                    f"{name:>5} workers={workers}: {elapsed:.2f}s ({args.images / elapsed:,.0f} images/s, "
+                    f"{baseline / elapsed:.2f}x vs {args.workers[0]} worker(s))"
+                )
+
+
+if __name__ == "__main__":
+    main()
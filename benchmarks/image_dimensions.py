@@ -0,0 +1,74 @@
+"""
+Compares header-only image dimension probing with opening every image through PIL.
+
+Usage:
+    python benchmarks/image_dimensions.py [--count 100000] [--dir /path/to/scratch]
+"""
+
+import argparse
+import io
+import tempfile
+import time
+from pathlib import Path
+
+import PIL.Image
+
+from dagshub_annotation_converter.util.image_dimensions import get_image_dimensions
+
+FORMATS = {
+    ".jpg": {"format": "JPEG"},
+    ".png": {"format": "PNG"},
+    ".webp": {"format": "WEBP"},
+    ".bmp": {"format": "BMP"},
+    ".tiff": {"format": "TIFF"},
+}
+
+
+def generate_images(directory: Path, count: int):
+    # Encode every format once and copy the bytes around, encoding 100k images would take longer than the benchmark
+    templates = []
+    for ext, save_kwargs in FORMATS.items():
+        buf = io.BytesIO()
+        PIL.Image.new("RGB", (640, 480), color=(120, 30, 200)).save(buf, **save_kwargs)
+        templates.append((ext, buf.getvalue()))
+
+    paths = []
+    for i in range(count):
+        ext, content = templates[i % len(templates)]
+        path = directory / f"{i:07d}{ext}"
+        path.write_bytes(content)
+        paths.append(path)
+    return paths
+
+
+def pil_dimensions(path: Path):
+    img = PIL.Image.open(path)
+    return img.size
+
+
+def measure(name, fn, paths):
+    start = time.perf_counter()
+    for p in paths:
+        fn(p)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>8}: {elapsed:.2f}s ({len(paths) / elapsed:,.0f} images/s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--dir", type=Path, default=None, help="Scratch directory (defaults to a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        print(f"Generating {args.count} images in {tmp}")
+        paths = generate_images(Path(tmp), args.count)
+
+        pil_time = measure("PIL", pil_dimensions, paths)
+        probe_time = measure("header", get_image_dimensions, paths)
+        print(f"Speedup: {pil_time / probe_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compares exporting IR annotations to Label Studio tasks through the result models
+with serializing them directly, from annotation objects and from a table.
+
+Usage:
+    python benchmarks/ls_export.py [--tasks 5000] [--annotations 20]
+"""
+
+import argparse
+import io
+import random
+import time
+
+from dagshub_annotation_converter.converters.label_studio import export_ls_tasks, export_ls_tasks_from_table
+from dagshub_annotation_converter.formats.label_studio.task import LabelStudioTask
+from dagshub_annotation_converter.ir.image import (
+    IRBBoxImageAnnotation,
+    IRSegmentationImageAnnotation,
+    IRSegmentationPoint,
+    CoordinateStyle,
+    IRAnnotationTable,
+)
+
+
+def generate_annotations(task_count, annotations_per_task):
+    rng = random.Random(42)
+    res = []
+    for i in range(task_count):
+        anns = []
+        for j in range(annotations_per_task):
+            common = {
+                "categories": {f"class_{rng.randrange(5)}": 1.0},
+                "coordinate_style": CoordinateStyle.DENORMALIZED,
+                "image_width": 1920,
+                "image_height": 1080,
+                "filename": f"images/{i:07d}.jpg",
+            }
+            x, y = rng.uniform(0, 1800), rng.uniform(0, 1000)
+            if j % 2 == 0:
+                anns.append(IRBBoxImageAnnotation(left=x, top=y, width=100, height=50, **common))
+            else:
+                points = [IRSegmentationPoint(x=x + rng.uniform(0, 100), y=y + rng.uniform(0, 80)) for _ in range(8)]
+                anns.append(IRSegmentationImageAnnotation(points=points, **common))
+        res.append(anns)
+    return res
+
+
+def run_models(annotations):
+    f = io.StringIO()
+    f.write("[")
+    for i, anns in enumerate(annotations):
+        task = LabelStudioTask(data={"image": anns[0].filename})
+        task.add_ir_annotations(anns)
+        if i > 0:
+            f.write(",")
+        f.write(task.model_dump_json())
+    f.write("]")
+
+
+def run_direct(annotations):
+    export_ls_tasks(io.StringIO(), ((LabelStudioTask(data={"image": anns[0].filename}), anns) for anns in annotations))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--annotations", type=int, default=20, help="Annotations per task")
+    args = parser.parse_args()
+
+    annotations = generate_annotations(args.tasks, args.annotations)
+    table = IRAnnotationTable.from_annotations([ann for anns in annotations for ann in anns])
+    total = args.tasks * args.annotations
+
+    modes = {
+        "models": lambda: run_models(annotations),
+        "direct": lambda: run_direct(annotations),
+        "table": lambda: export_ls_tasks_from_table(io.StringIO(), table),
+    }
+    print(f"{args.tasks} tasks, {args.annotations} annotations each:")
+    for mode, fn in modes.items():
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"  {mode:>6}: {elapsed:.2f}s ({total / elapsed:,.0f} annotations/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures parsing a synthetic Label Studio export (a JSON array of tasks),
+comparing parsing the tasks one by one with parsing the whole array at once.
+
+Usage:
+    python benchmarks/ls_parse.py [--tasks 200000] [--results 5]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from dagshub_annotation_converter.formats.label_studio.task import parse_ls_task, parse_ls_tasks_bulk
+
+
+def generate_tasks(task_count: int, results_per_task: int) -> bytes:
+    rng = random.Random(42)
+    tasks = []
+    for i in range(task_count):
+        results = []
+        for j in range(results_per_task):
+            x, y = rng.uniform(0, 90), rng.uniform(0, 90)
+            if j % 2 == 0:
+                ann_type = "rectanglelabels"
+                value = {"x": x, "y": y, "width": 10, "height": 10, "rectanglelabels": ["cat"]}
+            else:
+                ann_type = "polygonlabels"
+                points = [[x + rng.uniform(0, 10), y + rng.uniform(0, 10)] for _ in range(8)]
+                value = {"points": points, "polygonlabels": ["dog"]}
+            results.append(
+                {
+                    "original_width": 1920,
+                    "original_height": 1080,
+                    "image_rotation": 0.0,
+                    "type": ann_type,
+                    "id": f"{i}-{j}",
+                    "origin": "manual",
+                    "to_name": "image",
+                    "from_name": "label",
+                    "value": value,
+                }
+            )
+        tasks.append(
+            {
+                "annotations": [{"completed_by": 1, "result": results, "ground_truth": False}],
+                "data": {"image": f"images/{i:07d}.jpg"},
+                "created_at": "2021-10-01T00:00:00Z",
+                "updated_at": "2021-10-01T00:00:00Z",
+                "id": i,
+            }
+        )
+    return json.dumps(tasks).encode()
+
+
+def run_single(data: bytes) -> int:
+    return len([parse_ls_task(json.dumps(task)) for task in json.loads(data)])
+
+
+def run_bulk(data: bytes) -> int:
+    return len(parse_ls_tasks_bulk(data))
+
+
+def run_bulk_pause_gc(data: bytes) -> int:
+    return len(parse_ls_tasks_bulk(data, pause_gc=True))
+
+
+MODES = {"single": run_single, "bulk": run_bulk, "bulk_pause_gc": run_bulk_pause_gc}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--results", type=int, default=5, help="Results per task")
+    args = parser.parse_args()
+
+    data = generate_tasks(args.tasks, args.results)
+    print(f"{args.tasks} tasks, {args.results} results each ({len(data) / 2**20:.1f} MB):")
+    for mode, fn in MODES.items():
+        start = time.perf_counter()
+        assert fn(data) == args.tasks
+        elapsed = time.perf_counter() - start
+        print(f"  {mode:>13}: {elapsed:.2f}s ({args.tasks / elapsed:,.0f} tasks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures converting Label Studio tasks with many poses (crowd scenes) to IR annotations,
+which reconstructs the poses from their bounding boxes and keypoints.
+
+Usage:
+    python benchmarks/ls_pose_reimport.py [--tasks 20] [--poses 500] [--keypoints 17]
+"""
+
+import argparse
+import random
+import time
+
+from dagshub_annotation_converter.formats.label_studio.task import LabelStudioTask
+from dagshub_annotation_converter.ir.image import IRPoseImageAnnotation, IRPosePoint, CoordinateStyle
+
+
+def generate_task(pose_count: int, keypoint_count: int, rng: random.Random) -> LabelStudioTask:
+    task = LabelStudioTask(data={"image": "images/crowd.jpg"})
+    for _ in range(pose_count):
+        x, y = rng.uniform(0, 1800), rng.uniform(0, 900)
+        task.add_ir_annotation(
+            IRPoseImageAnnotation.from_points(
+                categories={"person": 1.0},
+                points=[
+                    IRPosePoint(x=x + rng.uniform(0, 100), y=y + rng.uniform(0, 150)) for _ in range(keypoint_count)
+                ],
+                coordinate_style=CoordinateStyle.DENORMALIZED,
+                image_width=1920,
+                image_height=1080,
+            )
+        )
+    return task
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--poses", type=int, default=500, help="Poses per task")
+    parser.add_argument("--keypoints", type=int, default=17, help="Keypoints per pose")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    tasks = [generate_task(args.poses, args.keypoints, rng) for _ in range(args.tasks)]
+
+    start = time.perf_counter()
+    for task in tasks:
+        annotations = task.to_ir_annotations()
+        assert len(annotations) == args.poses
+    elapsed = time.perf_counter() - start
+    print(
+        f"{args.tasks} tasks, {args.poses} poses x {args.keypoints} keypoints: "
+        f"{elapsed:.2f}s ({args.tasks / elapsed:,.1f} tasks/s, {args.tasks * args.poses / elapsed:,.0f} poses/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
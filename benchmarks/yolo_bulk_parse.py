@@ -0,0 +1,62 @@
+"""
+Compares parsing YOLO bounding box label files line by line with the bulk NumPy parser.
+
+Usage:
+    python benchmarks/yolo_bulk_parse.py [--files 2000] [--boxes 100] [--classes 5]
+"""
+
+import argparse
+import random
+import time
+
+from dagshub_annotation_converter.formats.yolo import YoloContext, import_bbox_from_string
+from dagshub_annotation_converter.formats.yolo.bulk import import_annotations_from_text, parse_bbox_labels
+
+
+def measure(name, fn, texts, total_boxes, baseline=None):
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    elapsed = time.perf_counter() - start
+    speedup = f", {baseline / elapsed:.1f}x" if baseline is not None else ""
+    print(f"{name:>18}: {elapsed:.2f}s ({total_boxes / elapsed:,.0f} boxes/s{speedup})")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--boxes", type=int, default=100, help="Boxes per label file")
+    parser.add_argument("--classes", type=int, default=5, help="Classes used in the labels")
+    args = parser.parse_args()
+
+    context = YoloContext(annotation_type="bbox")
+    for i in range(args.classes):
+        context.categories.add(f"class_{i}")
+
+    rng = random.Random(42)
+    texts = [
+        "\n".join(
+            f"{rng.randrange(args.classes)} {rng.random():.6f} {rng.random():.6f} {rng.random():.6f} {rng.random():.6f}"
+            for _ in range(args.boxes)
+        )
+        for _ in range(args.files)
+    ]
+    total_boxes = args.files * args.boxes
+
+    def line_by_line(text):
+        return [import_bbox_from_string(line, context, 640, 480).with_filename("img.jpg") for line in text.split("\n")]
+
+    baseline = measure("line by line", line_by_line, texts, total_boxes)
+    measure("bulk (arrays only)", parse_bbox_labels, texts, total_boxes, baseline)
+    measure(
+        "bulk (IR)",
+        lambda text: import_annotations_from_text(text, context, 640, 480, filename="img.jpg"),
+        texts,
+        total_boxes,
+        baseline,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Measures registering categories one by one and in bulk, for growing numbers of categories.
+The time per category should stay the same as the number of categories grows.
+
+Usage:
+    python benchmarks/yolo_categories.py [--max-categories 64000]
+"""
+
+import argparse
+import time
+
+from dagshub_annotation_converter.formats.yolo.categories import Categories
+
+
+def run_add(n):
+    categories = Categories()
+    for i in range(n):
+        categories.add(f"class_{i}")
+
+
+def run_get_or_create(n):
+    categories = Categories()
+    for i in range(n):
+        # Every name is looked up twice, once creating it and once finding it
+        categories.get_or_create(f"class_{i}")
+        categories.get_or_create(f"class_{i // 2}")
+
+
+def run_extend(n):
+    Categories().extend(f"class_{i}" for i in range(n))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-categories", type=int, default=64000)
+    args = parser.parse_args()
+
+    modes = {"add": run_add, "get_or_create": run_get_or_create, "extend": run_extend}
+    n = 1000
+    while n <= args.max_categories:
+        timings = []
+        for mode, fn in modes.items():
+            start = time.perf_counter()
+            fn(n)
+            elapsed = time.perf_counter() - start
+            timings.append(f"{mode} {elapsed * 1e6 / n:6.2f}us")
+        print(f"{n:>7} categories, per category: {', '.join(timings)}")
+        n *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compares serializing YOLO label files with full float precision and with a fixed amount of decimals,
+both from annotation objects and from a table.
+
+Usage:
+    python benchmarks/yolo_export_precision.py [--files 2000] [--annotations 50] [--type pose] [--precision 6]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from dagshub_annotation_converter.converters.yolo import annotations_to_string
+from dagshub_annotation_converter.formats.yolo import YoloContext
+from dagshub_annotation_converter.formats.yolo.bulk import table_to_string
+from dagshub_annotation_converter.ir.image import (
+    IRAnnotationTable,
+    IRBBoxImageAnnotation,
+    IRPoseImageAnnotation,
+    IRPosePoint,
+    IRSegmentationImageAnnotation,
+    IRSegmentationPoint,
+    CoordinateStyle,
+)
+
+
+def generate_annotations(annotation_type, annotation_count, rng):
+    common = {
+        "categories": {f"class_{rng.randrange(5)}": 1.0},
+        "coordinate_style": CoordinateStyle.NORMALIZED,
+        "image_width": 640,
+        "image_height": 480,
+        "filename": "image.jpg",
+    }
+    res = []
+    for _ in range(annotation_count):
+        coords = [(rng.random(), rng.random()) for _ in range(17)]
+        if annotation_type == "bbox":
+            left, top = rng.random() / 2, rng.random() / 2
+            res.append(IRBBoxImageAnnotation(left=left, top=top, width=0.3, height=0.2, **common))
+        elif annotation_type == "segmentation":
+            res.append(
+                IRSegmentationImageAnnotation(points=[IRSegmentationPoint(x=x, y=y) for x, y in coords], **common)
+            )
+        else:
+            res.append(IRPoseImageAnnotation.from_points(points=[IRPosePoint(x=x, y=y) for x, y in coords], **common))
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--annotations", type=int, default=50, help="Annotations per file")
+    parser.add_argument("--type", choices=["bbox", "segmentation", "pose"], default="pose")
+    parser.add_argument("--precision", type=int, default=6)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    files = [generate_annotations(args.type, args.annotations, rng) for _ in range(args.files)]
+    tables = [IRAnnotationTable.from_annotations(anns) for anns in files]
+
+    for precision in [None, args.precision]:
+        context = YoloContext(annotation_type=args.type, float_precision=precision)
+        context.categories.extend(f"class_{i}" for i in range(5))
+        modes = {
+            "objects": lambda: [annotations_to_string(anns, context) for anns in files],
+            "table": lambda: [table_to_string(table, np.arange(len(table)), context) for table in tables],
+        }
+        for mode, fn in modes.items():
+            start = time.perf_counter()
+            contents = fn()
+            elapsed = time.perf_counter() - start
+            size = sum(len(content) for content in contents)
+            print(
+                f"precision={precision}, {mode:>7}: {elapsed:.2f}s ({args.files / elapsed:,.0f} files/s), "
+                f"{size / 2**20:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
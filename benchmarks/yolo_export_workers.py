@@ -0,0 +1,70 @@
+"""
+Measures how YOLO filesystem export scales with the amount of writer threads.
+Point ``--dir`` to a network filesystem to see the effect of the write latency.
+
+Usage:
+    python benchmarks/yolo_export_workers.py [--images 50000] [--boxes 20] [--workers 1 4 16] [--atomic] [--dir DIR]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from dagshub_annotation_converter.converters.yolo import export_to_fs
+from dagshub_annotation_converter.formats.yolo import YoloContext
+from dagshub_annotation_converter.ir.image import IRAnnotationTable, IRBBoxImageAnnotation, CoordinateStyle
+
+
+def generate_table(image_count: int, boxes_per_image: int) -> IRAnnotationTable:
+    rng = random.Random(42)
+    return IRAnnotationTable.from_annotations(
+        IRBBoxImageAnnotation(
+            filename=f"images/{i % 100:02d}/{i:07d}.jpg",
+            categories={f"class_{rng.randrange(5)}": 1.0},
+            left=rng.random() / 2,
+            top=rng.random() / 2,
+            width=rng.random() / 2,
+            height=rng.random() / 2,
+            image_width=640,
+            image_height=480,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+        )
+        for i in range(image_count)
+        for _ in range(boxes_per_image)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=50_000)
+    parser.add_argument("--boxes", type=int, default=20, help="Bounding boxes per image")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--atomic", action="store_true", help="Write the files atomically")
+    parser.add_argument("--dir", default=None, help="Directory to export into. Defaults to a temporary directory")
+    args = parser.parse_args()
+
+    print(f"Generating {args.images} images with {args.boxes} boxes each")
+    table = generate_table(args.images, args.boxes)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        baseline = None
+        for workers in args.workers:
+            context = YoloContext(annotation_type="bbox", path=Path("data"))
+            context.categories.extend(f"class_{i}" for i in range(5))
+
+            start = time.perf_counter()
+            export_dir = Path(tmp) / f"workers_{workers}"
+            export_to_fs(context, table, export_dir=export_dir, workers=workers, atomic_writes=args.atomic)
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline = elapsed
+            print(
+                f"workers={workers}: {elapsed:.2f}s ({args.images / elapsed:,.0f} files/s, "
+                f"{baseline / elapsed:.2f}x vs {args.workers[0]} worker(s))"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures how YOLO filesystem import scales with the amount of workers.
+
+Usage:
+    python benchmarks/yolo_import_workers.py [--images 20000] [--boxes 20] [--workers 1 2 4 8]
+"""
+
+import argparse
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import PIL.Image
+
+from dagshub_annotation_converter.converters.yolo import load_yolo_from_fs, load_yolo_table_from_fs
+from dagshub_annotation_converter.formats.yolo import YoloContext
+
+
+def generate_dataset(root: Path, image_count: int, boxes_per_image: int) -> Path:
+    images_dir = root / "data" / "images"
+    labels_dir = root / "data" / "labels"
+    images_dir.mkdir(parents=True)
+    labels_dir.mkdir(parents=True)
+
+    buf = io.BytesIO()
+    PIL.Image.new("RGB", (640, 480)).save(buf, format="JPEG")
+    image_bytes = buf.getvalue()
+
+    rng = random.Random(42)
+    for i in range(image_count):
+        (images_dir / f"{i:07d}.jpg").write_bytes(image_bytes)
+        lines = [
+            f"{rng.randint(0, 1)} {rng.random()} {rng.random()} {rng.random()} {rng.random()}"
+            for _ in range(boxes_per_image)
+        ]
+        (labels_dir / f"{i:07d}.txt").write_text("\n".join(lines))
+
+    meta_file = root / "annotations.yaml"
+    meta_file.write_text("names:\n  0: cat\n  1: dog\npath: data\n")
+    return meta_file
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=20_000)
+    parser.add_argument("--boxes", type=int, default=20, help="Bounding boxes per image")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating {args.images} images with {args.boxes} boxes each")
+        meta_file = generate_dataset(Path(tmp), args.images, args.boxes)
+
+        context = YoloContext.from_yaml_file(meta_file, annotation_type="bbox")
+
+        def load_annotations(workers: int):
+            annotations, _ = load_yolo_from_fs("bbox", meta_file, workers=workers)
+            assert len(annotations) == args.images
+
+        def load_table(workers: int):
+            table = load_yolo_table_from_fs(context, meta_file.parent, workers=workers)
+            assert len(table) == args.images * args.boxes
+
+        for name, load in [("annotations", load_annotations), ("table", load_table)]:
+            baseline = None
+            for workers in args.workers:
+                start = time.perf_counter()
+                load(workers)
+                elapsed = time.perf_counter() - start
+                if baseline is None:
+                    baseline = elapsed
+                print(
+                    f"{name}, workers={workers}: {elapsed:.2f}s ({args.images / elapsed:,.0f} images/s, "
+                    f"{baseline / elapsed:.2f}x vs {args.workers[0]} worker(s))"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Measures importing ultralytics inference results, one result at a time and as whole batches.
+
+Usage:
+    python benchmarks/yolo_result_import.py [--results 500] [--detections 100] [--type pose] [--batch 32]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+from dagshub_annotation_converter.formats.yolo import import_yolo_result, import_yolo_results
+
+
+def generate_result(annotation_type: str, detection_count: int, generator: torch.Generator) -> Results:
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
+    top_left = torch.rand((detection_count, 2), generator=generator) * 400
+    size = torch.rand((detection_count, 2), generator=generator) * 200 + 1
+    conf = torch.rand((detection_count, 1), generator=generator)
+    cls = torch.randint(0, 2, (detection_count, 1), generator=generator).float()
+    boxes = torch.cat([top_left, top_left + size, conf, cls], dim=1)
+
+    kwargs = {}
+    if annotation_type == "segmentation":
+        masks = torch.zeros((detection_count, 480, 640), dtype=torch.uint8)
+        for i, (x, y) in enumerate(top_left.int().tolist()):
+            masks[i, y : y + 50, x : x + 50] = 1
+        kwargs["masks"] = masks
+    elif annotation_type == "pose":
+        keypoints = torch.rand((detection_count, 17, 3), generator=generator) * torch.tensor([640, 480, 1])
+        kwargs["keypoints"] = keypoints
+    return Results(orig_img=img, path="image.jpg", names={0: "cat", 1: "dog"}, boxes=boxes, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", type=int, default=500)
+    parser.add_argument("--detections", type=int, default=100, help="Detections per result")
+    parser.add_argument("--type", choices=["bbox", "segmentation", "pose"], default="pose")
+    parser.add_argument("--batch", type=int, default=32, help="Results per batch")
+    args = parser.parse_args()
+
+    generator = torch.Generator().manual_seed(42)
+    results = [generate_result(args.type, args.detections, generator) for _ in range(args.results)]
+    total = args.results * args.detections
+
+    def one_by_one():
+        for result in results:
+            import_yolo_result(args.type, result)
+
+    def batched():
+        for i in range(0, len(results), args.batch):
+            import_yolo_results(args.type, results[i : i + args.batch])
+
+    for name, fn in {"one by one": one_by_one, "batched": batched}.items():
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:>10}: {elapsed:.2f}s ({args.results / elapsed:,.0f} results/s, "
+            f"{total / elapsed:,.0f} annotations/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
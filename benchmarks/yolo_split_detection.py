@@ -0,0 +1,46 @@
+"""
+Compares guessing the train/val/test split of a dataset from all of its image paths at once
+with feeding the paths to the incremental split detector one by one.
+
+Usage:
+    python benchmarks/yolo_split_detection.py [--images 1000000]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from dagshub_annotation_converter.converters.yolo import _get_common_folder_with_part, _SplitDetector
+
+
+def guess_from_all_paths(image_paths):
+    paths = [Path(p) for p in image_paths]
+    return tuple(_get_common_folder_with_part(paths, split) for split in ("train", "val", "test"))
+
+
+def guess_incrementally(image_paths):
+    detector = _SplitDetector()
+    for path in image_paths:
+        detector.add(path)
+    return detector.guess()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    splits = ["train"] * 8 + ["val"] + ["test"]
+    image_paths = [f"images/{splits[i % len(splits)]}/{i // 1000:04d}/{i:08d}.jpg" for i in range(args.images)]
+
+    results = []
+    for name, fn in {"all paths": guess_from_all_paths, "incremental": guess_incrementally}.items():
+        start = time.perf_counter()
+        results.append(fn(image_paths))
+        elapsed = time.perf_counter() - start
+        print(f"{name:>12}: {elapsed:.2f}s ({args.images / elapsed:,.0f} paths/s)")
+    assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
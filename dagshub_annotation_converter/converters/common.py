@@ -1,7 +1,10 @@
-from typing import Sequence, Mapping, List, Dict
+import itertools
+from typing import Sequence, Mapping, List, Dict, Iterable, Iterator, TypeVar, Tuple, Optional
 
 from dagshub_annotation_converter.ir.image import IRImageAnnotationBase
 
+T = TypeVar("T")
+
 
 def group_annotations_by_filename(
     annotations: Sequence[IRImageAnnotationBase],
@@ -14,3 +17,41 @@ def group_annotations_by_filename(
             res[ann.filename] = []
         res[ann.filename].append(ann)
     return res
+
+
+def group_sorted_annotations(
+    annotations: Iterable[IRImageAnnotationBase],
+) -> Iterator[Tuple[str, List[IRImageAnnotationBase]]]:
+    """
+    Lazily groups a stream of annotations sorted by the filename,
+    only keeping the annotations of the current file in memory.
+    Raises a ValueError as soon as a filename comes after a bigger one.
+
+    :return: Iterator of (filename, annotations of the file)
+    """
+    current_filename: Optional[str] = None
+    current: List[IRImageAnnotationBase] = []
+    for ann in annotations:
+        if ann.filename is None:
+            raise ValueError(f"An annotation {ann} doesn't have a filename associated, aborting")
+        if ann.filename != current_filename:
+            if current_filename is not None:
+                if ann.filename < current_filename:
+                    raise ValueError(
+                        f"{ann.filename} comes after {current_filename}, the stream has to be sorted by the filename"
+                    )
+                yield current_filename, current
+            current_filename = ann.filename
+            current = []
+        current.append(ann)
+    if current_filename is not None:
+        yield current_filename, current
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
@@ -1,49 +1,231 @@
+import io
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
 from os import PathLike
-from typing import Sequence, List, Dict, Union
+from typing import Sequence, List, Dict, Union, Iterator, Tuple, BinaryIO, Optional, Deque, Callable, TypeVar, Iterable
 from zipfile import ZipFile
 
 import lxml.etree
 
 from dagshub_annotation_converter.formats.cvat import annotation_parsers
-from dagshub_annotation_converter.formats.cvat.context import parse_image_tag
-from dagshub_annotation_converter.ir.image import IRImageAnnotationBase
+from dagshub_annotation_converter.formats.cvat.context import CVATImageInfo, parse_image_tag
+from dagshub_annotation_converter.formats.cvat.table import add_cvat_annotation_to_table
+from dagshub_annotation_converter.ir.image import IRImageAnnotationBase, IRAnnotationTable, IRAnnotationTableBuilder
 
 
 logger = logging.getLogger(__name__)
 
+# Path to the XML file, or a binary file-like object with its contents
+XMLSource = Union[str, PathLike, BinaryIO]
 
-def parse_image_annotations(img: lxml.etree.ElementBase) -> Sequence[IRImageAnnotationBase]:
+T = TypeVar("T")
+
+
+def parse_image_annotations(
+    img: lxml.etree.ElementBase, image_info: Optional[CVATImageInfo] = None
+) -> Sequence[IRImageAnnotationBase]:
+    if image_info is None:
+        image_info = parse_image_tag(img)
     annotations: List[IRImageAnnotationBase] = []
     for annotation_elem in img:
         annotation_type = annotation_elem.tag
         if annotation_type not in annotation_parsers:
             logger.warning(f"Unknown CVAT annotation type {annotation_type}")
             continue
-        annotations.append(annotation_parsers[annotation_type](annotation_elem, img))
+        annotations.append(annotation_parsers[annotation_type](annotation_elem, image_info))
 
     return annotations
 
 
+def _iter_image_elements(xml_source: XMLSource) -> Iterator[lxml.etree.ElementBase]:
+    """
+    Incrementally parses the XML, yielding the ``<image>`` elements in document order.
+
+    Every element gets cleared after it's been processed, along with all of the preceding elements,
+    so the memory usage stays flat regardless of the size of the document.
+    """
+    for _, image_node in lxml.etree.iterparse(xml_source, events=("end",), tag="image"):
+        yield image_node
+        image_node.clear(keep_tail=True)
+        # Also drop the (now empty) references to the processed elements from their parent
+        while image_node.getprevious() is not None:
+            del image_node.getparent()[0]
+
+
+def iter_cvat_from_xml_file(
+    xml_file: XMLSource,
+    workers: int = 1,
+) -> Iterator[Tuple[str, Sequence[IRImageAnnotationBase]]]:
+    """
+    Lazily loads the annotations of a CVAT XML file, one image at a time.
+    The file is parsed incrementally and never read into memory as a whole.
+
+    :param xml_file: Path to the file, or a binary file-like object
+    :param workers: Amount of processes to parse the annotations with. With more than one worker,
+        the ``<image>`` elements are sent to a process pool in chunks, while the XML is read in the main process.
+        The workers parse the elements into tables, and the annotation objects are created from the tables
+        in the main process.
+        Reading the XML and creating the annotation objects can't be parallelized. Together they take about
+        95% of the serial time (``benchmarks/cvat_import_workers.py``, 20 shapes per image), so loading
+        annotation objects barely gets faster with more workers. The table loaders
+        (e.g. :func:`load_cvat_table_from_xml_file`) never create the objects: only reading the XML and
+        concatenating the tables stay in the main process, about half of their serial time.
+        The order of the results stays the same regardless of the amount of workers.
+    :return: Iterator of (image name, annotations of the image)
+    """
+    if workers > 1:
+        yield from _parse_images_parallel(xml_file, workers)
+        return
+    for image_node in _iter_image_elements(xml_file):
+        image_info = parse_image_tag(image_node)
+        yield image_info.name, parse_image_annotations(image_node, image_info)
+
+
+def iter_cvat_from_zip(
+    zip_path: Union[str, PathLike],
+    workers: int = 1,
+) -> Iterator[Tuple[str, Sequence[IRImageAnnotationBase]]]:
+    """
+    Lazily loads the annotations of a CVAT export zip, one image at a time.
+    The ``annotations.xml`` file is decompressed and parsed in a streaming fashion.
+
+    :param workers: Amount of processes to parse the annotations with. See :func:`iter_cvat_from_xml_file`
+    :return: Iterator of (image name, annotations of the image)
+    """
+    with ZipFile(zip_path) as proj_zip:
+        with proj_zip.open("annotations.xml") as f:
+            yield from iter_cvat_from_xml_file(f, workers=workers)
+
+
 def load_cvat_from_xml_string(
     xml_text: bytes,
+    workers: int = 1,
+) -> Dict[str, Sequence[IRImageAnnotationBase]]:
+    return dict(iter_cvat_from_xml_file(io.BytesIO(xml_text), workers=workers))
+
+
+def load_cvat_from_xml_file(
+    xml_file: Union[str, PathLike],
+    workers: int = 1,
+) -> Dict[str, Sequence[IRImageAnnotationBase]]:
+    return dict(iter_cvat_from_xml_file(xml_file, workers=workers))
+
+
+def load_cvat_from_zip(
+    zip_path: Union[str, PathLike],
+    workers: int = 1,
 ) -> Dict[str, Sequence[IRImageAnnotationBase]]:
-    annotations = {}
-    root_elem = lxml.etree.XML(xml_text)
+    return dict(iter_cvat_from_zip(zip_path, workers=workers))
 
-    for image_node in root_elem.xpath("//image"):
+
+# Result of parsing a chunk of images in a worker: names of the images, amount of annotations of each image,
+# and all annotations of the chunk as a table, which is much cheaper to send between processes than model objects
+_ParsedChunk = Tuple[List[str], List[int], IRAnnotationTable]
+
+
+def _parse_image_chunk(image_xmls: List[bytes]) -> _ParsedChunk:
+    """
+    Parses serialized ``<image>`` elements straight into a table, without creating annotation objects.
+    Runs in the worker processes.
+    """
+    builder = IRAnnotationTableBuilder()
+    images = _add_images_to_table(builder, (lxml.etree.fromstring(image_xml) for image_xml in image_xmls))
+    return [name for name, _ in images], [count for _, count in images], builder.build()
+
+
+def _unpack_chunk(chunk: _ParsedChunk) -> Iterator[Tuple[str, Sequence[IRImageAnnotationBase]]]:
+    names, counts, table = chunk
+    annotations = table.to_annotations()
+    start = 0
+    for name, count in zip(names, counts):
+        yield name, annotations[start : start + count]
+        start += count
+
+
+def _parse_images_parallel(
+    xml_source: XMLSource,
+    workers: int,
+) -> Iterator[Tuple[str, Sequence[IRImageAnnotationBase]]]:
+    for chunk in _map_image_chunks(xml_source, workers, _parse_image_chunk):
+        yield from _unpack_chunk(chunk)
+
+
+def _map_image_chunks(
+    xml_source: XMLSource,
+    workers: int,
+    parse_fn: Callable[[List[bytes]], T],
+    chunk_size: int = 256,
+) -> Iterator[T]:
+    """
+    Serializes chunks of ``<image>`` elements and parses them with ``parse_fn`` in a process pool.
+    At most ``2 * workers`` chunks are in flight at once, so the memory usage stays bounded.
+    Results are yielded in document order.
+    """
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque["Future[T]"] = deque()
+        chunk: List[bytes] = []
+        for image_node in _iter_image_elements(xml_source):
+            chunk.append(lxml.etree.tostring(image_node, with_tail=False))
+            if len(chunk) < chunk_size:
+                continue
+            pending.append(pool.submit(parse_fn, chunk))
+            chunk = []
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        if chunk:
+            pending.append(pool.submit(parse_fn, chunk))
+        while pending:
+            yield pending.popleft().result()
+
+
+def _add_images_to_table(
+    builder: IRAnnotationTableBuilder, image_nodes: Iterable[lxml.etree.ElementBase]
+) -> List[Tuple[str, int]]:
+    """
+    Adds the annotations of the images as rows of the table.
+
+    :return: Name of every image, along with the amount of rows that were added for it
+    """
+    images = []
+    for image_node in image_nodes:
         image_info = parse_image_tag(image_node)
-        annotations[image_info.name] = parse_image_annotations(image_node)
+        count = 0
+        for annotation_elem in image_node:
+            count += add_cvat_annotation_to_table(builder, annotation_elem, image_info)
+        images.append((image_info.name, count))
+    return images
 
-    return annotations
+
+def _parse_image_chunk_to_table(image_xmls: List[bytes]) -> IRAnnotationTable:
+    builder = IRAnnotationTableBuilder()
+    _add_images_to_table(builder, (lxml.etree.fromstring(image_xml) for image_xml in image_xmls))
+    return builder.build()
+
+
+def _load_cvat_table(xml_source: XMLSource, workers: int = 1) -> IRAnnotationTable:
+    if workers > 1:
+        return IRAnnotationTable.concat(list(_map_image_chunks(xml_source, workers, _parse_image_chunk_to_table)))
+    builder = IRAnnotationTableBuilder()
+    _add_images_to_table(builder, _iter_image_elements(xml_source))
+    return builder.build()
+
+
+def load_cvat_table_from_xml_string(xml_text: bytes, workers: int = 1) -> IRAnnotationTable:
+    """
+    Loads all annotations of a CVAT XML into a single columnar table, without creating annotation objects.
+
+    :param workers: Amount of processes to parse the annotations with. See :func:`iter_cvat_from_xml_file`
+    """
+    return _load_cvat_table(io.BytesIO(xml_text), workers)
 
 
-def load_cvat_from_xml_file(xml_file: Union[str, PathLike]) -> Dict[str, Sequence[IRImageAnnotationBase]]:
-    with open(xml_file, "rb") as f:
-        return load_cvat_from_xml_string(f.read())
+def load_cvat_table_from_xml_file(xml_file: Union[str, PathLike], workers: int = 1) -> IRAnnotationTable:
+    return _load_cvat_table(xml_file, workers)
 
 
-def load_cvat_from_zip(zip_path: Union[str, PathLike]) -> Dict[str, Sequence[IRImageAnnotationBase]]:
+def load_cvat_table_from_zip(zip_path: Union[str, PathLike], workers: int = 1) -> IRAnnotationTable:
     with ZipFile(zip_path) as proj_zip:
         with proj_zip.open("annotations.xml") as f:
-            return load_cvat_from_xml_string(f.read())
+            return _load_cvat_table(f, workers)
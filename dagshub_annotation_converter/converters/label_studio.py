@@ -0,0 +1,420 @@
+import codecs
+import datetime
+import json
+import re
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from contextlib import contextmanager
+from os import PathLike
+from pathlib import Path
+from typing import (
+    Union,
+    BinaryIO,
+    Iterator,
+    Any,
+    Tuple,
+    Optional,
+    Sequence,
+    Iterable,
+    TextIO,
+    List,
+    Mapping,
+    Deque,
+    cast,
+)
+
+from dagshub_annotation_converter.converters.common import group_annotations_by_filename, chunked
+from dagshub_annotation_converter.formats.label_studio.ids import (
+    IdProvider,
+    PregeneratedIdProvider,
+    get_id_provider,
+    use_id_provider,
+)
+from dagshub_annotation_converter.formats.label_studio.json_writer import (
+    LSResults,
+    task_json,
+    ir_annotations_to_task_json,
+)
+from dagshub_annotation_converter.formats.label_studio.task import LabelStudioTask
+from dagshub_annotation_converter.ir.image import IRImageAnnotationBase, IRAnnotationTable, IRPoseImageAnnotation
+
+# Path to the export file, or a binary file-like object with its contents
+LSSource = Union[str, PathLike, BinaryIO]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+# wbits value that makes zlib expect a gzip header and trailer
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+_DEFAULT_CHUNK_SIZE = 2**20
+
+_whitespace_re = re.compile(r"\s*")
+# Inside of an array the elements are also separated by commas
+_array_separator_re = re.compile(r"[\s,]*")
+
+
+def iter_ls_tasks(source: LSSource, chunk_size: int = _DEFAULT_CHUNK_SIZE) -> Iterator[LabelStudioTask]:
+    """
+    Lazily loads the tasks of a Label Studio export, one task at a time.
+    The file is read in chunks and never loaded into memory as a whole,
+    so only the task that is currently being parsed is kept in memory.
+
+    Supports both a JSON array of tasks (the regular Label Studio JSON export) and JSON lines (one task per line).
+    Gzipped files are detected and decompressed on the fly.
+
+    :param source: Path to the file, or a binary file-like object
+    :param chunk_size: Amount of bytes to read from the file at once
+    """
+    for raw_task in _iter_json_values(_iter_text_chunks(source, chunk_size)):
+        yield LabelStudioTask.model_validate(raw_task)
+
+
+def iter_ls_annotations(
+    source: LSSource,
+    image_key: str = "image",
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[Optional[str], Sequence[IRImageAnnotationBase]]]:
+    """
+    Lazily loads the annotations of a Label Studio export, one task at a time.
+    See :func:`iter_ls_tasks` for the supported inputs.
+
+    :param source: Path to the file, or a binary file-like object
+    :param image_key: Key in the ``data`` of the task that holds the path of the image.
+        The path is set as the filename of the annotations.
+    :param chunk_size: Amount of bytes to read from the file at once
+    :return: Iterator of (image path, annotations of the task).
+        The image path is None if the task doesn't have the ``image_key`` in its data.
+    """
+    for task in iter_ls_tasks(source, chunk_size):
+        filename = task.data.get(image_key)
+        yield filename, task.to_ir_annotations(filename=filename)
+
+
+def _iter_text_chunks(source: LSSource, chunk_size: int) -> Iterator[str]:
+    if isinstance(source, (str, PathLike)):
+        with open(source, "rb") as f:
+            yield from _decode_chunks(_read_chunks(f, chunk_size), chunk_size)
+    else:
+        yield from _decode_chunks(_read_chunks(source, chunk_size), chunk_size)
+
+
+def _read_chunks(f: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _decode_chunks(chunks: Iterator[bytes], chunk_size: int) -> Iterator[str]:
+    first_chunk = b""
+    for chunk in chunks:
+        first_chunk += chunk
+        if len(first_chunk) >= len(_GZIP_MAGIC):
+            break
+    all_chunks: Iterable[bytes] = _chain_first(first_chunk, chunks)
+    if first_chunk.startswith(_GZIP_MAGIC):
+        all_chunks = _gunzip(all_chunks, chunk_size)
+
+    # utf-8-sig also gets rid of the BOM, if there is one
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for chunk in all_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def _chain_first(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    if first:
+        yield first
+    yield from rest
+
+
+def _gunzip(chunks: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    """
+    Decompresses a gzip stream, possibly consisting of multiple members.
+    Every decompressed chunk is at most ``chunk_size`` bytes long, no matter how well the data compresses.
+    """
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    for chunk in chunks:
+        while chunk:
+            data = decompressor.decompress(chunk, chunk_size)
+            if data:
+                yield data
+            if decompressor.eof:
+                chunk = decompressor.unused_data
+                decompressor = zlib.decompressobj(_GZIP_WBITS)
+            else:
+                chunk = decompressor.unconsumed_tail
+
+
+def _iter_json_values(text_chunks: Iterator[str]) -> Iterator[Any]:
+    """
+    Incrementally decodes a stream of JSON text, that's either a single JSON array, or a sequence of JSON values
+    (e.g. JSON lines), yielding the elements/values one by one.
+
+    Only the value that's currently being decoded is kept in the buffer.
+    If a value doesn't fit into the buffer, the buffer is grown at least twofold before trying again,
+    so big values are decoded in amortized linear time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    exhausted = False
+
+    def read_more(min_size: int = 1) -> bool:
+        """
+        Drops the already decoded part of the buffer and reads at least ``min_size`` more characters into it.
+        Returns False if there's nothing left to read.
+        """
+        nonlocal buffer, pos, exhausted
+        new_chunks = [buffer[pos:]]
+        read = 0
+        while read < min_size:
+            chunk = next(text_chunks, None)
+            if chunk is None:
+                exhausted = True
+                break
+            new_chunks.append(chunk)
+            read += len(chunk)
+        buffer = "".join(new_chunks)
+        pos = 0
+        return read > 0
+
+    def skip(pattern: "re.Pattern[str]") -> bool:
+        """
+        Skips over the characters matching the pattern. Returns False if the end of the input is reached.
+        """
+        nonlocal pos
+        while True:
+            pos = pattern.match(buffer, pos).end()  # type: ignore[union-attr]
+            if pos < len(buffer):
+                return True
+            if not read_more():
+                return False
+
+    if not skip(_whitespace_re):
+        return
+
+    in_array = buffer[pos] == "["
+    separator_re = _whitespace_re
+    if in_array:
+        pos += 1
+        separator_re = _array_separator_re
+
+    while True:
+        if not skip(separator_re):
+            if in_array:
+                raise ValueError("Unexpected end of the input, the JSON array isn't closed")
+            return
+        if in_array and buffer[pos] == "]":
+            return
+        try:
+            value, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Most likely the value is cut off by the end of the buffer
+            if exhausted:
+                raise
+            read_more(len(buffer) - pos)
+            continue
+        yield value
+
+
+def export_ls_tasks(
+    f: TextIO,
+    tasks: Iterable[Tuple[LabelStudioTask, Sequence[IRImageAnnotationBase]]],
+    json_lines: bool = False,
+    id_provider: Optional[IdProvider] = None,
+):
+    """
+    Writes tasks with the annotations added to them into a file, one task at a time.
+    The annotations are serialized directly, without creating the Label Studio result models.
+    Every task is the same as ``task.add_ir_annotations(annotations); task.model_dump_json()``,
+    but the tasks passed in aren't modified.
+
+    :param f: Text file to write into
+    :param tasks: Pairs of (task, annotations to add to the task)
+    :param json_lines: Write a task per line instead of a JSON array
+    :param id_provider: Provider of the ids of the results.
+        Pass a :class:`CounterIdProvider` or a :class:`SeededIdProvider` to get the same output on every export.
+        The tasks are passed in already created, so their ids have to be generated by the caller.
+    """
+    with _maybe_use_id_provider(id_provider):
+        _write_tasks(f, (ir_annotations_to_task_json(task, annotations) for task, annotations in tasks), json_lines)
+
+
+def export_ls_tasks_from_table(
+    f: TextIO,
+    table: IRAnnotationTable,
+    image_key: str = "image",
+    json_lines: bool = False,
+    id_provider: Optional[IdProvider] = None,
+    timestamp: Optional[datetime.datetime] = None,
+):
+    """
+    Writes the annotations of a table into a file, a task per image.
+    See :func:`export_ls_tasks` for the format.
+
+    :param f: Text file to write into
+    :param table: Annotations to export. Every annotation has to have a filename
+    :param image_key: Key in the ``data`` of the task to put the filename of the image into
+    :param json_lines: Write a task per line instead of a JSON array
+    :param id_provider: Provider of the ids of the tasks and the results.
+        Pass a :class:`CounterIdProvider` or a :class:`SeededIdProvider` to get the same output on every export.
+    :param timestamp: Creation and update time of the tasks. Defaults to the time the package was imported
+    """
+    with _maybe_use_id_provider(id_provider):
+        _write_tasks(f, _table_task_jsons(table, image_key, _task_timestamps(timestamp)), json_lines)
+
+
+def export_to_label_studio_tasks(
+    annotations: Sequence[IRImageAnnotationBase],
+    export_path: Union[str, PathLike],
+    workers: int = 1,
+    image_key: str = "image",
+    json_lines: bool = False,
+    id_provider: Optional[IdProvider] = None,
+    timestamp: Optional[datetime.datetime] = None,
+) -> Path:
+    """
+    Exports the annotations into a Label Studio tasks file, a task per image.
+    See :func:`export_ls_tasks` for the format.
+
+    :param annotations: Annotations to export. Every annotation has to have a filename
+    :param export_path: Path of the file to write
+    :param workers: Amount of processes to serialize the tasks with. With more than one worker,
+        the annotations are sent to a process pool in chunks of images, as tables.
+        The output is the same regardless of the amount of workers, including the generated ids.
+    :param image_key: Key in the ``data`` of the task to put the filename of the image into
+    :param json_lines: Write a task per line instead of a JSON array
+    :param id_provider: Provider of the ids of the tasks and the results.
+        Pass a :class:`CounterIdProvider` or a :class:`SeededIdProvider` to get the same output on every export.
+    :param timestamp: Creation and update time of the tasks. Defaults to the time the package was imported
+    :return: Path of the written file
+    """
+    grouped = group_annotations_by_filename(annotations)
+    export_path = Path(export_path)
+    timestamps = _task_timestamps(timestamp)
+    with _maybe_use_id_provider(id_provider), export_path.open("w", encoding="utf-8") as f:
+        if workers > 1:
+            task_jsons = _export_tasks_parallel(grouped, workers, image_key, timestamps)
+        else:
+            task_jsons = (
+                ir_annotations_to_task_json(_new_task(filename, image_key, timestamps), anns)
+                for filename, anns in grouped.items()
+            )
+        _write_tasks(f, task_jsons, json_lines)
+    return export_path
+
+
+_TaskTimestamps = Tuple[datetime.datetime, datetime.datetime]
+
+
+def _task_timestamps(timestamp: Optional[datetime.datetime]) -> _TaskTimestamps:
+    """
+    Resolves the creation and update time of the exported tasks once,
+    so worker processes don't fall back to the defaults of their own import time
+    """
+    if timestamp is not None:
+        return timestamp, timestamp
+    fields = LabelStudioTask.model_fields
+    return fields["created_at"].default, fields["updated_at"].default
+
+
+def _new_task(filename: str, image_key: str, timestamps: _TaskTimestamps) -> LabelStudioTask:
+    task = LabelStudioTask(data={image_key: filename})
+    task.created_at, task.updated_at = timestamps
+    return task
+
+
+def _table_task_jsons(
+    table: IRAnnotationTable,
+    image_key: str,
+    timestamps: _TaskTimestamps,
+) -> Iterator[str]:
+    table = table.normalized()
+    groups = table.group_by_filename()
+    if None in groups:
+        raise ValueError("Some of the annotations in the table don't have a filename associated, aborting")
+    for filename, rows in groups.items():
+        task = _new_task(cast(str, filename), image_key, timestamps)
+        results = LSResults()
+        results.add_table_rows(table, rows)
+        yield task_json(task, results)
+
+
+def _export_table_chunk(
+    table: IRAnnotationTable,
+    image_key: str,
+    timestamps: _TaskTimestamps,
+    result_ids: List[str],
+    task_ids: List[int],
+) -> List[str]:
+    """
+    Serializes the tasks of a chunk of images. Runs in the worker processes.
+    """
+    with use_id_provider(PregeneratedIdProvider(result_ids, task_ids)):
+        return list(_table_task_jsons(table, image_key, timestamps))
+
+
+def _export_tasks_parallel(
+    grouped: Mapping[str, Sequence[IRImageAnnotationBase]],
+    workers: int,
+    image_key: str,
+    timestamps: _TaskTimestamps,
+    chunk_size: int = 256,
+) -> Iterator[str]:
+    """
+    Serializes chunks of images in a process pool.
+    At most ``2 * workers`` chunks are in flight at once, so the memory usage stays bounded.
+    Tasks are yielded in the order of the images.
+    """
+    # Ids are generated here, in the same order as they would be by a single process,
+    # so the output doesn't depend on the amount of workers
+    provider = get_id_provider()
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque["Future[List[str]]"] = deque()
+        for chunk in chunked(grouped.values(), chunk_size):
+            result_ids: List[str] = []
+            task_ids: List[int] = []
+            for anns in chunk:
+                task_ids.append(provider.task_id())
+                result_ids.extend(provider.result_id() for _ in range(_result_count(anns)))
+            table = IRAnnotationTable.from_annotations(ann for anns in chunk for ann in anns)
+            pending.append(pool.submit(_export_table_chunk, table, image_key, timestamps, result_ids, task_ids))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _result_count(annotations: Sequence[IRImageAnnotationBase]) -> int:
+    """Amount of Label Studio results the annotations turn into: poses become a bbox and a result per point"""
+    return sum(1 + len(ann.points) if isinstance(ann, IRPoseImageAnnotation) else 1 for ann in annotations)
+
+
+@contextmanager
+def _maybe_use_id_provider(id_provider: Optional[IdProvider]) -> Iterator[None]:
+    if id_provider is None:
+        yield
+        return
+    with use_id_provider(id_provider):
+        yield
+
+
+def _write_tasks(f: TextIO, task_jsons: Iterable[str], json_lines: bool):
+    if json_lines:
+        for task in task_jsons:
+            f.write(task)
+            f.write("\n")
+        return
+    f.write("[")
+    for i, task in enumerate(task_jsons):
+        if i > 0:
+            f.write(",")
+        f.write(task)
+    f.write("]")
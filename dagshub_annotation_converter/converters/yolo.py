@@ -1,32 +1,59 @@
+import functools
 import logging
 import os
-from pathlib import Path
-from typing import Union, Sequence, List, Optional, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from pathlib import Path, PurePath
+from typing import Union, Sequence, List, Optional, Dict, Tuple, Iterable, Iterator, Callable, Set
 
-import PIL.Image
+import numpy as np
 
-from dagshub_annotation_converter.converters.common import group_annotations_by_filename
+from dagshub_annotation_converter.converters.common import group_annotations_by_filename, chunked
 from dagshub_annotation_converter.formats.yolo import (
     export_lookup,
     allowed_annotation_types,
     YoloContext,
-    import_lookup,
     YoloAnnotationTypes,
 )
-from dagshub_annotation_converter.ir.image import IRImageAnnotationBase
-from dagshub_annotation_converter.util import is_image, replace_folder
+from dagshub_annotation_converter.formats.yolo.bulk import (
+    YoloArrays,
+    arrays_to_ir,
+    arrays_to_table,
+    import_annotations_from_text,
+    import_table_from_text,
+    parse_labels,
+    table_to_string,
+)
+from dagshub_annotation_converter.formats.common import determine_image_dimensions
+from dagshub_annotation_converter.ir.image import IRImageAnnotationBase, IRAnnotationTable
+from dagshub_annotation_converter.util import is_image, replace_folder, ImageDimensionCache, BufferedFileWriter
 
 logger = logging.getLogger(__name__)
 
+DIMENSION_CACHE_SUFFIX = ".dimensions.sqlite"
 
-def load_yolo_from_fs_with_context(
+
+def iter_yolo_from_fs(
     context: YoloContext,
     import_dir: Union[str, Path] = ".",
-) -> Dict[str, Sequence[IRImageAnnotationBase]]:
+    dimension_cache: Optional[ImageDimensionCache] = None,
+    workers: int = 1,
+) -> Iterator[Tuple[str, Sequence[IRImageAnnotationBase]]]:
+    """
+    Lazily loads the annotations of a YOLO dataset described by the context, one image at a time.
+    Only the annotations of the images currently being processed are kept in memory.
+
+    :param context: Context of the dataset. ``context.path`` has to be set
+    :param import_dir: Directory that ``context.path`` is relative to
+    :param dimension_cache: Cache to look up the dimensions of the images in
+    :param workers: Amount of workers to use. With more than one worker, label files are read
+        and images are probed in a thread pool, while the labels are parsed into arrays in a process pool.
+        The annotation objects are created from the arrays in the main process,
+        which is the part of the import that doesn't get faster with more workers.
+        The order of the results stays the same regardless of the amount of workers.
+    :return: Iterator of (image path relative to the data directory, annotations of the image)
+    """
     assert context.path is not None
 
-    annotations: Dict[str, Sequence[IRImageAnnotationBase]] = {}
-
     import_dir_path = Path(import_dir)
 
     if context.path.is_absolute():
@@ -34,6 +61,74 @@ def load_yolo_from_fs_with_context(
     else:
         data_dir_path = import_dir_path / context.path
 
+    image_label_pairs = _iter_image_label_pairs(context, data_dir_path)
+
+    if workers <= 1:
+        for img, annotation in image_label_pairs:
+            rel_path = str(img.relative_to(data_dir_path))
+            yield rel_path, parse_annotation(context, data_dir_path, img, annotation, dimension_cache)
+    else:
+        parsed = _parse_label_files_parallel(context, data_dir_path, image_label_pairs, dimension_cache, workers)
+        for rel_path, arrays, img_width, img_height in parsed:
+            yield rel_path, arrays_to_ir(arrays, context, img_width, img_height, filename=rel_path)
+
+
+def load_yolo_from_fs_with_context(
+    context: YoloContext,
+    import_dir: Union[str, Path] = ".",
+    dimension_cache: Optional[ImageDimensionCache] = None,
+    workers: int = 1,
+) -> Dict[str, Sequence[IRImageAnnotationBase]]:
+    """
+    Loads all annotations of a YOLO dataset described by the context.
+    See :func:`iter_yolo_from_fs` for the description of the arguments.
+
+    :return: Annotations grouped by the image path, relative to the data directory
+    """
+    return dict(iter_yolo_from_fs(context, import_dir, dimension_cache=dimension_cache, workers=workers))
+
+
+def load_yolo_table_from_fs(
+    context: YoloContext,
+    import_dir: Union[str, Path] = ".",
+    dimension_cache: Optional[ImageDimensionCache] = None,
+    workers: int = 1,
+) -> IRAnnotationTable:
+    """
+    Loads all annotations of a YOLO dataset described by the context into a single columnar table.
+    Unlike :func:`load_yolo_from_fs_with_context`, no annotation objects are created,
+    which makes it much cheaper for big datasets.
+
+    :param workers: Amount of workers to use. See :func:`iter_yolo_from_fs` for details.
+        Since no annotation objects get created, all of the parsing happens in the workers.
+    :return: Table with the annotations. Filenames of the rows are relative to the data directory
+    """
+    assert context.path is not None
+    assert context.annotation_type is not None
+
+    if context.path.is_absolute():
+        data_dir_path = context.path
+    else:
+        data_dir_path = Path(import_dir) / context.path
+
+    image_label_pairs = _iter_image_label_pairs(context, data_dir_path)
+
+    tables = []
+    if workers <= 1:
+        for img, annotation in image_label_pairs:
+            rel_path, text, img_width, img_height = _read_label_file(data_dir_path, img, annotation, dimension_cache)
+            tables.append(import_table_from_text(text, context, img_width, img_height, filename=rel_path))
+    else:
+        parsed = _parse_label_files_parallel(context, data_dir_path, image_label_pairs, dimension_cache, workers)
+        for rel_path, arrays, img_width, img_height in parsed:
+            tables.append(arrays_to_table(arrays, context, img_width, img_height, filename=rel_path))
+    return IRAnnotationTable.concat(tables)
+
+
+def _iter_image_label_pairs(context: YoloContext, data_dir_path: Path) -> Iterator[Tuple[Path, Path]]:
+    """
+    Walks the data directory, yielding all images that have a label file, along with the label file
+    """
     for dirpath, subdirs, files in os.walk(data_dir_path):
         if context.image_dir_name not in dirpath.split("/"):
             logger.debug(f"{dirpath} is not an image dir, skipping")
@@ -41,7 +136,6 @@ def load_yolo_from_fs_with_context(
         for filename in files:
             fullpath = os.path.join(dirpath, filename)
             img = Path(fullpath)
-            relpath = img.relative_to(data_dir_path)
             if not is_image(img):
                 logger.debug(f"Skipping {img} because it's not an image")
                 continue
@@ -52,30 +146,105 @@ def load_yolo_from_fs_with_context(
             if not annotation.exists():
                 logger.warning(f"Couldn't find annotation file [{annotation}] for image file [{img}]")
                 continue
-            annotations[str(relpath)] = parse_annotation(context, data_dir_path, img, annotation)
-
-    return annotations
+            yield img, annotation
 
 
 def parse_annotation(
-    context: YoloContext, base_path: Path, img_path: Path, annotation_path: Path
+    context: YoloContext,
+    base_path: Path,
+    img_path: Path,
+    annotation_path: Path,
+    dimension_cache: Optional[ImageDimensionCache] = None,
 ) -> Sequence[IRImageAnnotationBase]:
-    img = PIL.Image.open(img_path)
-    img_width, img_height = img.size
+    label_file = _read_label_file(base_path, img_path, annotation_path, dimension_cache)
+    return parse_annotation_text(context, *label_file)
 
-    annotation_strings = annotation_path.read_text().strip().split("\n")
 
+def parse_annotation_text(
+    context: YoloContext,
+    rel_path: str,
+    annotation_text: str,
+    img_width: int,
+    img_height: int,
+) -> Sequence[IRImageAnnotationBase]:
+    """
+    Parses the contents of a label file of the image at ``rel_path``.
+    """
     assert context.annotation_type is not None
 
-    convert_func = import_lookup[context.annotation_type]
+    return import_annotations_from_text(annotation_text, context, img_width, img_height, filename=rel_path)
+
+
+# Label file contents along with the image info required to parse it: (relative path, text, width, height)
+_LabelFile = Tuple[str, str, int, int]
+
 
-    res: List[IRImageAnnotationBase] = []
+def _read_label_file(
+    base_path: Path,
+    img_path: Path,
+    annotation_path: Path,
+    dimension_cache: Optional[ImageDimensionCache] = None,
+) -> _LabelFile:
+    img_width, img_height = determine_image_dimensions(image=img_path, dimension_cache=dimension_cache)
     rel_path = str(img_path.relative_to(base_path))
+    return rel_path, annotation_path.read_text(), img_width, img_height
 
-    for ann in annotation_strings:
-        res.append(convert_func(ann, context, img_width, img_height, img).with_filename(rel_path))
 
-    return res
+# Parsed label file, the way it's sent back from the parsing workers: (relative path, arrays, width, height)
+_ParsedLabelFile = Tuple[str, YoloArrays, int, int]
+
+_worker_context: Optional[YoloContext] = None
+
+
+def _init_parse_worker(context: YoloContext):
+    global _worker_context
+    _worker_context = context
+
+
+def _parse_label_file_in_worker(label_file: _LabelFile) -> _ParsedLabelFile:
+    """
+    Parses the label file into arrays only. The arrays are much cheaper to send back to the main process
+    than the annotation objects, which get created in the main process instead.
+    """
+    assert _worker_context is not None
+    rel_path, text, img_width, img_height = label_file
+    arrays = parse_labels(text, _worker_context.annotation_type, _worker_context.keypoint_dim)
+    return rel_path, arrays, img_width, img_height
+
+
+def _parse_label_files_parallel(
+    context: YoloContext,
+    data_dir_path: Path,
+    image_label_pairs: Iterable[Tuple[Path, Path]],
+    dimension_cache: Optional[ImageDimensionCache],
+    workers: int,
+) -> Iterator[_ParsedLabelFile]:
+    """
+    Reads the label files and image dimensions in a thread pool, then parses them into arrays in a process pool.
+    Works on bounded chunks of files: reading of the next chunk overlaps with parsing of the current one.
+    Results are yielded in the same order as ``image_label_pairs``.
+    """
+    chunk_size = workers * 64
+
+    def read(pair: Tuple[Path, Path]) -> _LabelFile:
+        return _read_label_file(data_dir_path, pair[0], pair[1], dimension_cache)
+
+    with ThreadPoolExecutor(max_workers=workers) as io_pool, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_parse_worker, initargs=(context,)
+    ) as parse_pool:
+
+        def parse(reads: List["Future[_LabelFile]"]) -> Iterator[_ParsedLabelFile]:
+            label_files = [f.result() for f in reads]
+            return parse_pool.map(_parse_label_file_in_worker, label_files, chunksize=max(1, chunk_size // workers))
+
+        pending_reads: Optional[List["Future[_LabelFile]"]] = None
+        for chunk in chunked(image_label_pairs, chunk_size):
+            reads = [io_pool.submit(read, pair) for pair in chunk]
+            if pending_reads is not None:
+                yield from parse(pending_reads)
+            pending_reads = reads
+        if pending_reads is not None:
+            yield from parse(pending_reads)
 
 
 def load_yolo_from_fs(
@@ -83,14 +252,41 @@ def load_yolo_from_fs(
     meta_file: Union[str, Path] = "annotations.yaml",
     image_dir_name: str = "images",
     label_dir_name: str = "labels",
+    cache_dimensions: bool = False,
+    workers: int = 1,
 ) -> Tuple[Dict[str, Sequence[IRImageAnnotationBase]], YoloContext]:
+    """
+    Loads a YOLO dataset from the filesystem.
+
+    :param annotation_type: Type of the annotations in the dataset
+    :param meta_file: Path to the YAML file of the YOLO dataset definition
+    :param image_dir_name: Name of the directory containing image files
+    :param label_dir_name: Name of the directory containing label files
+    :param cache_dimensions: Store the dimensions of the images in a cache file next to ``meta_file``.
+        On subsequent imports, images that didn't change since the previous import don't get opened.
+    :param workers: Amount of workers to read and parse the files with.
+        See :func:`load_yolo_from_fs_with_context` for details.
+    :return: Annotations grouped by the image path, and the YOLO context of the dataset
+    """
     meta_file_path = Path(meta_file).absolute()
     context = YoloContext.from_yaml_file(meta_file, annotation_type=annotation_type)
     context.image_dir_name = image_dir_name
     context.label_dir_name = label_dir_name
     context.annotation_type = annotation_type
 
-    return load_yolo_from_fs_with_context(context, import_dir=meta_file_path.parent), context
+    dimension_cache: Optional[ImageDimensionCache] = None
+    if cache_dimensions:
+        dimension_cache = ImageDimensionCache(meta_file_path.with_name(meta_file_path.name + DIMENSION_CACHE_SUFFIX))
+
+    try:
+        annotations = dict(
+            iter_yolo_from_fs(context, meta_file_path.parent, dimension_cache=dimension_cache, workers=workers)
+        )
+    finally:
+        if dimension_cache is not None:
+            dimension_cache.close()
+
+    return annotations, context
 
 
 # ======== Annotation Export ======== #
@@ -118,6 +314,11 @@ def annotations_to_string(annotations: Sequence[IRImageAnnotationBase], context:
     if len(filtered_annotations) == 0:
         return None
 
+    if context.float_precision is not None:
+        # Formats the numbers of the whole file at once
+        table = IRAnnotationTable.from_annotations(filtered_annotations)
+        return table_to_string(table, np.arange(len(table)), context)
+
     export_fn = export_lookup[context.annotation_type]
 
     return "\n".join([export_fn(ann, context) for ann in filtered_annotations])
@@ -144,17 +345,90 @@ def _get_common_folder_with_part(paths: List[Path], part: str) -> Optional[Path]
     return shortest
 
 
-def _guess_train_val_test_split(image_paths: List[str]) -> Tuple[Optional[Path], Optional[Path], Optional[Path]]:
-    paths = [Path(p) for p in image_paths]
-    splits = ["train", "val", "test"]
-    return (*[_get_common_folder_with_part(paths, split) for split in splits],)
+_MAX_SPLIT_DETECTOR_DIRS = 10_000
+
+
+class _SplitDetector:
+    """
+    Finds the common folder of every split (e.g. ``train``) in the paths of the images, fed one path at a time.
+    Gives the same result as :func:`_get_common_folder_with_part` on all paths,
+    but only keeps the shortest candidate folders of every split instead of all of the paths.
+    """
+
+    def __init__(self, splits: Sequence[str] = ("train", "val", "test")):
+        self.splits = tuple(splits)
+        # Shortest folders that end with the split, as tuples of path parts
+        self._shortest: Dict[str, Set[Tuple[str, ...]]] = {split: set() for split in self.splits}
+        # Parsed parts of the directories that were already processed.
+        # Images in the same directory share the candidates of the directory, so only their names are checked
+        self._dir_parts: Dict[str, Tuple[str, ...]] = {}
+
+    def add(self, path: str):
+        if not any(split in path for split in self.splits):
+            return
+        directory, name = os.path.split(path)
+        dir_parts = self._dir_parts.get(directory)
+        if dir_parts is None:
+            if len(self._dir_parts) >= _MAX_SPLIT_DETECTOR_DIRS:
+                self._dir_parts.clear()
+            dir_parts = PurePath(directory).parts
+            self._dir_parts[directory] = dir_parts
+            for i, part in enumerate(dir_parts):
+                if part in self._shortest:
+                    self._add_candidate(part, dir_parts[: i + 1])
+        if name in self._shortest:
+            self._add_candidate(name, (*dir_parts, name))
+
+    def _add_candidate(self, split: str, candidate: Tuple[str, ...]):
+        shortest = self._shortest[split]
+        if shortest:
+            length = len(next(iter(shortest)))
+            if len(candidate) > length:
+                return
+            if len(candidate) < length:
+                shortest.clear()
+        shortest.add(candidate)
+
+    def folder(self, split: str) -> Optional[Path]:
+        """Common folder of the split. None if there's none, or if there are multiple shortest ones"""
+        shortest = self._shortest[split]
+        if len(shortest) != 1:
+            return None
+        return Path(*next(iter(shortest)))
+
+    def guess(self) -> Tuple[Optional[Path], ...]:
+        return tuple(self.folder(split) for split in self.splits)
+
+
+def _group_for_export(
+    annotations: Union[Sequence[IRImageAnnotationBase], IRAnnotationTable], context: YoloContext
+) -> Dict[str, Callable[[], Optional[str]]]:
+    """
+    Groups the annotations by the filename, returning a function that serializes the annotations of each file
+    """
+    if isinstance(annotations, IRAnnotationTable):
+        table = annotations
+        res: Dict[str, Callable[[], Optional[str]]] = {}
+        for filename, rows in table.group_by_filename().items():
+            if filename is None:
+                raise ValueError(
+                    f"An annotation {table.annotation(int(rows[0]))} doesn't have a filename associated, aborting"
+                )
+            res[filename] = lambda rows=rows: table_to_string(table, rows, context)
+        return res
+    return {
+        filename: lambda anns=anns: annotations_to_string(anns, context)
+        for filename, anns in group_annotations_by_filename(annotations).items()
+    }
 
 
 def export_to_fs(
     context: YoloContext,
-    annotations: List[IRImageAnnotationBase],
+    annotations: Union[Sequence[IRImageAnnotationBase], IRAnnotationTable],
     export_dir: Union[str, Path] = ".",
     meta_file="yolo_dagshub.yaml",
+    workers: int = 1,
+    atomic_writes: bool = False,
 ) -> Path:
     """
     Exports annotations to YOLO format.
@@ -164,38 +438,95 @@ def export_to_fs(
 
     :param context: Context for exporting. Set the ``path`` attribute to specify the directory with the data,
         otherwise exports a ``data`` folder in the current working directory.
-    :param annotations: Annotations to export
+    :param annotations: Annotations to export. Can also be an :class:`IRAnnotationTable`
     :param export_dir: Directory to export to. If not specified, exports to the current working directory.
     :param meta_file: Name of the YAML file of the YOLO dataset definition.
         This file will be written to the parent directory of the data path.
+    :param workers: Amount of threads to write the label files with.
+        Writing in parallel is much faster on network filesystems. The written files are the same.
+    :param atomic_writes: Write every label file to a temporary file first and rename it into place,
+        so an interrupted export never leaves half-written label files.
+
+    :return: Path to the YAML file with the exported data
+    """
+    grouped_annotations = _group_for_export(annotations, context)
+    return _export_files_to_fs(
+        context, grouped_annotations.items(), export_dir, meta_file, workers=workers, atomic_writes=atomic_writes
+    )
+
+
+def export_stream_to_fs(
+    context: YoloContext,
+    annotations: Iterable[Tuple[str, Sequence[IRImageAnnotationBase]]],
+    export_dir: Union[str, Path] = ".",
+    meta_file="yolo_dagshub.yaml",
+    workers: int = 1,
+    atomic_writes: bool = False,
+) -> Path:
+    """
+    Exports annotations to YOLO format, consuming them one file at a time.
+
+    Unlike :func:`export_to_fs`, the annotations don't have to be loaded in memory all at once:
+    the label file of every image is written as soon as its annotations are consumed,
+    so datasets that don't fit in memory can be exported.
+    Use :func:`~dagshub_annotation_converter.converters.common.group_sorted_annotations`
+    to export a stream of annotations sorted by the filename.
+
+    :param context: Context for exporting. See :func:`export_to_fs`
+    :param annotations: Iterable of (image path, annotations of the image),
+        e.g. the output of :func:`iter_yolo_from_fs`. Every image path should appear only once.
+    :param export_dir: Directory to export to. If not specified, exports to the current working directory.
+    :param meta_file: Name of the YAML file of the YOLO dataset definition.
+    :param workers: Amount of threads to write the label files with.
+    :param atomic_writes: Write every label file atomically. See :func:`export_to_fs`
 
     :return: Path to the YAML file with the exported data
     """
+    serializers = (
+        (filename, functools.partial(annotations_to_string, anns, context)) for filename, anns in annotations
+    )
+    return _export_files_to_fs(
+        context, serializers, export_dir, meta_file, workers=workers, atomic_writes=atomic_writes
+    )
+
+
+def _export_files_to_fs(
+    context: YoloContext,
+    files: Iterable[Tuple[str, Callable[[], Optional[str]]]],
+    export_dir: Union[str, Path],
+    meta_file: str,
+    workers: int,
+    atomic_writes: bool,
+) -> Path:
+    """
+    Writes the label files and the .yaml file of the dataset.
+
+    :param files: Image path and a function serializing the contents of its label file, for every image
+    """
     if context.path is None:
         print(f"`YoloContext.path` was not set. Exporting to {os.path.join(os.getcwd(), 'data')}")
         context.path = Path("data")
 
-    grouped_annotations = group_annotations_by_filename(annotations)
-
     export_path = Path(export_dir)
+    split_detector = _SplitDetector()
+
+    with BufferedFileWriter(workers=workers, atomic=atomic_writes) as writer:
+        for filename, serialize in files:
+            split_detector.add(filename)
+            annotation_filepath = export_path / context.path / filename
+            out_path = replace_folder(
+                annotation_filepath, context.image_dir_name, context.label_dir_name, context.label_extension
+            )
+            if out_path is None:
+                logger.warning(f"Couldn't generate annotation file path for image file [{filename}]")
+                continue
+            annotation_content = serialize()
+            if annotation_content is not None:
+                writer.write(out_path, annotation_content)
+            else:
+                writer.ensure_dir(out_path.parent)
 
-    for filename, anns in grouped_annotations.items():
-        annotation_filepath = export_path / context.path / filename
-        out_path = replace_folder(
-            annotation_filepath, context.image_dir_name, context.label_dir_name, context.label_extension
-        )
-        if out_path is None:
-            logger.warning(f"Couldn't generate annotation file path for image file [{filename}]")
-            continue
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        annotation_content = annotations_to_string(anns, context)
-        if annotation_content is not None:
-            with open(out_path, "w") as f:
-                f.write(annotation_content)
-
-    guessed_train_path, guessed_val_path, guessed_test_path = _guess_train_val_test_split(
-        list(grouped_annotations.keys())
-    )
+    guessed_train_path, guessed_val_path, guessed_test_path = split_detector.guess()
 
     # Don't accidentally override with Nones. If we find Nones, then assume YOLO should train on the whole dataset
     if guessed_train_path is not None:
@@ -3,6 +3,9 @@ from typing import Union, Optional, Tuple
 
 import PIL.Image
 
+from dagshub_annotation_converter.util.dimension_cache import ImageDimensionCache
+from dagshub_annotation_converter.util.image_dimensions import get_image_dimensions
+
 ImageType = Union[str, Path, PIL.Image.Image]
 
 
@@ -10,12 +13,15 @@ def determine_image_dimensions(
     image_width: Optional[int] = None,
     image_height: Optional[int] = None,
     image: Optional[ImageType] = None,
+    dimension_cache: Optional[ImageDimensionCache] = None,
 ) -> Tuple[int, int]:
     if image_width is not None and image_height is not None:
         return image_width, image_height
     if image is None:
         raise ValueError("Either image or image_width and image_height should be provided")
 
-    if not isinstance(image, PIL.Image.Image):
-        image = PIL.Image.open(image)
-    return image.size
+    if isinstance(image, PIL.Image.Image):
+        return image.size
+    if dimension_cache is not None:
+        return dimension_cache.get_dimensions(image)
+    return get_image_dimensions(image)
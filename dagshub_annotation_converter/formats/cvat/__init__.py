@@ -7,9 +7,12 @@ from .ellipse import parse_ellipse
 from .polygon import parse_polygon
 from .points import parse_points
 from .skeleton import parse_skeleton
+from .context import CVATImageInfo
 from dagshub_annotation_converter.ir.image import IRImageAnnotationBase
 
-CVATParserFunction = Callable[[ElementBase, ElementBase], IRImageAnnotationBase]
+# Parses an annotation element, using the info of the <image> it belongs to.
+# The image info is parsed once per image and shared between all of its annotations.
+CVATParserFunction = Callable[[ElementBase, CVATImageInfo], IRImageAnnotationBase]
 
 annotation_parsers: Dict[str, CVATParserFunction] = {
     "box": parse_box,
@@ -3,7 +3,7 @@ from typing import Tuple
 
 from lxml.etree import ElementBase
 
-from dagshub_annotation_converter.formats.cvat.context import parse_image_tag
+from dagshub_annotation_converter.formats.cvat.context import CVATImageInfo
 from dagshub_annotation_converter.ir.image import IRBBoxImageAnnotation, CoordinateStyle
 
 
@@ -40,7 +40,7 @@ def calculate_bbox(xtl, ytl, xbr, ybr, rotation: float) -> Tuple[int, int, int,
     return round(x1), round(y1), width, height, rotation
 
 
-def parse_box(elem: ElementBase, containing_image: ElementBase) -> IRBBoxImageAnnotation:
+def parse_box(elem: ElementBase, image_info: CVATImageInfo) -> IRBBoxImageAnnotation:
     top = float(elem.attrib["ytl"])
     bottom = float(elem.attrib["ybr"])
     left = float(elem.attrib["xtl"])
@@ -50,8 +50,6 @@ def parse_box(elem: ElementBase, containing_image: ElementBase) -> IRBBoxImageAn
 
     left, top, width, height, rotation = calculate_bbox(left, top, right, bottom, rotation)
 
-    image_info = parse_image_tag(containing_image)
-
     return IRBBoxImageAnnotation(
         categories={str(elem.attrib["label"]): 1.0},
         top=top,
@@ -1,10 +1,10 @@
 from lxml.etree import ElementBase
 
-from dagshub_annotation_converter.formats.cvat.context import parse_image_tag
+from dagshub_annotation_converter.formats.cvat.context import CVATImageInfo
 from dagshub_annotation_converter.ir.image import IREllipseImageAnnotation, CoordinateStyle
 
 
-def parse_ellipse(elem: ElementBase, containing_image: ElementBase) -> IREllipseImageAnnotation:
+def parse_ellipse(elem: ElementBase, image_info: CVATImageInfo) -> IREllipseImageAnnotation:
     center_x = float(elem.attrib["cx"])
     center_y = float(elem.attrib["cy"])
     radius_x = float(elem.attrib["rx"])
@@ -12,8 +12,6 @@ def parse_ellipse(elem: ElementBase, containing_image: ElementBase) -> IREllipse
 
     rotation = float(elem.attrib.get("rotation", 0.0))
 
-    image_info = parse_image_tag(containing_image)
-
     return IREllipseImageAnnotation(
         categories={str(elem.attrib["label"]): 1.0},
         center_x=round(center_x),
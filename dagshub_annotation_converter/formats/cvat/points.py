@@ -1,25 +1,23 @@
-from typing import List
-
+import numpy as np
 from lxml.etree import ElementBase
 
-from dagshub_annotation_converter.formats.cvat.context import parse_image_tag
-from dagshub_annotation_converter.ir.image import IRPoseImageAnnotation, IRPosePoint, CoordinateStyle
-
+from dagshub_annotation_converter.formats.cvat.context import CVATImageInfo
+from dagshub_annotation_converter.ir.image import IRPoseImageAnnotation, IRPosePoints, CoordinateStyle
 
-def parse_points(elem: ElementBase, containing_image: ElementBase) -> IRPoseImageAnnotation:
-    points: List[IRPosePoint] = []
 
-    category = str(elem.attrib["label"])
+def parse_points_string(points_str: str) -> np.ndarray:
+    """
+    Parses the ``points`` attribute of CVAT shapes (``x1,y1;x2,y2;...``) into an (N, 2) array
+    """
+    return np.array(points_str.replace(";", ",").split(","), dtype=np.float64).reshape(-1, 2)
 
-    image_info = parse_image_tag(containing_image)
 
-    for point_str in elem.attrib["points"].split(";"):
-        x, y = point_str.split(",")
-        points.append(IRPosePoint(x=float(x), y=float(y)))
+def parse_points(elem: ElementBase, image_info: CVATImageInfo) -> IRPoseImageAnnotation:
+    category = str(elem.attrib["label"])
 
     return IRPoseImageAnnotation.from_points(
         categories={category: 1.0},
-        points=points,
+        points=IRPosePoints.from_array(parse_points_string(elem.attrib["points"])).to_list(),
         coordinate_style=CoordinateStyle.DENORMALIZED,
         image_width=image_info.width,
         image_height=image_info.height,
@@ -1,24 +1,18 @@
 from lxml.etree import ElementBase
 
-from dagshub_annotation_converter.formats.cvat.context import parse_image_tag
-from dagshub_annotation_converter.ir.image import IRSegmentationImageAnnotation, CoordinateStyle
+from dagshub_annotation_converter.formats.cvat.context import CVATImageInfo
+from dagshub_annotation_converter.formats.cvat.points import parse_points_string
+from dagshub_annotation_converter.ir.image import IRSegmentationImageAnnotation, IRSegmentationPoints, CoordinateStyle
 
 
-def parse_polygon(elem: ElementBase, containing_image: ElementBase) -> IRSegmentationImageAnnotation:
+def parse_polygon(elem: ElementBase, image_info: CVATImageInfo) -> IRSegmentationImageAnnotation:
     category = str(elem.attrib["label"])
 
-    image_info = parse_image_tag(containing_image)
-
-    res = IRSegmentationImageAnnotation(
+    return IRSegmentationImageAnnotation(
         categories={category: 1.0},
         coordinate_style=CoordinateStyle.DENORMALIZED,
         image_width=image_info.width,
         image_height=image_info.height,
         filename=image_info.name,
+        points=IRSegmentationPoints.from_array(parse_points_string(elem.attrib["points"])).to_list(),
     )
-
-    for point_str in elem.attrib["points"].split(";"):
-        x, y = point_str.split(",")
-        res.add_point(x=float(x), y=float(y))
-
-    return res
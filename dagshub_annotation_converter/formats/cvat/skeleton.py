@@ -2,26 +2,20 @@ from typing import Tuple, List
 
 from lxml.etree import ElementBase
 
-from dagshub_annotation_converter.formats.cvat.context import parse_image_tag
+from dagshub_annotation_converter.formats.cvat.context import CVATImageInfo
 from dagshub_annotation_converter.ir.image import IRPoseImageAnnotation, IRPosePoint, CoordinateStyle
 
 
-def parse_skeleton(elem: ElementBase, containing_image: ElementBase) -> IRPoseImageAnnotation:
+def parse_skeleton_points(elem: ElementBase) -> List[Tuple[float, float, bool]]:
+    """
+    Returns (x, y, visible) of the points of the skeleton, sorted by their labels
+    """
     # Points also contain the labels, for consistent ordering in LS, they are later sorted
-    points: List[Tuple[str, IRPosePoint]] = []
-
-    category = str(elem.attrib["label"])
-
-    image_info = parse_image_tag(containing_image)
+    points: List[Tuple[str, Tuple[float, float, bool]]] = []
 
     for point_elem in elem:
         x, y = point_elem.attrib["points"].split(",")
-        points.append(
-            (
-                point_elem.attrib["label"],
-                IRPosePoint(x=float(x), y=float(y), visible=point_elem.attrib["occluded"] == "0"),
-            )
-        )
+        points.append((point_elem.attrib["label"], (float(x), float(y), point_elem.attrib["occluded"] == "0")))
 
     all_labels_ints = all(map(lambda tup: tup[0].isdigit(), points))
 
@@ -31,7 +25,13 @@ def parse_skeleton(elem: ElementBase, containing_image: ElementBase) -> IRPoseIm
     else:
         points = sorted(points, key=lambda tup: tup[0])
 
-    res_points = list(map(lambda tup: tup[1], points))
+    return list(map(lambda tup: tup[1], points))
+
+
+def parse_skeleton(elem: ElementBase, image_info: CVATImageInfo) -> IRPoseImageAnnotation:
+    category = str(elem.attrib["label"])
+
+    res_points = [IRPosePoint(x=x, y=y, visible=visible) for x, y, visible in parse_skeleton_points(elem)]
 
     return IRPoseImageAnnotation.from_points(
         categories={category: 1.0},
@@ -0,0 +1,74 @@
+import logging
+
+import numpy as np
+from lxml.etree import ElementBase
+
+from dagshub_annotation_converter.formats.cvat.box import calculate_bbox
+from dagshub_annotation_converter.formats.cvat.context import CVATImageInfo
+from dagshub_annotation_converter.formats.cvat.points import parse_points_string
+from dagshub_annotation_converter.formats.cvat.skeleton import parse_skeleton_points
+from dagshub_annotation_converter.ir.image import CoordinateStyle, IRAnnotationTableBuilder
+from dagshub_annotation_converter.ir.image.table import BBOX_KIND, ELLIPSE_KIND, POSE_KIND, SEGMENTATION_KIND
+
+logger = logging.getLogger(__name__)
+
+
+def _points_extent(points: np.ndarray):
+    min_x, min_y = points.min(axis=0).tolist()
+    max_x, max_y = points.max(axis=0).tolist()
+    return min_x, min_y, max_x - min_x, max_y - min_y
+
+
+def add_cvat_annotation_to_table(
+    builder: IRAnnotationTableBuilder, elem: ElementBase, image_info: CVATImageInfo
+) -> bool:
+    """
+    Adds the CVAT annotation element as a row of the table, without creating an annotation object.
+    Produces the same values as the parsers in ``annotation_parsers``.
+
+    :return: False if the annotation type is not supported, True otherwise
+    """
+    annotation_type = elem.tag
+    common = {
+        "categories": {str(elem.attrib["label"]): 1.0},
+        "coordinate_style": CoordinateStyle.DENORMALIZED,
+        "image_width": image_info.width,
+        "image_height": image_info.height,
+        "filename": image_info.name,
+    }
+
+    if annotation_type == "box":
+        left, top, width, height, rotation = calculate_bbox(
+            float(elem.attrib["xtl"]),
+            float(elem.attrib["ytl"]),
+            float(elem.attrib["xbr"]),
+            float(elem.attrib["ybr"]),
+            float(elem.attrib.get("rotation", 0.0)),
+        )
+        builder.add_row(BBOX_KIND, box=(left, top, width, height), rotation=rotation, **common)
+    elif annotation_type == "ellipse":
+        builder.add_row(
+            ELLIPSE_KIND,
+            box=(
+                round(float(elem.attrib["cx"])),
+                round(float(elem.attrib["cy"])),
+                float(elem.attrib["rx"]),
+                float(elem.attrib["ry"]),
+            ),
+            rotation=float(elem.attrib.get("rotation", 0.0)),
+            **common,
+        )
+    elif annotation_type == "polygon":
+        builder.add_row(SEGMENTATION_KIND, points=parse_points_string(elem.attrib["points"]), **common)
+    elif annotation_type == "points":
+        points = parse_points_string(elem.attrib["points"])
+        builder.add_row(POSE_KIND, box=_points_extent(points), points=points, **common)
+    elif annotation_type == "skeleton":
+        skeleton_points = parse_skeleton_points(elem)
+        points = np.array([(x, y) for x, y, _ in skeleton_points], dtype=np.float64).reshape(-1, 2)
+        visibility = np.array([1 if visible else 0 for _, _, visible in skeleton_points], dtype=np.int8)
+        builder.add_row(POSE_KIND, box=_points_extent(points), points=points, point_visibility=visibility, **common)
+    else:
+        logger.warning(f"Unknown CVAT annotation type {annotation_type}")
+        return False
+    return True
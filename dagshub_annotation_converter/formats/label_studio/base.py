@@ -1,4 +1,3 @@
-import uuid
 from abc import abstractmethod
 from typing import Sequence, Optional
 
@@ -6,6 +5,7 @@ from pydantic import Field
 
 from dagshub_annotation_converter.ir.image import IRImageAnnotationBase
 from dagshub_annotation_converter.ir.image.annotations.base import IRAnnotationBase
+from dagshub_annotation_converter.formats.label_studio.ids import generate_result_id
 from dagshub_annotation_converter.util.pydantic_util import ParentModel
 
 
@@ -33,7 +33,7 @@ class ImageAnnotationResultABC(AnnotationResultABC):
     original_height: int
     image_rotation: float = 0.0
     type: str
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:10])
+    id: str = Field(default_factory=generate_result_id)
     origin: str = "manual"
     to_name: str = "image"
     from_name: str = "label"
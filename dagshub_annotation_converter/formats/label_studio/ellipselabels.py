@@ -1,4 +1,4 @@
-from typing import List, Sequence
+from typing import List, Sequence, Literal
 
 from dagshub_annotation_converter.formats.label_studio.base import ImageAnnotationResultABC
 from dagshub_annotation_converter.ir.image import IRImageAnnotationBase, IREllipseImageAnnotation, CoordinateStyle
@@ -16,7 +16,7 @@ class EllipseLabelsAnnotationsValue(ParentModel):
 
 class EllipseLabelsAnnotation(ImageAnnotationResultABC):
     value: EllipseLabelsAnnotationsValue
-    type: str = "ellipselabels"
+    type: Literal["ellipselabels"] = "ellipselabels"
 
     def to_ir_annotation(self) -> Sequence[IRImageAnnotationBase]:
         res = IREllipseImageAnnotation(
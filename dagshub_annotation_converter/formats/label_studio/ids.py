@@ -0,0 +1,114 @@
+import itertools
+import random
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List
+
+
+class IdProvider:
+    """
+    Generates the ids of new Label Studio results and tasks.
+
+    The default provider generates random ids.
+    Use :class:`CounterIdProvider` or :class:`SeededIdProvider` to make exports reproducible:
+    exporting the same annotations in the same order then yields the same ids.
+    """
+
+    def result_id(self) -> str:
+        return uuid.uuid4().hex[:10]
+
+    def task_id(self) -> int:
+        return random.randint(0, 2**63 - 1)
+
+
+class CounterIdProvider(IdProvider):
+    """
+    Numbers the results and the tasks sequentially, starting from ``start``.
+    Result ids are 10 digit hex strings, same as the random ones.
+    """
+
+    def __init__(self, start: int = 1):
+        self._results = itertools.count(start)
+        self._tasks = itertools.count(start)
+
+    def result_id(self) -> str:
+        return f"{next(self._results):010x}"
+
+    def task_id(self) -> int:
+        return next(self._tasks)
+
+
+class SeededIdProvider(IdProvider):
+    """
+    Generates random looking ids from a pseudorandom generator with a fixed seed.
+    """
+
+    def __init__(self, seed: int = 0):
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def result_id(self) -> str:
+        with self._lock:
+            return f"{self._rng.getrandbits(40):010x}"
+
+    def task_id(self) -> int:
+        with self._lock:
+            return self._rng.getrandbits(63)
+
+
+class PregeneratedIdProvider(IdProvider):
+    """
+    Hands out ids that were generated in advance, e.g. by another provider in a different process.
+    """
+
+    def __init__(self, result_ids: List[str], task_ids: List[int]):
+        self._result_ids = iter(result_ids)
+        self._task_ids = iter(task_ids)
+
+    def result_id(self) -> str:
+        return _next_pregenerated(self._result_ids)
+
+    def task_id(self) -> int:
+        return _next_pregenerated(self._task_ids)
+
+
+def _next_pregenerated(ids: Iterator):
+    for value in ids:
+        return value
+    raise ValueError("Ran out of pregenerated ids")
+
+
+_id_provider: ContextVar[IdProvider] = ContextVar("id_provider", default=IdProvider())
+
+
+def get_id_provider() -> IdProvider:
+    return _id_provider.get()
+
+
+def set_id_provider(provider: IdProvider):
+    """
+    Sets the provider that generates the ids of new Label Studio results and tasks in the current context.
+    Other threads and asyncio tasks that were started before keep using their own provider,
+    new threads start with the default random one.
+    """
+    _id_provider.set(provider)
+
+
+@contextmanager
+def use_id_provider(provider: IdProvider) -> Iterator[IdProvider]:
+    """Generates the ids of the results and tasks created inside of the block with ``provider``"""
+    token = _id_provider.set(provider)
+    try:
+        yield provider
+    finally:
+        _id_provider.reset(token)
+
+
+def generate_result_id() -> str:
+    return _id_provider.get().result_id()
+
+
+def generate_task_id() -> int:
+    return _id_provider.get().task_id()
@@ -0,0 +1,251 @@
+"""
+Serializes IR annotations straight into Label Studio task JSON, without creating the intermediate result models.
+
+The output is byte for byte the same as adding the annotations to a :class:`LabelStudioTask`
+with ``add_ir_annotations`` and dumping it with ``model_dump_json``.
+"""
+
+import json
+from typing import List, Sequence, Optional
+
+import numpy as np
+from pydantic_core import to_json
+
+from dagshub_annotation_converter.formats.label_studio.ids import generate_result_id
+from dagshub_annotation_converter.formats.label_studio.task import (
+    LabelStudioTask,
+    PosePointsLookupKey,
+    PoseBBoxLookupKey,
+)
+from dagshub_annotation_converter.ir.image import (
+    IRImageAnnotationBase,
+    IRBBoxImageAnnotation,
+    IRSegmentationImageAnnotation,
+    IRPoseImageAnnotation,
+    IREllipseImageAnnotation,
+    IRAnnotationTable,
+    CoordinateStyle,
+)
+from dagshub_annotation_converter.ir.image.table import BBOX_KIND, SEGMENTATION_KIND, POSE_KIND, ELLIPSE_KIND
+
+_RESULT_TEMPLATE = (
+    '{{"original_width":{width},"original_height":{height},"image_rotation":0.0,"type":"{type}","id":{id},'
+    '"origin":"manual","to_name":"image","from_name":"label","score":null,"value":{{{value}}}}}'
+)
+
+
+class LSResults:
+    """
+    Serialized results of a task, along with the ids of the poses in them,
+    which get logged in the data of the task (see :meth:`LabelStudioTask.log_pose_metadata`)
+    """
+
+    def __init__(self):
+        self.results: List[str] = []
+        self.pose_boxes: List[str] = []
+        self.pose_points: List[List[str]] = []
+
+    def _add_result(self, result_type: str, width: int, height: int, value: str) -> str:
+        result_id = generate_result_id()
+        self.results.append(
+            _RESULT_TEMPLATE.format(width=width, height=height, type=result_type, id=json_str(result_id), value=value)
+        )
+        return result_id
+
+    def add_bbox(self, category: str, width: int, height: int, x: float, y: float, w: float, h: float, rotation: float):
+        """Adds a rectanglelabels result. The coordinates are in percent of the image dimensions"""
+        self._add_result(
+            "rectanglelabels",
+            width,
+            height,
+            f'"x":{json_float(x)},"y":{json_float(y)},"width":{json_float(w)},"height":{json_float(h)},'
+            f'"rotation":{json_float(rotation)},"rectanglelabels":[{json_str(category)}]',
+        )
+
+    def add_ellipse(
+        self, category: str, width: int, height: int, x: float, y: float, rx: float, ry: float, rotation: float
+    ):
+        """Adds an ellipselabels result. The coordinates are in percent of the image dimensions"""
+        self._add_result(
+            "ellipselabels",
+            width,
+            height,
+            f'"x":{json_float(x)},"y":{json_float(y)},"radiusX":{json_float(rx)},"radiusY":{json_float(ry)},'
+            f'"rotation":{json_float(rotation)},"ellipselabels":[{json_str(category)}]',
+        )
+
+    def add_polygon(self, category: str, width: int, height: int, points: np.ndarray):
+        """Adds a polygonlabels result. The (K, 2) points are in percent of the image dimensions"""
+        self._add_result(
+            "polygonlabels",
+            width,
+            height,
+            f'"points":{json_points(points)},"polygonlabels":[{json_str(category)}],"closed":true',
+        )
+
+    def add_pose(
+        self, category: str, width: int, height: int, x: float, y: float, w: float, h: float, points: np.ndarray
+    ):
+        """
+        Adds the bounding box of the pose and a keypointlabels result for each of its points.
+        The coordinates are in percent of the image dimensions
+        """
+        category_json = json_str(category)
+        bbox_id = self._add_result(
+            "rectanglelabels",
+            width,
+            height,
+            f'"x":{json_float(x)},"y":{json_float(y)},"width":{json_float(w)},"height":{json_float(h)},'
+            f'"rotation":0.0,"rectanglelabels":[{category_json}]',
+        )
+        point_ids = [
+            self._add_result(
+                "keypointlabels",
+                width,
+                height,
+                f'"x":{json_float(px)},"y":{json_float(py)},"width":1.0,"keypointlabels":[{category_json}]',
+            )
+            for px, py in points.tolist()
+        ]
+        self.pose_boxes.append(bbox_id)
+        self.pose_points.append(point_ids)
+
+    def add_ir_annotation(self, ann: IRImageAnnotationBase):
+        category = ann.ensure_has_one_category()
+        width, height = ann.image_width, ann.image_height
+        # Same operations as in IRAnnotationBase.normalized(), so the resulting values are exactly the same
+        is_normalized = ann.coordinate_style == CoordinateStyle.NORMALIZED
+        if isinstance(ann, IRBBoxImageAnnotation):
+            if is_normalized:
+                left, top, w, h = ann.left, ann.top, ann.width, ann.height
+            else:
+                left, top, w, h = ann.left / width, ann.top / height, ann.width / width, ann.height / height
+            self.add_bbox(category, width, height, left * 100, top * 100, w * 100, h * 100, ann.rotation)
+        elif isinstance(ann, IREllipseImageAnnotation):
+            if is_normalized:
+                cx, cy, rx, ry = ann.center_x, ann.center_y, ann.radius_x, ann.radius_y
+            else:
+                cx, cy = ann.center_x / width, ann.center_y / height
+                rx, ry = ann.radius_x / width, ann.radius_y / height
+            self.add_ellipse(category, width, height, cx * 100, cy * 100, rx * 100, ry * 100, ann.rotation)
+        elif isinstance(ann, IRSegmentationImageAnnotation):
+            points = ann.point_array().coords
+            if not is_normalized:
+                points = np.divide(points, (width, height))
+            self.add_polygon(category, width, height, np.multiply(points, 100))
+        elif isinstance(ann, IRPoseImageAnnotation):
+            points = ann.point_array().coords
+            if is_normalized:
+                left, top, w, h = ann.left, ann.top, ann.width, ann.height
+            else:
+                left, top, w, h = ann.left / width, ann.top / height, ann.width / width, ann.height / height
+                points = np.divide(points, (width, height))
+            self.add_pose(category, width, height, left * 100, top * 100, w * 100, h * 100, np.multiply(points, 100))
+        else:
+            raise ValueError(f"Unsupported IR annotation type: {type(ann)}")
+
+    def add_ir_annotations(self, anns: Sequence[IRImageAnnotationBase]):
+        for ann in anns:
+            self.add_ir_annotation(ann)
+
+    def add_table_rows(self, table: IRAnnotationTable, rows: Optional[np.ndarray] = None):
+        """
+        Adds rows of a table (all of them by default).
+        The values are scaled in bulk, normalizing the table beforehand saves doing it for every call.
+        """
+        if rows is not None:
+            table = table.take(rows)
+        if len(table) == 0:
+            return
+        table = table.normalized()
+        categories = [table.category_names[cat_id] for cat_id in table.single_category_ids().tolist()]
+        boxes = np.multiply(table.boxes, 100).tolist()
+        points = np.multiply(table.points, 100)
+        point_offsets = table.point_offsets.tolist()
+        for row, (kind, category, (width, height), (b0, b1, b2, b3), rotation) in enumerate(
+            zip(table.kinds.tolist(), categories, table.image_sizes.tolist(), boxes, table.rotations.tolist())
+        ):
+            if kind == BBOX_KIND:
+                self.add_bbox(category, width, height, b0, b1, b2, b3, rotation)
+            elif kind == ELLIPSE_KIND:
+                self.add_ellipse(category, width, height, b0, b1, b2, b3, rotation)
+            elif kind == SEGMENTATION_KIND:
+                self.add_polygon(category, width, height, points[point_offsets[row] : point_offsets[row + 1]])
+            elif kind == POSE_KIND:
+                self.add_pose(
+                    category, width, height, b0, b1, b2, b3, points[point_offsets[row] : point_offsets[row + 1]]
+                )
+            else:
+                raise ValueError(f"Unknown annotation kind {kind}")
+
+
+def task_json(task: LabelStudioTask, results: LSResults) -> str:
+    """
+    Serializes the task with the results added to it.
+    The task itself isn't modified.
+
+    The output is the same as ``task.add_ir_annotations(annotations); task.model_dump_json()``.
+    """
+    data = task.data
+    if results.pose_boxes:
+        data = dict(data)
+        data[PosePointsLookupKey] = [*data.get(PosePointsLookupKey, []), *results.pose_points]
+        data[PoseBBoxLookupKey] = [*data.get(PoseBBoxLookupKey, []), *results.pose_boxes]
+
+    containers = [container.model_dump_json() for container in task.annotations[1:]]
+    if task.annotations:
+        first = task.annotations[0]
+        completed_by, ground_truth = first.completed_by, first.ground_truth
+        result_jsons = [result.model_dump_json() for result in first.result] + results.results
+    else:
+        completed_by, ground_truth = task.user_id, False
+        result_jsons = results.results
+    if task.annotations or result_jsons:
+        containers.insert(
+            0,
+            f'{{"completed_by":{json.dumps(completed_by)},"result":[{",".join(result_jsons)}],'
+            f'"ground_truth":{json.dumps(ground_truth)}}}',
+        )
+
+    # Everything besides the annotations is serialized by pydantic, the rest of the fields are cheap
+    header = task.model_copy(update={"data": data}).model_dump_json(exclude={"annotations"})
+    return f'{{"annotations":[{",".join(containers)}],{header[1:]}'
+
+
+def ir_annotations_to_task_json(task: LabelStudioTask, annotations: Sequence[IRImageAnnotationBase]) -> str:
+    """
+    Serializes the task with the annotations added to it, without creating the Label Studio result models.
+    The task itself isn't modified.
+    """
+    results = LSResults()
+    results.add_ir_annotations(annotations)
+    return task_json(task, results)
+
+
+def json_str(value: str) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def json_float(value: float) -> str:
+    """
+    Formats the float the way pydantic serializes it to JSON.
+
+    Outside the exponent notation it's the same as ``repr``.
+    Numbers in the exponent notation are rare, and their format differs between pydantic-core versions,
+    so they are formatted by pydantic itself.
+    Infinities and NaN are serialized as null.
+    """
+    res = float.__repr__(value)
+    if "e" not in res:
+        return "null" if res[-1] in "fn" else res
+    return to_json(value).decode()
+
+
+def json_points(points: np.ndarray) -> str:
+    """Formats a (K, 2) array of points as a JSON list of [x, y] lists"""
+    points_list = points.tolist()
+    res = json.dumps(points_list, separators=(",", ":"))
+    # json.dumps uses the float repr, only numbers in the exponent notation or non-finite numbers differ from pydantic
+    if "e" in res or "N" in res or "I" in res:
+        res = "[" + ",".join(f"[{json_float(x)},{json_float(y)}]" for x, y in points_list) + "]"
+    return res
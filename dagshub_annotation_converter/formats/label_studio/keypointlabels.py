@@ -1,4 +1,4 @@
-from typing import Sequence, List
+from typing import Sequence, List, Literal
 
 from dagshub_annotation_converter.formats.label_studio.base import ImageAnnotationResultABC
 from dagshub_annotation_converter.formats.label_studio.rectanglelabels import (
@@ -23,7 +23,7 @@ class KeyPointLabelsAnnotationValue(ParentModel):
 
 class KeyPointLabelsAnnotation(ImageAnnotationResultABC):
     value: KeyPointLabelsAnnotationValue
-    type: str = "keypointlabels"
+    type: Literal["keypointlabels"] = "keypointlabels"
 
     def to_ir_annotation(self) -> List[IRPoseImageAnnotation]:
         ann = IRPoseImageAnnotation.from_points(
@@ -56,14 +56,14 @@ class KeyPointLabelsAnnotation(ImageAnnotationResultABC):
         )
 
         points = []
-        for point in ir_annotation.points:
+        for x, y in ir_annotation.point_array().coords.tolist():
             points.append(
                 KeyPointLabelsAnnotation(
                     original_width=ir_annotation.image_width,
                     original_height=ir_annotation.image_height,
                     value=KeyPointLabelsAnnotationValue(
-                        x=point.x * 100,
-                        y=point.y * 100,
+                        x=x * 100,
+                        y=y * 100,
                         keypointlabels=[category],
                     ),
                 )
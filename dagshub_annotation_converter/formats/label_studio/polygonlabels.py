@@ -1,7 +1,14 @@
-from typing import Sequence, List
+from typing import Sequence, List, Literal
+
+import numpy as np
 
 from dagshub_annotation_converter.formats.label_studio.base import ImageAnnotationResultABC
-from dagshub_annotation_converter.ir.image import IRSegmentationImageAnnotation, CoordinateStyle, IRImageAnnotationBase
+from dagshub_annotation_converter.ir.image import (
+    IRSegmentationImageAnnotation,
+    IRSegmentationPoints,
+    CoordinateStyle,
+    IRImageAnnotationBase,
+)
 from dagshub_annotation_converter.util.pydantic_util import ParentModel
 
 
@@ -13,7 +20,7 @@ class PolygonLabelsAnnotationValue(ParentModel):
 
 class PolygonLabelsAnnotation(ImageAnnotationResultABC):
     value: PolygonLabelsAnnotationValue
-    type: str = "polygonlabels"
+    type: Literal["polygonlabels"] = "polygonlabels"
 
     def to_ir_annotation(self) -> List[IRSegmentationImageAnnotation]:
         res = IRSegmentationImageAnnotation(
@@ -21,9 +28,8 @@ class PolygonLabelsAnnotation(ImageAnnotationResultABC):
             coordinate_style=CoordinateStyle.NORMALIZED,
             image_width=self.original_width,
             image_height=self.original_height,
+            points=IRSegmentationPoints.from_array(np.divide(self.value.points, 100)).to_list(),
         )
-        for p in self.value.points:
-            res.add_point(p[0] / 100, p[1] / 100)
         res.imported_id = self.id
         return [res]
 
@@ -39,7 +45,7 @@ class PolygonLabelsAnnotation(ImageAnnotationResultABC):
                 original_width=ir_annotation.image_width,
                 original_height=ir_annotation.image_height,
                 value=PolygonLabelsAnnotationValue(
-                    points=[[p.x * 100, p.y * 100] for p in ir_annotation.points],
+                    points=np.multiply(ir_annotation.point_array().coords, 100).tolist(),
                     polygonlabels=[category],
                 ),
             )
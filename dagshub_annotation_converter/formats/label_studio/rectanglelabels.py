@@ -1,4 +1,4 @@
-from typing import Sequence, List
+from typing import Sequence, List, Literal
 
 from dagshub_annotation_converter.formats.label_studio.base import ImageAnnotationResultABC
 from dagshub_annotation_converter.ir.image import IRBBoxImageAnnotation, CoordinateStyle, IRImageAnnotationBase
@@ -16,7 +16,7 @@ class RectangleLabelsAnnotationValue(ParentModel):
 
 class RectangleLabelsAnnotation(ImageAnnotationResultABC):
     value: RectangleLabelsAnnotationValue
-    type: str = "rectanglelabels"
+    type: Literal["rectanglelabels"] = "rectanglelabels"
 
     def to_ir_annotation(self) -> List[IRBBoxImageAnnotation]:
         res = IRBBoxImageAnnotation(
@@ -1,14 +1,16 @@
 import datetime
 import logging
-import random
-from typing import Any, Sequence, Type, Optional, Union, cast, List, Dict
+from typing import Any, Sequence, Type, Optional, Union, cast, List, Dict, Set, Collection, Iterator, Tuple, TypeVar
+
+import numpy as np
 
 from typing_extensions import Annotated
 
-from pydantic import SerializeAsAny, Field, BeforeValidator
+from pydantic import SerializeAsAny, Field, TypeAdapter
 
 from dagshub_annotation_converter.formats.label_studio.base import AnnotationResultABC, ImageAnnotationResultABC
 from dagshub_annotation_converter.formats.label_studio.ellipselabels import EllipseLabelsAnnotation
+from dagshub_annotation_converter.formats.label_studio.ids import generate_task_id
 from dagshub_annotation_converter.formats.label_studio.keypointlabels import KeyPointLabelsAnnotation
 from dagshub_annotation_converter.formats.label_studio.polygonlabels import PolygonLabelsAnnotation
 from dagshub_annotation_converter.formats.label_studio.rectanglelabels import RectangleLabelsAnnotation
@@ -17,11 +19,13 @@ from dagshub_annotation_converter.ir.image import (
     IRPoseImageAnnotation,
     IRBBoxImageAnnotation,
     CoordinateStyle,
-    IRPosePoint,
+    IRPosePoints,
     IRSegmentationImageAnnotation,
     IREllipseImageAnnotation,
 )
-from dagshub_annotation_converter.util.pydantic_util import ParentModel
+from dagshub_annotation_converter.ir.image.annotations.points import visibility_codes
+from dagshub_annotation_converter.ir.image.table import offsets_from_counts
+from dagshub_annotation_converter.util.pydantic_util import ParentModel, gc_paused, validate_models
 
 task_lookup: Dict[str, Type[AnnotationResultABC]] = {
     "polygonlabels": PolygonLabelsAnnotation,
@@ -37,26 +41,29 @@ ir_annotation_lookup: Dict[Type[IRImageAnnotationBase], Type[ImageAnnotationResu
     IREllipseImageAnnotation: EllipseLabelsAnnotation,
 }
 
-logger = logging.getLogger(__name__)
+# IR type that each type of results converts into
+ls_result_ir_types: Dict[Type[AnnotationResultABC], Type[IRImageAnnotationBase]] = {
+    v: k for k, v in ir_annotation_lookup.items()
+}
 
+R = TypeVar("R", bound=AnnotationResultABC)
 
-def ls_annotation_validator(v: Any) -> List[AnnotationResultABC]:
-    assert isinstance(v, list)
+logger = logging.getLogger(__name__)
 
-    annotations: List[AnnotationResultABC] = []
 
-    for raw_annotation in v:
-        assert isinstance(raw_annotation, dict)
-        assert "type" in raw_annotation
-        assert raw_annotation["type"] in task_lookup
+# Results are dispatched on the "type" field by the compiled validator, without going through Python for each result
+AnnotationResult = Annotated[
+    Union[tuple(task_lookup.values())],  # type: ignore[valid-type]
+    Field(discriminator="type"),
+]
 
-        ann_class = task_lookup[raw_annotation["type"]]
-        annotations.append(ann_class.model_validate(raw_annotation))
+AnnotationsList = List[SerializeAsAny[AnnotationResult]]
 
-    return annotations
+_annotations_list_adapter: TypeAdapter[AnnotationsList] = TypeAdapter(AnnotationsList)
 
 
-AnnotationsList = Annotated[List[SerializeAsAny[AnnotationResultABC]], BeforeValidator(ls_annotation_validator)]
+def ls_annotation_validator(v: Any) -> List[AnnotationResultABC]:
+    return cast(List[AnnotationResultABC], _annotations_list_adapter.validate_python(v))
 
 
 class AnnotationsContainer(ParentModel):
@@ -73,6 +80,96 @@ PosePointsLookupKey = "pose_points"
 PoseBBoxLookupKey = "pose_boxes"
 
 
+class LabelStudioTaskDiff(ParentModel):
+    """
+    Result-level changes between two versions of the annotations of a task.
+    Only the changed results are included, so it's much smaller than the whole task.
+    """
+
+    added: AnnotationsList = []
+    """Results that are new in the new version of the task"""
+    removed: List[str] = []
+    """IDs of the results that don't exist in the new version of the task"""
+    pose_boxes: List[str] = []
+    """Pose metadata of the task after the change (see :meth:`LabelStudioTask.log_pose_metadata`)"""
+    pose_points: List[List[str]] = []
+
+    def is_empty(self) -> bool:
+        return len(self.added) == 0 and len(self.removed) == 0
+
+
+def _result_content_key(result: AnnotationResultABC) -> str:
+    """Key that is the same for results with the same content, regardless of their ids"""
+    return result.model_dump_json(exclude={"id"})
+
+
+def _result_category(result: AnnotationResultABC) -> str:
+    # The labels are stored in the value under the name of the type, e.g. value.rectanglelabels
+    return getattr(result.value, result.type)[0]  # type: ignore[attr-defined]
+
+
+def _assemble_poses(
+    groups: List[Tuple[Optional[IRBBoxImageAnnotation], List[IRPoseImageAnnotation]]],
+    filename: Optional[str] = None,
+) -> List[IRPoseImageAnnotation]:
+    """
+    Builds pose annotations out of their bbox and points in one batch.
+    Poses without a bbox get the extents of their points as the bbox.
+
+    :param groups: (bbox, points) of every pose, every pose has to have at least one point
+    :param filename: Filename of the poses. Defaults to the filename of the bbox or the first point
+    """
+    if len(groups) == 0:
+        return []
+
+    # Values of the poses, the points of all poses are gathered into one array
+    raw_poses: List[Dict[str, Any]] = []
+    point_values: List[Tuple[float, float, int]] = []
+    point_counts: List[int] = []
+    for bbox, point_anns in groups:
+        # Category and image dimensions come from the bbox, or the first point if there's no bbox
+        source: IRImageAnnotationBase = bbox if bbox is not None else point_anns[0]
+        raw_poses.append(
+            {
+                "filename": filename if filename is not None else source.filename,
+                "categories": {source.ensure_has_one_category(): 1.0},
+                "coordinate_style": CoordinateStyle.NORMALIZED,
+                "image_width": source.image_width,
+                "image_height": source.image_height,
+            }
+        )
+        for point_ann in point_anns:
+            if isinstance(point_ann.points, IRPosePoints):
+                xs, ys = point_ann.points.coords.T.tolist()
+                point_values.extend(zip(xs, ys, point_ann.points.visibility.tolist()))  # type: ignore[union-attr]
+            else:
+                point_values.extend((p.x, p.y, visibility_codes[p.visible]) for p in point_ann.points)
+        point_counts.append(sum(len(point_ann.points) for point_ann in point_anns))
+
+    values = np.array(point_values, dtype=np.float64)
+    coords = values[:, :2]
+    visibility = values[:, 2]
+    offsets = offsets_from_counts(point_counts)
+    # Extents of the points of every pose, used as the bounding box of poses that don't have one
+    mins = np.minimum.reduceat(coords, offsets[:-1], axis=0)
+    maxs = np.maximum.reduceat(coords, offsets[:-1], axis=0)
+    extents = np.concatenate([mins, maxs - mins], axis=1).tolist()
+
+    starts, ends = offsets[:-1].tolist(), offsets[1:].tolist()
+    for raw_pose, (bbox, _), (left, top, width, height), start, end in zip(raw_poses, groups, extents, starts, ends):
+        if bbox is not None:
+            left, top, width, height = bbox.left, bbox.top, bbox.width, bbox.height
+        raw_pose.update(
+            left=left,
+            top=top,
+            width=width,
+            height=height,
+            points=IRPosePoints.from_array(coords[start:end], visibility[start:end]).to_dicts(),
+        )
+
+    return validate_models(IRPoseImageAnnotation, raw_poses)
+
+
 class LabelStudioTask(ParentModel):
     annotations: List[AnnotationsContainer] = Field(
         default_factory=lambda: [],
@@ -83,7 +180,7 @@ class LabelStudioTask(ParentModel):
     project: int = 0
     created_at: datetime.datetime = datetime.datetime.now(tz=datetime.timezone.utc)
     updated_at: datetime.datetime = datetime.datetime.now(tz=datetime.timezone.utc)
-    id: int = Field(default_factory=lambda: random.randint(0, 2**63 - 1))
+    id: int = Field(default_factory=generate_task_id)
 
     user_id: int = Field(exclude=True, default=1)
 
@@ -112,104 +209,125 @@ class LabelStudioTask(ParentModel):
         self.data[PosePointsLookupKey].append([point.id for point in keypoints])
 
     def to_ir_annotations(self, filename: Optional[str] = None) -> Sequence[IRImageAnnotationBase]:
-        res: List[IRImageAnnotationBase] = []
-        for anns in self.annotations:
-            for ann in anns.result:
-                to_add = ann.to_ir_annotation()
+        return list(self.iter_ir_annotations(filename=filename))
+
+    def iter_ir_annotations(
+        self,
+        filename: Optional[str] = None,
+        annotation_types: Optional[Collection[Type[IRImageAnnotationBase]]] = None,
+        categories: Optional[Collection[str]] = None,
+        ground_truth_only: bool = False,
+    ) -> Iterator[IRImageAnnotationBase]:
+        """
+        Lazily converts the results of the task to IR annotations.
+        Results that don't match the filters are skipped without being converted.
+
+        Poses are reconstructed from their bbox and keypoint results (see :meth:`log_pose_metadata`),
+        and are yielded after the rest of the annotations.
+
+        :param filename: Filename to set on the annotations
+        :param annotation_types: Only yield annotations of these IR types
+        :param categories: Only yield annotations of these categories
+        :param ground_truth_only: Only yield annotations of the annotation containers marked as ground truth
+        """
+        results = [
+            result
+            for container in self.annotations
+            if container.ground_truth or not ground_truth_only
+            for result in container.result
+        ]
+        # Pose membership is decided up front from the metadata, so the results of the poses are never converted
+        # into separate annotations
+        pose_groups = self._pose_groups(
+            {result.id: result for result in results}, RectangleLabelsAnnotation, KeyPointLabelsAnnotation
+        )
+        pose_member_ids: Set[str] = set()
+        for bbox, points in pose_groups:
+            if bbox is not None:
+                pose_member_ids.add(bbox.id)
+            pose_member_ids.update(point.id for point in points)
+
+        for result in results:
+            if result.id in pose_member_ids:
+                continue
+            if annotation_types is not None and ls_result_ir_types.get(type(result)) not in annotation_types:
+                continue
+            if categories is not None and _result_category(result) not in categories:
+                continue
+            for ann in result.to_ir_annotation():
                 if filename is not None:
-                    for a in to_add:
-                        a.filename = filename
-                res.extend(to_add)
-        res = self._reimport_poses(res)
-        return res
+                    ann.filename = filename
+                yield ann
+
+        if annotation_types is not None and IRPoseImageAnnotation not in annotation_types:
+            return
+
+        ir_pose_groups: List[Tuple[Optional[IRBBoxImageAnnotation], List[IRPoseImageAnnotation]]] = []
+        for bbox, points in pose_groups:
+            # Category comes from the bbox, or the first point if there's no bbox
+            if categories is not None and _result_category(bbox if bbox is not None else points[0]) not in categories:
+                continue
+            ir_pose_groups.append(
+                (
+                    bbox.to_ir_annotation()[0] if bbox is not None else None,
+                    [point.to_ir_annotation()[0] for point in points],
+                )
+            )
+        poses = _assemble_poses(ir_pose_groups, filename)
+        logger.debug(f"Consolidated {len(poses)} pose annotations for LS Task {self.id}")
+        yield from poses
 
-    def _reimport_poses(self, annotations: List[IRImageAnnotationBase]) -> List[IRImageAnnotationBase]:
+    def _pose_groups(
+        self, lookup: Dict[str, R], bbox_type: Type[R], point_type: Type[R]
+    ) -> List[Tuple[Optional[R], List[R]]]:
+        """
+        Finds the bbox and the points of every pose logged in the metadata of the task.
+        Poses without any points are skipped.
+
+        :param lookup: Annotations by their ID
+        :param bbox_type: Type of the bbox annotations
+        :param point_type: Type of the point annotations
+        :return: (bbox, points) of every pose. The bbox is None if it's missing.
+        """
         if PosePointsLookupKey not in self.data or PoseBBoxLookupKey not in self.data:
-            return annotations
+            return []
 
-        # Build a dictionary of all annotation indexes in the task by id
-        # Keep the indexes instead of annotations, so we can pop them for convenience
-        annotation_lookup = {ann.imported_id: ann for ann in annotations if ann.imported_id is not None}
         pose_bboxes: List[str] = self.data[PoseBBoxLookupKey]
         pose_points: List[List[str]] = self.data[PosePointsLookupKey]
 
-        annotations_to_remove: set[str] = set()
-        poses: List[IRPoseImageAnnotation] = []
-
+        groups: List[Tuple[Optional[R], List[R]]] = []
         for bbox_id, point_ids in zip(pose_bboxes, pose_points):
             # Fetch the bbox of the pose
-            maybe_bbox = annotation_lookup.get(bbox_id)
-            bbox: Optional[IRBBoxImageAnnotation] = None
-            category: Optional[str] = None
-            image_width: Optional[int] = None
-            image_height: Optional[int] = None
+            maybe_bbox = lookup.get(bbox_id)
+            bbox: Optional[R] = None
             if maybe_bbox is None:
                 logger.warning(
                     f"Bounding box of pose with annotation ID {bbox_id} "
                     f"does not exist in the task but exists in metadata"
                 )
-            elif not isinstance(maybe_bbox, IRBBoxImageAnnotation):
+            elif not isinstance(maybe_bbox, bbox_type):
                 logger.warning(f"Bounding box of pose with annotation ID {bbox_id} is not a bounding box annotation")
             else:
                 bbox = maybe_bbox
-                category = bbox.ensure_has_one_category()
-                image_height = bbox.image_height
-                image_width = bbox.image_width
-                annotations_to_remove.add(bbox_id)
             # Fetch the points
-            points: List[IRPosePoint] = []
+            points: List[R] = []
             for point_id in point_ids:
-                maybe_point = annotation_lookup.get(point_id)
+                maybe_point = lookup.get(point_id)
                 if maybe_point is None:
                     logger.warning(
                         f"Point of pose with annotation ID {bbox_id} "
                         f"does not exist in the task but exists in metadata"
                     )
-                    continue
-                elif not isinstance(maybe_point, IRPoseImageAnnotation):
+                elif not isinstance(maybe_point, point_type):
                     logger.warning(f"Point of pose with annotation ID {point_id} is not a point annotation")
-                    continue
                 else:
-                    if category is None:
-                        category = maybe_point.ensure_has_one_category()
-                    if image_width is None:
-                        image_width = maybe_point.image_width
-                    if image_height is None:
-                        image_height = maybe_point.image_height
-                    points.extend(maybe_point.points)
-                    annotations_to_remove.add(point_id)
+                    points.append(maybe_point)
 
             if len(points) == 0:
-                logger.warning(f"No points found for the pose on LS Task {self.id}")
-                return annotations
-
-            assert category is not None
-            assert image_width is not None
-            assert image_height is not None
-
-            sum_annotation = IRPoseImageAnnotation.from_points(
-                categories={category: 1.0},
-                points=points,
-                coordinate_style=CoordinateStyle.NORMALIZED,
-                image_width=image_width,
-                image_height=image_height,
-            )
-            if bbox is not None:
-                sum_annotation.width = bbox.width
-                sum_annotation.height = bbox.height
-                sum_annotation.top = bbox.top
-                sum_annotation.left = bbox.left
-
-            poses.append(sum_annotation)
-
-        logger.debug(f"Consolidated {len(poses)} pose annotations for LS Task {self.id}")
-
-        if len(poses) == 0:
-            return annotations
-
-        annotations = list(filter(lambda ann: ann.imported_id not in annotations_to_remove, annotations))
-        annotations.extend(poses)
-        return annotations
+                logger.warning(f"No points found for the pose with annotation ID {bbox_id} on LS Task {self.id}")
+                continue
+            groups.append((bbox, points))
+        return groups
 
     def add_ir_annotation(self, ann: IRImageAnnotationBase):
         ls_ann_type = ir_annotation_lookup.get(type(ann))
@@ -230,6 +348,102 @@ class LabelStudioTask(ParentModel):
         for ann in anns:
             self.add_ir_annotation(ann)
 
+    def diff(self, new_task: "LabelStudioTask") -> LabelStudioTaskDiff:
+        """
+        Computes the changes in the results of the first annotation container
+        (the one that ``add_annotation`` adds to) between this task and ``new_task``.
+
+        Results are matched by their content, so results that stay the same keep their existing IDs,
+        even though the matching results in ``new_task`` were created with new ones.
+
+        :param new_task: New version of the task, e.g. a task built from the new predictions
+        """
+        old_results = self.annotations[0].result if self.annotations else []
+        new_results = new_task.annotations[0].result if new_task.annotations else []
+
+        existing_ids: Dict[str, List[str]] = {}
+        for result in old_results:
+            existing_ids.setdefault(_result_content_key(result), []).append(result.id)
+
+        # IDs of the results in the new task that match an existing result
+        id_map: Dict[str, str] = {}
+        added: List[AnnotationResultABC] = []
+        for result in new_results:
+            matching_ids = existing_ids.get(_result_content_key(result))
+            if matching_ids:
+                id_map[result.id] = matching_ids.pop(0)
+            else:
+                added.append(result)
+        removed = [result_id for result_ids in existing_ids.values() for result_id in result_ids]
+
+        # Poses that lost any of their results get dropped, the new poses get their results' final IDs
+        removed_set = set(removed)
+        pose_boxes: List[str] = []
+        pose_points: List[List[str]] = []
+        for bbox_id, point_ids in zip(self.data.get(PoseBBoxLookupKey, []), self.data.get(PosePointsLookupKey, [])):
+            if bbox_id not in removed_set and removed_set.isdisjoint(point_ids):
+                pose_boxes.append(bbox_id)
+                pose_points.append(point_ids)
+        known_boxes = set(pose_boxes)
+        for bbox_id, point_ids in zip(
+            new_task.data.get(PoseBBoxLookupKey, []), new_task.data.get(PosePointsLookupKey, [])
+        ):
+            bbox_id = id_map.get(bbox_id, bbox_id)
+            if bbox_id not in known_boxes:
+                pose_boxes.append(bbox_id)
+                pose_points.append([id_map.get(point_id, point_id) for point_id in point_ids])
+
+        return LabelStudioTaskDiff(added=added, removed=removed, pose_boxes=pose_boxes, pose_points=pose_points)
+
+    def diff_ir_annotations(self, anns: Sequence[IRImageAnnotationBase]) -> LabelStudioTaskDiff:
+        """
+        Computes the changes between the results of this task and the results of the annotations.
+        See :meth:`diff`.
+        """
+        new_task = LabelStudioTask(user_id=self.user_id)
+        new_task.add_ir_annotations(anns)
+        return self.diff(new_task)
+
+    def apply_diff(self, diff: LabelStudioTaskDiff) -> "LabelStudioTask":
+        """
+        Returns a copy of the task with the changes applied.
+        Results that didn't change are reused as is, without copying or validating them again.
+        """
+        removed = set(diff.removed)
+        if self.annotations:
+            first = self.annotations[0]
+            results = [result for result in first.result if result.id not in removed] + list(diff.added)
+            containers = [first.model_copy(update={"result": results}), *self.annotations[1:]]
+        elif diff.added:
+            containers = [AnnotationsContainer(completed_by=self.user_id, result=list(diff.added))]
+        else:
+            containers = []
+
+        data = dict(self.data)
+        if diff.pose_boxes or PoseBBoxLookupKey in data:
+            data[PosePointsLookupKey] = diff.pose_points
+            data[PoseBBoxLookupKey] = diff.pose_boxes
+
+        return self.model_copy(update={"annotations": containers, "data": data})
+
 
 def parse_ls_task(task: Union[str, bytes]) -> LabelStudioTask:
     return LabelStudioTask.model_validate_json(task)
+
+
+_tasks_adapter: TypeAdapter[List[LabelStudioTask]] = TypeAdapter(List[LabelStudioTask])
+
+
+def parse_ls_tasks_bulk(tasks: Union[str, bytes], pause_gc: bool = False) -> List[LabelStudioTask]:
+    """
+    Parses a JSON array of Label Studio tasks (e.g. a whole project export) in one go.
+
+    :param tasks: JSON array of the tasks
+    :param pause_gc: Pause the cyclic garbage collector of the whole process while the tasks are validated.
+        Makes parsing big exports about twice as fast, at the cost of not collecting garbage
+        of other threads in the meantime.
+    """
+    if not pause_gc:
+        return _tasks_adapter.validate_json(tasks)
+    with gc_paused():
+        return _tasks_adapter.validate_json(tasks)
@@ -3,7 +3,7 @@ from .context import YoloContext, YoloAnnotationTypes, YoloConverterFunction
 from .pose import export_pose, import_pose_from_string, import_pose_2dim, import_pose_3dim
 from .segmentation import export_segmentation, import_segmentation, import_segmentation_from_string
 from .common import allowed_annotation_types, export_lookup, import_lookup
-from .result_import import import_yolo_result
+from .result_import import import_yolo_result, import_yolo_results
 
 __all__ = [
     "export_bbox",
@@ -23,4 +23,5 @@ __all__ = [
     "export_lookup",
     "import_lookup",
     "import_yolo_result",
+    "import_yolo_results",
 ]
@@ -83,4 +83,6 @@ def export_bbox(
     center_x = annotation.left + annotation.width / 2
     center_y = annotation.top + annotation.height / 2
     cat_id = context.categories[category].id
-    return f"{cat_id} {center_x} {center_y} {annotation.width} {annotation.height}"
+    return " ".join(
+        [str(cat_id), *context.format_coordinates([center_x, center_y, annotation.width, annotation.height])]
+    )
@@ -0,0 +1,472 @@
+import itertools
+import logging
+from os import PathLike
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from dagshub_annotation_converter.formats.yolo.categories import determine_category
+from dagshub_annotation_converter.formats.yolo.context import YoloAnnotationTypes, YoloContext
+from dagshub_annotation_converter.ir.image import (
+    CoordinateStyle,
+    IRBBoxImageAnnotation,
+    IRImageAnnotationBase,
+    IRPoseImageAnnotation,
+    IRSegmentationImageAnnotation,
+    IRAnnotationTable,
+    IRPosePoints,
+    IRSegmentationPoints,
+)
+from dagshub_annotation_converter.ir.image.table import BBOX_KIND, POSE_KIND, SEGMENTATION_KIND
+from dagshub_annotation_converter.util.pydantic_util import validate_models
+
+logger = logging.getLogger(__name__)
+
+
+class YoloBBoxArrays(NamedTuple):
+    class_ids: np.ndarray
+    """(N,) class id of each box"""
+    boxes: np.ndarray
+    """(N, 4) center_x, center_y, width, height of each box"""
+
+
+class YoloSegmentationArrays(NamedTuple):
+    class_ids: np.ndarray
+    """(N,) class id of each polygon"""
+    offsets: np.ndarray
+    """(N + 1,) points of polygon ``i`` are ``points[offsets[i]:offsets[i + 1]]``"""
+    points: np.ndarray
+    """(M, 2) x, y of the points of all polygons"""
+
+
+class YoloPoseArrays(NamedTuple):
+    class_ids: np.ndarray
+    """(N,) class id of each pose"""
+    boxes: np.ndarray
+    """(N, 4) center_x, center_y, width, height of the bounding box of each pose"""
+    offsets: np.ndarray
+    """(N + 1,) keypoints of pose ``i`` are ``points[offsets[i]:offsets[i + 1]]``"""
+    points: np.ndarray
+    """(M, 2) x, y of the keypoints of all poses"""
+    visibility: Optional[np.ndarray]
+    """(M,) visibility value of each keypoint. ``None`` for 2-dimensional keypoints"""
+
+
+YoloArrays = Union[YoloBBoxArrays, YoloSegmentationArrays, YoloPoseArrays]
+
+
+def _split_rows(text: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converts all numbers in the text to floats at once.
+
+    :return: (all values, index of the first value of each row, amount of values in each row)
+    """
+    rows = [line.split() for line in text.splitlines()]
+    rows = [row for row in rows if row]
+    lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+    try:
+        values = np.array(list(itertools.chain.from_iterable(rows)), dtype=np.float64)
+    except ValueError as e:
+        raise ValueError(f"Couldn't parse YOLO annotations: {e}") from e
+    starts = np.zeros(len(rows), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    return values, starts, lengths
+
+
+def _to_class_ids(values: np.ndarray) -> np.ndarray:
+    class_ids = values.astype(np.int64)
+    if not np.array_equal(class_ids, values):
+        raise ValueError("Class ids of YOLO annotations have to be integers")
+    return class_ids
+
+
+def _offsets(counts: np.ndarray) -> np.ndarray:
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def parse_bbox_labels(text: str) -> YoloBBoxArrays:
+    """
+    Parses the contents of a bounding box label file.
+    Every row has to have at least 5 values, extra values are ignored.
+    """
+    values, starts, lengths = _split_rows(text)
+    if len(lengths) and lengths.min() < 5:
+        raise ValueError("Every YOLO bounding box annotation has to have a class id and 4 coordinates")
+    if np.all(lengths == 5):
+        table = values.reshape(-1, 5)
+    else:
+        table = values[starts[:, None] + np.arange(5)]
+    return YoloBBoxArrays(class_ids=_to_class_ids(table[:, 0]), boxes=table[:, 1:5])
+
+
+def parse_segmentation_labels(text: str) -> YoloSegmentationArrays:
+    """
+    Parses the contents of a segmentation label file.
+    """
+    values, starts, lengths = _split_rows(text)
+    if np.any(lengths % 2 != 1):
+        raise ValueError("Every YOLO segmentation annotation has to have a class id and pairs of coordinates")
+
+    is_class_id = np.zeros(len(values), dtype=bool)
+    is_class_id[starts] = True
+    return YoloSegmentationArrays(
+        class_ids=_to_class_ids(values[starts]),
+        offsets=_offsets((lengths - 1) // 2),
+        points=values[~is_class_id].reshape(-1, 2),
+    )
+
+
+def parse_pose_labels(text: str, keypoint_dim: int = 3) -> YoloPoseArrays:
+    """
+    Parses the contents of a pose label file.
+
+    :param keypoint_dim: Dimension of the keypoints: 2 - x, y; 3 - x, y, visibility
+    """
+    if keypoint_dim not in (2, 3):
+        raise ValueError(f"Unsupported keypoint dimension {keypoint_dim}")
+
+    values, starts, lengths = _split_rows(text)
+    if np.any(lengths < 5) or np.any((lengths - 5) % keypoint_dim != 0):
+        raise ValueError(
+            f"Every YOLO pose annotation has to have a class id, 4 coordinates and {keypoint_dim}-dimensional keypoints"
+        )
+
+    is_header = np.zeros(len(values), dtype=bool)
+    header_idx = starts[:, None] + np.arange(5)
+    is_header[header_idx.ravel()] = True
+    header = values[header_idx]
+    keypoints = values[~is_header].reshape(-1, keypoint_dim)
+
+    return YoloPoseArrays(
+        class_ids=_to_class_ids(header[:, 0]),
+        boxes=header[:, 1:5],
+        offsets=_offsets((lengths - 5) // keypoint_dim),
+        points=keypoints[:, :2],
+        visibility=keypoints[:, 2] if keypoint_dim == 3 else None,
+    )
+
+
+def parse_labels(text: str, annotation_type: YoloAnnotationTypes, keypoint_dim: int = 3) -> YoloArrays:
+    if annotation_type == "bbox":
+        return parse_bbox_labels(text)
+    elif annotation_type == "segmentation":
+        return parse_segmentation_labels(text)
+    elif annotation_type == "pose":
+        return parse_pose_labels(text, keypoint_dim)
+    raise ValueError(f"Unknown annotation type: {annotation_type}")
+
+
+def parse_label_files(
+    paths: Sequence[Union[str, PathLike]],
+    annotation_type: YoloAnnotationTypes,
+    keypoint_dim: int = 3,
+) -> Tuple[YoloArrays, np.ndarray]:
+    """
+    Parses multiple label files (for example, all label files of a directory) into one set of arrays.
+
+    :return: The arrays, and (len(paths) + 1,) offsets:
+        annotations of file ``i`` are the rows ``file_offsets[i]:file_offsets[i + 1]`` of the arrays
+    """
+    texts = []
+    row_counts = np.zeros(len(paths), dtype=np.int64)
+    for i, path in enumerate(paths):
+        with open(path) as f:
+            text = f.read()
+        row_counts[i] = sum(1 for line in text.splitlines() if line.strip())
+        texts.append(text)
+    return parse_labels("\n".join(texts), annotation_type, keypoint_dim), _offsets(row_counts)
+
+
+def _category_names(class_ids: np.ndarray, context: YoloContext) -> List[str]:
+    unique_ids, inverse = np.unique(class_ids, return_inverse=True)
+    names = [determine_category(int(class_id), context.categories).name for class_id in unique_ids]
+    return [names[i] for i in inverse.ravel().tolist()]
+
+
+def arrays_to_ir(
+    arrays: YoloArrays,
+    context: YoloContext,
+    image_width: int,
+    image_height: int,
+    filename: Optional[str] = None,
+) -> List[IRImageAnnotationBase]:
+    """
+    Converts the parsed arrays of a single label file to IR annotations.
+    """
+    categories = _category_names(arrays.class_ids, context)
+    common = {
+        "image_width": image_width,
+        "image_height": image_height,
+        "coordinate_style": CoordinateStyle.NORMALIZED,
+        "filename": filename,
+    }
+
+    if isinstance(arrays, YoloSegmentationArrays):
+        offsets = arrays.offsets.tolist()
+        raw = [
+            {
+                "categories": {category: 1.0},
+                "points": IRSegmentationPoints.from_array(arrays.points[offsets[i] : offsets[i + 1]]).to_dicts(),
+                **common,
+            }
+            for i, category in enumerate(categories)
+        ]
+        return validate_models(IRSegmentationImageAnnotation, raw)
+
+    boxes = arrays.boxes
+    lefts = (boxes[:, 0] - boxes[:, 2] / 2).tolist()
+    tops = (boxes[:, 1] - boxes[:, 3] / 2).tolist()
+    widths = boxes[:, 2].tolist()
+    heights = boxes[:, 3].tolist()
+
+    if isinstance(arrays, YoloBBoxArrays):
+        raw = [
+            {
+                "categories": {category: 1.0},
+                "top": tops[i],
+                "left": lefts[i],
+                "width": widths[i],
+                "height": heights[i],
+                **common,
+            }
+            for i, category in enumerate(categories)
+        ]
+        return validate_models(IRBBoxImageAnnotation, raw)
+
+    offsets = arrays.offsets.tolist()
+    visibility = None if arrays.visibility is None else (arrays.visibility == 1).astype(np.int8)
+    raw = [
+        {
+            "categories": {category: 1.0},
+            "top": tops[i],
+            "left": lefts[i],
+            "width": widths[i],
+            "height": heights[i],
+            "points": IRPosePoints.from_array(
+                arrays.points[offsets[i] : offsets[i + 1]],
+                None if visibility is None else visibility[offsets[i] : offsets[i + 1]],
+            ).to_dicts(),
+            **common,
+        }
+        for i, category in enumerate(categories)
+    ]
+    return validate_models(IRPoseImageAnnotation, raw)
+
+
+def import_annotations_from_text(
+    text: str,
+    context: YoloContext,
+    image_width: int,
+    image_height: int,
+    filename: Optional[str] = None,
+) -> List[IRImageAnnotationBase]:
+    """
+    Parses the whole contents of a label file into IR annotations, according to ``context.annotation_type``.
+
+    All numbers of the file are converted in one go, and the annotations are validated as one batch,
+    which is much faster than parsing the file line by line with the ``import_*_from_string`` functions.
+    """
+    arrays = parse_labels(text, context.annotation_type, context.keypoint_dim)
+    return arrays_to_ir(arrays, context, image_width, image_height, filename)
+
+
+def arrays_to_table(
+    arrays: YoloArrays,
+    context: YoloContext,
+    image_width: int,
+    image_height: int,
+    filename: Optional[str] = None,
+) -> IRAnnotationTable:
+    """
+    Converts the parsed arrays of a single label file to an :class:`IRAnnotationTable`,
+    without creating any annotation objects.
+    """
+    n = len(arrays.class_ids)
+    unique_ids, inverse = np.unique(arrays.class_ids, return_inverse=True)
+    category_names = [determine_category(int(class_id), context.categories).name for class_id in unique_ids]
+
+    if isinstance(arrays, YoloSegmentationArrays):
+        kind = SEGMENTATION_KIND
+        boxes = np.full((n, 4), np.nan)
+    else:
+        kind = BBOX_KIND if isinstance(arrays, YoloBBoxArrays) else POSE_KIND
+        yolo_boxes = arrays.boxes
+        boxes = np.stack(
+            [
+                yolo_boxes[:, 0] - yolo_boxes[:, 2] / 2,
+                yolo_boxes[:, 1] - yolo_boxes[:, 3] / 2,
+                yolo_boxes[:, 2],
+                yolo_boxes[:, 3],
+            ],
+            axis=1,
+        ).reshape(-1, 4)
+
+    if isinstance(arrays, YoloBBoxArrays):
+        point_offsets = np.zeros(n + 1, dtype=np.int64)
+        points = np.zeros((0, 2))
+        point_visibility = np.zeros(0, dtype=np.int8)
+    else:
+        point_offsets = arrays.offsets
+        points = arrays.points
+        if isinstance(arrays, YoloPoseArrays) and arrays.visibility is not None:
+            point_visibility = (arrays.visibility == 1).astype(np.int8)
+        else:
+            point_visibility = np.full(len(points), -1, dtype=np.int8)
+
+    return IRAnnotationTable(
+        kinds=np.full(n, kind, dtype=np.int8),
+        filenames=[filename] if filename is not None else [],
+        filename_ids=np.full(n, 0 if filename is not None else -1, dtype=np.int64),
+        category_names=category_names,
+        category_offsets=np.arange(n + 1, dtype=np.int64),
+        category_ids=inverse.ravel().astype(np.int64),
+        confidences=np.ones(n),
+        coordinate_styles=np.zeros(n, dtype=np.int8),
+        image_sizes=np.tile(np.array([image_width, image_height], dtype=np.int64), (n, 1)),
+        boxes=boxes,
+        rotations=np.zeros(n),
+        point_offsets=point_offsets,
+        points=points,
+        point_visibility=point_visibility,
+        imported_ids=[None] * n,
+    )
+
+
+def import_table_from_text(
+    text: str,
+    context: YoloContext,
+    image_width: int,
+    image_height: int,
+    filename: Optional[str] = None,
+) -> IRAnnotationTable:
+    """
+    Parses the whole contents of a label file into an :class:`IRAnnotationTable`,
+    according to ``context.annotation_type``.
+    """
+    arrays = parse_labels(text, context.annotation_type, context.keypoint_dim)
+    return arrays_to_table(arrays, context, image_width, image_height, filename)
+
+
+_yolo_kinds = {
+    "bbox": BBOX_KIND,
+    "segmentation": SEGMENTATION_KIND,
+    "pose": POSE_KIND,
+}
+
+
+def table_to_string(table: IRAnnotationTable, rows: np.ndarray, context: YoloContext) -> Optional[str]:
+    """
+    Serializes rows of the table into the contents of a label file.
+    The output is the same as the one of ``annotations_to_string`` for the corresponding annotation objects.
+
+    :param table: Table with the annotations
+    :param rows: Indices of the rows to serialize (should be single file)
+    :param context: Exporting context
+    :return: String of the content of the file
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    matching_rows = rows[table.kinds[rows] == _yolo_kinds[context.annotation_type]]
+
+    if len(matching_rows) != len(rows):
+        logger.warning(
+            f"{table.filename(rows[0])} has {len(rows) - len(matching_rows)} "
+            f"annotations of the wrong type that won't be exported"
+        )
+
+    if len(matching_rows) == 0:
+        return None
+
+    subset = table.take(matching_rows)
+    category_ids = subset.single_category_ids()
+    yolo_ids = {cat_id: context.categories[subset.category_names[cat_id]].id for cat_id in np.unique(category_ids)}
+    cat_ids = [yolo_ids[cat_id] for cat_id in category_ids.tolist()]
+
+    if context.float_precision is not None:
+        return _format_fixed_precision(subset, cat_ids, context)
+
+    if context.annotation_type == "segmentation":
+        points = subset.points.tolist()
+        offsets = subset.point_offsets.tolist()
+        return "\n".join(
+            " ".join([str(cat_ids[i]), *[f"{x} {y}" for x, y in points[offsets[i] : offsets[i + 1]]]])
+            for i in range(len(subset))
+        )
+
+    boxes = subset.boxes
+    center_xs = (boxes[:, 0] + boxes[:, 2] / 2).tolist()
+    center_ys = (boxes[:, 1] + boxes[:, 3] / 2).tolist()
+    widths = boxes[:, 2].tolist()
+    heights = boxes[:, 3].tolist()
+
+    if context.annotation_type == "bbox":
+        for i in np.flatnonzero(subset.rotations != 0.0).tolist():
+            logger.warning(
+                f"Bounding box for file {subset.filename(i)} has a not-zero rotation. "
+                f"This is not supported by YOLO format."
+            )
+        return "\n".join(
+            f"{cat_ids[i]} {center_xs[i]} {center_ys[i]} {widths[i]} {heights[i]}" for i in range(len(subset))
+        )
+
+    points = subset.points.tolist()
+    visibility = subset.point_visibility.tolist()
+    offsets = subset.point_offsets.tolist()
+    lines = []
+    for i in range(len(subset)):
+        row_points = zip(points[offsets[i] : offsets[i + 1]], visibility[offsets[i] : offsets[i + 1]])
+        if context.keypoint_dim == 2:
+            point_list = [f"{x} {y}" for (x, y), visible in row_points if visible != 0]
+        else:
+            point_list = [f"{x} {y} {0 if visible == 0 else 1}" for (x, y), visible in row_points]
+        lines.append(
+            " ".join(
+                [str(cat_ids[i]), str(center_xs[i]), str(center_ys[i]), str(widths[i]), str(heights[i]), *point_list]
+            )
+        )
+    return "\n".join(lines)
+
+
+def _format_fixed_precision(table: IRAnnotationTable, cat_ids: List[int], context: YoloContext) -> str:
+    """
+    Serializes all rows of the table with ``context.float_precision`` decimals.
+    All numbers of the file are formatted in a single ``%`` formatting call.
+    """
+    assert context.float_precision is not None
+    float_format = f" %.{context.float_precision}f"
+    boxes = table.boxes
+    # Values of every row, before the points
+    heads = np.column_stack([np.asarray(cat_ids, dtype=np.float64), boxes[:, :2] + boxes[:, 2:] / 2, boxes[:, 2:]])
+
+    if context.annotation_type == "bbox":
+        for i in np.flatnonzero(table.rotations != 0.0).tolist():
+            logger.warning(
+                f"Bounding box for file {table.filename(i)} has a not-zero rotation. "
+                f"This is not supported by YOLO format."
+            )
+        template = "\n".join(["%d" + float_format * 4] * len(table))
+        return template % tuple(heads.ravel().tolist())
+
+    offsets = table.point_offsets
+    points = table.points
+    if context.annotation_type == "segmentation":
+        heads = heads[:, :1]
+        point_format = float_format * 2
+    elif context.keypoint_dim == 2:
+        # Hidden points are left out
+        visible = table.point_visibility != 0
+        visible_counts = np.concatenate([[0], np.cumsum(visible)])
+        offsets = visible_counts[offsets]
+        points = points[visible]
+        point_format = float_format * 2
+    else:
+        points = np.column_stack([points, table.point_visibility != 0])
+        point_format = float_format * 2 + " %d"
+
+    head_format = "%d" + float_format * (heads.shape[1] - 1)
+    template = "\n".join([head_format + point_format * count for count in np.diff(offsets).tolist()])
+    # Values of every row are its head, followed by the values of its points
+    values_per_point = points.shape[1]
+    values = np.insert(points.ravel(), np.repeat(offsets[:-1] * values_per_point, heads.shape[1]), heads.ravel())
+    return template % tuple(values.tolist())
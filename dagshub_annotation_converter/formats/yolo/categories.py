@@ -1,4 +1,4 @@
-from typing import Union, Optional, Dict, List
+from typing import Any, Union, Optional, Dict, List, Iterable, Mapping
 
 from dagshub_annotation_converter.util.pydantic_util import ParentModel
 
@@ -15,6 +15,20 @@ class Categories(ParentModel):
     categories: List[Category] = []
     _id_lookup: Dict[int, Category] = {}
     _name_lookup: Dict[str, Category] = {}
+    # Highest id of the categories, new categories without an explicit id get the next one
+    _max_id: int = -1
+
+    def model_post_init(self, __context: Any):
+        self.regenerate_dicts()
+
+    @classmethod
+    def from_mapping(cls, names: Mapping[int, str]) -> "Categories":
+        """
+        Creates categories from a mapping of ids to names, e.g. the ``names`` of a YOLO .yaml file.
+        """
+        res = cls()
+        res.extend(names)
+        return res
 
     def __getitem__(self, item: Union[int, str]) -> Category:
         if isinstance(item, int):
@@ -35,27 +49,49 @@ class Categories(ParentModel):
             return default
 
     def get_or_create(self, name: str) -> Category:
-        if name not in self:
+        res = self._name_lookup.get(name)
+        if res is None:
             return self.add(name)
-        return self[name]
+        return res
 
     def __contains__(self, item: str):
         return item in self._name_lookup
 
     def add(self, name: str, id: Optional[int] = None) -> Category:
         if id is None:
-            if len(self._id_lookup):
-                id = max(self._id_lookup.keys()) + 1
-            else:
-                id = 0
+            id = self._max_id + 1
         new_category = Category(name=name, id=id)
         self.categories.append(new_category)
-        self.regenerate_dicts()
+        self._register(new_category)
         return new_category
 
+    def extend(self, names: Union[Iterable[str], Mapping[int, str]]) -> List[Category]:
+        """
+        Adds multiple categories at once.
+
+        :param names: Either names of the categories, which get sequential ids after the existing categories,
+            or a mapping of ids to names.
+        :return: The added categories
+        """
+        if isinstance(names, Mapping):
+            new_categories = [Category(name=name, id=id) for id, name in names.items()]
+        else:
+            new_categories = [Category(name=name, id=id) for id, name in enumerate(names, start=self._max_id + 1)]
+        self.categories.extend(new_categories)
+        for category in new_categories:
+            self._register(category)
+        return new_categories
+
+    def _register(self, category: Category):
+        self._id_lookup[category.id] = category
+        self._name_lookup[category.name] = category
+        if category.id > self._max_id:
+            self._max_id = category.id
+
     def regenerate_dicts(self):
         self._id_lookup = {k.id: k for k in self.categories}
         self._name_lookup = {k.name: k for k in self.categories}
+        self._max_id = max(self._id_lookup.keys(), default=-1)
 
 
 def determine_category(category: Union[int, str], categories: Categories) -> Category:
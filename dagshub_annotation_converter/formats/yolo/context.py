@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict, Union, Optional, Literal, Callable
+from typing import Dict, Union, Optional, Literal, Callable, List, Sequence
 
 import yaml
 
@@ -33,6 +33,9 @@ class YoloContext(ParentModel):
     Number of keypoints in each annotation"""
     label_extension: str = ".txt"
     """Extension of the annotation files"""
+    float_precision: Optional[int] = None
+    """Amount of decimals to export the coordinates with, e.g. 6.
+    None exports them with full precision, which makes the label files much bigger"""
     path: Optional[Path] = None
     """Base path to the data"""
     train_path: Optional[Path] = Path(".")
@@ -42,6 +45,13 @@ class YoloContext(ParentModel):
     test_path: Optional[Path] = None
     """Path to the test data, relative to the base path (defaults to None, might be discovered)"""
 
+    def format_coordinates(self, values: Sequence[float]) -> List[str]:
+        """Formats the coordinates for a label file, according to :attr:`float_precision`"""
+        if self.float_precision is None:
+            return [str(value) for value in values]
+        float_format = f"{{:.{self.float_precision}f}}"
+        return [float_format.format(value) for value in values]
+
     @staticmethod
     def from_yaml_file(file_path: Union[str, Path], annotation_type: YoloAnnotationTypes) -> "YoloContext":
         res = YoloContext(annotation_type=annotation_type)
@@ -68,10 +78,7 @@ class YoloContext(ParentModel):
 
     @staticmethod
     def _parse_categories(yolo_meta: Dict) -> Categories:
-        categories = Categories()
-        for cat_id, cat_name in yolo_meta["names"].items():
-            categories.add(cat_name, cat_id)
-        return categories
+        return Categories.from_mapping(yolo_meta["names"])
 
     def get_yaml_content(self, path_override: Optional[Path] = None) -> str:
         path: Optional[Path]
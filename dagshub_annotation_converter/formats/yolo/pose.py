@@ -105,10 +105,17 @@ def import_pose_from_string(
 
 
 def export_pose(annotation: IRPoseImageAnnotation, context: YoloContext) -> str:
+    points = annotation.point_array()
+    coords = points.coords
+    visibility = points.visibility
     if context.keypoint_dim == 2:
-        point_list = [f"{point.x} {point.y}" for point in annotation.points if point.visible is not False]
+        point_list = context.format_coordinates(coords[visibility != 0].ravel().tolist())
     else:
-        point_list = [f"{point.x} {point.y} {0 if point.visible is False else 1}" for point in annotation.points]
+        formatted = context.format_coordinates(coords.ravel().tolist())
+        point_list = [
+            f"{x} {y} {0 if visible == 0 else 1}"
+            for x, y, visible in zip(formatted[::2], formatted[1::2], visibility.tolist())
+        ]
 
     category = annotation.ensure_has_one_category()
 
@@ -117,10 +124,14 @@ def export_pose(annotation: IRPoseImageAnnotation, context: YoloContext) -> str:
     return " ".join(
         [
             str(cat_id),
-            str(annotation.left + annotation.width / 2),
-            str(annotation.top + annotation.height / 2),
-            str(annotation.width),
-            str(annotation.height),
+            *context.format_coordinates(
+                [
+                    annotation.left + annotation.width / 2,
+                    annotation.top + annotation.height / 2,
+                    annotation.width,
+                    annotation.height,
+                ]
+            ),
             *point_list,
         ]
     )
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Sequence, Tuple, Type
+
+import numpy as np
 
 from .context import YoloAnnotationTypes
 from dagshub_annotation_converter.ir.image.annotations.base import IRAnnotationBase
@@ -7,100 +9,108 @@ from dagshub_annotation_converter.ir.image import (
     IRPoseImageAnnotation,
     IRSegmentationImageAnnotation,
     CoordinateStyle,
-    IRSegmentationPoint,
-    IRPosePoint,
+    IRSegmentationPoints,
+    IRPosePoints,
 )
+from dagshub_annotation_converter.ir.image.table import offsets_from_counts
+from dagshub_annotation_converter.util.pydantic_util import validate_models
 
 if TYPE_CHECKING:
     import ultralytics.engine.results
 
 
-def _import_result_bboxes(result: "ultralytics.engine.results.Results") -> Sequence[IRBBoxImageAnnotation]:
-    res = []
-    for i, cat_n in enumerate(result.boxes.cls):
-        cat = result.names[cat_n.item()]
-        center_x = result.boxes.xywh[i][0]
-        center_y = result.boxes.xywh[i][1]
-
-        width = result.boxes.xywh[i][2]
-        height = result.boxes.xywh[i][3]
-
-        x_tl = center_x - width / 2
-        y_tl = center_y - height / 2
-
-        res.append(
-            IRBBoxImageAnnotation(
-                categories={cat: result.boxes.conf[i]},
-                coordinate_style=CoordinateStyle.DENORMALIZED,
-                image_width=result.orig_shape[1],
-                image_height=result.orig_shape[0],
-                left=x_tl,
-                top=y_tl,
-                width=width,
-                height=height,
-            )
-        )
-    return res
-
-
-def _import_result_segmentations(
-    result: "ultralytics.engine.results.Results",
-) -> Sequence[IRSegmentationImageAnnotation]:
-    res = []
-    for i, cat_n in enumerate(result.boxes.cls):
-        cat = result.names[cat_n.item()]
-        points = [IRSegmentationPoint(x=x, y=y) for x, y in result.masks.xy[i]]
-        res.append(
-            IRSegmentationImageAnnotation(
-                categories={cat: result.boxes.conf[i]},
-                points=points,
-                coordinate_style=CoordinateStyle.DENORMALIZED,
-                image_width=result.orig_shape[1],
-                image_height=result.orig_shape[0],
-            )
-        )
-    return res
-
-
-def _import_result_poses(result: "ultralytics.engine.results.Results") -> Sequence[IRPoseImageAnnotation]:
-    res = []
-    for i, cat_n in enumerate(result.boxes.cls):
-        cat = result.names[cat_n.item()]
-        points = [IRPosePoint(x=x, y=y) for x, y in result.keypoints.xy[i]]
-
-        center_x = result.boxes.xywh[i][0]
-        center_y = result.boxes.xywh[i][1]
-
-        width = result.boxes.xywh[i][2]
-        height = result.boxes.xywh[i][3]
-
-        x_tl = center_x - width / 2
-        y_tl = center_y - height / 2
-
-        res.append(
-            IRPoseImageAnnotation(
-                categories={cat: result.boxes.conf[i]},
-                left=x_tl,
-                top=y_tl,
-                width=width,
-                height=height,
-                points=points,
-                coordinate_style=CoordinateStyle.DENORMALIZED,
-                image_width=result.orig_shape[1],
-                image_height=result.orig_shape[0],
-            )
-        )
-    return res
+def _to_numpy(values: Any) -> np.ndarray:
+    """Moves a tensor of the result to the CPU as a NumPy array, all at once"""
+    if hasattr(values, "cpu"):
+        values = values.cpu().numpy()
+    return np.asarray(values, dtype=np.float64)
+
+
+def _raw_result_common(result: "ultralytics.engine.results.Results") -> List[Dict[str, Any]]:
+    """Returns the field values that are common for all annotation types, for every detection of the result"""
+    if result.boxes is None:
+        return []
+    class_ids = _to_numpy(result.boxes.cls).astype(np.int64).tolist()
+    confidences = _to_numpy(result.boxes.conf).tolist()
+    image_height, image_width = result.orig_shape[:2]
+    return [
+        {
+            "categories": {result.names[class_id]: conf},
+            "coordinate_style": CoordinateStyle.DENORMALIZED,
+            "image_width": image_width,
+            "image_height": image_height,
+        }
+        for class_id, conf in zip(class_ids, confidences)
+    ]
+
+
+def _result_boxes(result: "ultralytics.engine.results.Results") -> List[List[float]]:
+    """Returns left, top, width, height of every box of the result"""
+    xywh = _to_numpy(result.boxes.xywh).reshape(-1, 4)
+    return np.column_stack([xywh[:, :2] - xywh[:, 2:] / 2, xywh[:, 2:]]).tolist()
+
+
+def _raw_result_bboxes(result: "ultralytics.engine.results.Results") -> List[Dict[str, Any]]:
+    raw = _raw_result_common(result)
+    for values, (left, top, width, height) in zip(raw, _result_boxes(result)):
+        values.update(left=left, top=top, width=width, height=height)
+    return raw
+
+
+def _raw_result_segmentations(result: "ultralytics.engine.results.Results") -> List[Dict[str, Any]]:
+    raw = _raw_result_common(result)
+    if len(raw) == 0:
+        return raw
+    for values, xy in zip(raw, result.masks.xy):
+        values["points"] = IRSegmentationPoints.from_array(np.asarray(xy, dtype=np.float64)).to_dicts()
+    return raw
+
+
+def _raw_result_poses(result: "ultralytics.engine.results.Results") -> List[Dict[str, Any]]:
+    raw = _raw_result_common(result)
+    if len(raw) == 0:
+        return raw
+    keypoints = _to_numpy(result.keypoints.xy)
+    for values, (left, top, width, height), xy in zip(raw, _result_boxes(result), keypoints):
+        values.update(left=left, top=top, width=width, height=height, points=IRPosePoints.from_array(xy).to_dicts())
+    return raw
+
+
+_result_importers: Dict[str, Tuple[Type[IRAnnotationBase], Callable[[Any], List[Dict[str, Any]]]]] = {
+    "bbox": (IRBBoxImageAnnotation, _raw_result_bboxes),
+    "segmentation": (IRSegmentationImageAnnotation, _raw_result_segmentations),
+    "pose": (IRPoseImageAnnotation, _raw_result_poses),
+}
 
 
 def import_yolo_result(
     annotation_type: YoloAnnotationTypes, result: "ultralytics.engine.results.Results"
 ) -> Sequence[IRAnnotationBase]:
-    if annotation_type == "bbox":
-        return _import_result_bboxes(result)
-    elif annotation_type == "segmentation":
-        return _import_result_segmentations(result)
-    elif annotation_type == "pose":
-        return _import_result_poses(result)
-    else:
+    return import_yolo_results(annotation_type, [result])[0]
+
+
+def import_yolo_results(
+    annotation_type: YoloAnnotationTypes, results: Iterable["ultralytics.engine.results.Results"]
+) -> List[Sequence[IRAnnotationBase]]:
+    """
+    Imports the predictions of a whole inference batch.
+    Tensors of every result are moved to the CPU once, and the annotations of all results are validated together.
+
+    :param annotation_type: Type of the predictions
+    :param results: Results of the ultralytics model, e.g. the output of ``model.predict()``
+    :return: Annotations of every result, in the same order as ``results``
+    """
+    if annotation_type not in _result_importers:
         raise ValueError(f"Unknown annotation type: {annotation_type}")
+    annotation_cls, to_raw = _result_importers[annotation_type]
+
+    raw: List[Dict[str, Any]] = []
+    counts: List[int] = []
+    for result in results:
+        result_raw = to_raw(result)
+        raw.extend(result_raw)
+        counts.append(len(result_raw))
+
+    annotations = validate_models(annotation_cls, raw)
+    offsets = offsets_from_counts(counts).tolist()
+    return [annotations[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
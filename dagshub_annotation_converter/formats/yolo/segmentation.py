@@ -60,9 +60,4 @@ def import_segmentation_from_string(
 def export_segmentation(annotation: IRSegmentationImageAnnotation, context: YoloContext) -> str:
     category = annotation.ensure_has_one_category()
     cat_id = context.categories[category].id
-    return " ".join(
-        [
-            str(cat_id),
-            *[f"{point.x} {point.y}" for point in annotation.points],
-        ]
-    )
+    return " ".join([str(cat_id), *context.format_coordinates(annotation.point_array().coords.ravel().tolist())])
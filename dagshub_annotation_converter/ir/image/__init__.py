@@ -1,17 +1,24 @@
 from .common import CoordinateStyle
 from .annotations.base import IRImageAnnotationBase
-from .annotations.pose import IRPoseImageAnnotation, IRPosePoint
-from .annotations.segmentation import IRSegmentationImageAnnotation, IRSegmentationPoint
+from .annotations.points import IRPointArray
+from .annotations.pose import IRPoseImageAnnotation, IRPosePoint, IRPosePoints
+from .annotations.segmentation import IRSegmentationImageAnnotation, IRSegmentationPoint, IRSegmentationPoints
 from .annotations.bbox import IRBBoxImageAnnotation
 from .annotations.ellipse import IREllipseImageAnnotation
+from .table import IRAnnotationTable, IRAnnotationTableBuilder
 
 __all__ = [
     "CoordinateStyle",
     "IRImageAnnotationBase",
     "IRPoseImageAnnotation",
     "IRPosePoint",
+    "IRPosePoints",
     "IRSegmentationImageAnnotation",
     "IRSegmentationPoint",
+    "IRSegmentationPoints",
+    "IRPointArray",
     "IRBBoxImageAnnotation",
     "IREllipseImageAnnotation",
+    "IRAnnotationTable",
+    "IRAnnotationTableBuilder",
 ]
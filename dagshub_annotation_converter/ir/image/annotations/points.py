@@ -0,0 +1,292 @@
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, MutableSequence, Optional, Tuple, Type, TypeVar, Union
+
+import numpy as np
+from pydantic import BaseModel, GetCoreSchemaHandler, PrivateAttr
+from pydantic_core import core_schema
+from typing_extensions import Self
+
+from dagshub_annotation_converter.util.pydantic_util import ParentModel, validate_models
+
+P = TypeVar("P", bound=ParentModel)
+
+# Visibility of the points is stored as int8 codes
+visibility_codes: Dict[Optional[bool], int] = {None: -1, False: 0, True: 1}
+visibilities: Dict[int, Optional[bool]] = {v: k for k, v in visibility_codes.items()}
+
+
+def _point_view_type(point_type: Type[ParentModel]) -> Type[ParentModel]:
+    """
+    Creates the type of the points that a container hands out.
+    They are regular point models, that also write the changes of their fields back into the container.
+    """
+
+    class PointView(point_type):  # type: ignore[valid-type, misc]
+        _array: Any = PrivateAttr(None)
+        _index: int = PrivateAttr(0)
+
+        def __setattr__(self, name: str, value: Any):
+            super().__setattr__(name, value)
+            if name in point_type.model_fields:
+                self._array[self._index] = self
+
+        def __eq__(self, other: object) -> bool:
+            if isinstance(other, BaseModel):
+                return isinstance(other, point_type) and self.__dict__ == other.__dict__
+            return NotImplemented
+
+        def _detached(self) -> ParentModel:
+            return point_type.model_construct(**self.__dict__)
+
+        # Copies and pickles of the point are independent of the container
+        def __copy__(self) -> ParentModel:
+            return self._detached()
+
+        def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> ParentModel:
+            return self._detached()
+
+        def __reduce__(self):
+            return self._detached().__reduce__()
+
+        def __repr_name__(self) -> str:
+            return point_type.__name__
+
+    PointView.__name__ = PointView.__qualname__ = f"{point_type.__name__}View"
+    return PointView
+
+
+class IRPointArray(MutableSequence[P]):
+    """
+    Compact storage for the points of an annotation.
+
+    Coordinates of the points are stored in a single ``(N, 2)`` float64 array (and an int8 array of the visibility
+    for points that have it), instead of a model object per point.
+    Annotations keep their points in a list of point models by default, the container has to be opted into:
+    by passing it (or an ``(N, 2)`` array) as the points of the annotation,
+    or with ``IRAnnotationTable.to_annotations(point_arrays=True)``.
+    Normalizing and denormalizing annotations with the container is a single array operation.
+
+    The container behaves like a list of point models: indexing and iterating it create the models on the fly.
+    The models are views of the stored points: setting their attributes changes the point in the container,
+    same as with a list. A view stays tied to its position, inserting or deleting points before it shifts it.
+    Slices are copies, same as slices of a list.
+    """
+
+    point_type: ClassVar[Type[ParentModel]]
+    has_visibility: ClassVar[bool] = False
+    _view_type: ClassVar[Type[ParentModel]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        if "point_type" in cls.__dict__:
+            cls._view_type = _point_view_type(cls.point_type)
+
+    def __init__(self, points: Iterable[Any] = ()):
+        self._coords = np.empty((0, 2), dtype=np.float64)
+        self._visibility: Optional[np.ndarray] = np.empty(0, dtype=np.int8) if self.has_visibility else None
+        self._size = 0
+        self.extend(points)
+
+    @classmethod
+    def from_array(cls, coords: np.ndarray, visibility: Optional[np.ndarray] = None) -> Self:
+        """
+        Creates the container from an ``(N, 2)`` array of coordinates. The arrays get copied.
+
+        :param coords: Coordinates of the points
+        :param visibility: ``(N,)`` visibility codes of the points (-1 - unknown, 0 - hidden, 1 - visible).
+            Ignored for points that don't have visibility. Defaults to unknown visibility.
+        """
+        res = cls.__new__(cls)
+        res._coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+        res._size = len(res._coords)
+        res._visibility = None
+        if cls.has_visibility:
+            if visibility is None:
+                res._visibility = np.full(res._size, -1, dtype=np.int8)
+            else:
+                res._visibility = np.array(visibility, dtype=np.int8).reshape(-1)
+                if len(res._visibility) != res._size:
+                    raise ValueError(f"Got {len(res._visibility)} visibility values for {res._size} points")
+        return res
+
+    @property
+    def coords(self) -> np.ndarray:
+        """(N, 2) array of x, y of the points. Changes to the array change the points."""
+        return self._coords[: self._size]
+
+    @property
+    def visibility(self) -> Optional[np.ndarray]:
+        """(N,) array of visibility codes (-1 - unknown, 0 - hidden, 1 - visible), None if the points don't have it"""
+        if self._visibility is None:
+            return None
+        return self._visibility[: self._size]
+
+    def normalized(self, image_width: int, image_height: int) -> Self:
+        """Returns a copy with the coordinates divided by the image dimensions"""
+        return type(self).from_array(np.divide(self.coords, (image_width, image_height)), self.visibility)
+
+    def denormalized(self, image_width: int, image_height: int) -> Self:
+        """Returns a copy with the coordinates multiplied by the image dimensions"""
+        return type(self).from_array(np.multiply(self.coords, (image_width, image_height)), self.visibility)
+
+    def _point_values(self, point: Any) -> Tuple[float, float, int]:
+        if isinstance(point, self.point_type):
+            # Models are the common case. Their coordinates are floats already,
+            # and a missing attribute of a model would go through the slow __getattr__ of pydantic
+            return point.x, point.y, visibility_codes[point.visible] if self.has_visibility else -1  # type: ignore
+        if isinstance(point, dict):
+            point = self.point_type.model_validate(point)
+        if isinstance(point, (tuple, list)):
+            x, y, *rest = point
+            visible = rest[0] if rest else None
+        else:
+            x, y, visible = point.x, point.y, getattr(point, "visible", None)
+        return float(x), float(y), visibility_codes[visible]
+
+    def _make_point(self, index: int, x: float, y: float, visibility: int) -> ParentModel:
+        if self.has_visibility:
+            point = self._view_type(x=x, y=y, visible=visibilities[visibility])
+        else:
+            point = self._view_type(x=x, y=y)
+        point._array = self
+        point._index = index
+        return point
+
+    def _reserve(self, size: int):
+        capacity = len(self._coords)
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2, 4)
+        coords = np.empty((new_capacity, 2), dtype=np.float64)
+        coords[: self._size] = self._coords[: self._size]
+        self._coords = coords
+        if self._visibility is not None:
+            visibility = np.empty(new_capacity, dtype=np.int8)
+            visibility[: self._size] = self._visibility[: self._size]
+            self._visibility = visibility
+
+    def _set_values(self, values: List[Tuple[float, float, int]]):
+        self._size = 0
+        self._coords = np.empty((0, 2), dtype=np.float64)
+        if self._visibility is not None:
+            self._visibility = np.empty(0, dtype=np.int8)
+        self._append_values(values)
+
+    def _append_values(self, values: List[Tuple[float, float, int]]):
+        start = self._size
+        self._reserve(start + len(values))
+        self._size = start + len(values)
+        if not values:
+            return
+        arr = np.array(values, dtype=np.float64)
+        self._coords[start : self._size] = arr[:, :2]
+        if self._visibility is not None:
+            self._visibility[start : self._size] = arr[:, 2]
+
+    def _values(self) -> List[Tuple[float, float, int]]:
+        visibility = self.visibility.tolist() if self.visibility is not None else [-1] * self._size
+        return [(x, y, v) for (x, y), v in zip(self.coords.tolist(), visibility)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[P]:
+        for index, (x, y, v) in enumerate(self._values()):
+            yield self._make_point(index, x, y, v)  # type: ignore[misc]
+
+    def __getitem__(self, index: Union[int, slice]):  # type: ignore[override]
+        if isinstance(index, slice):
+            return type(self).from_array(
+                self.coords[index], self.visibility[index] if self.visibility is not None else None
+            )
+        index = range(self._size)[index]
+        x, y = self.coords[index].tolist()
+        return self._make_point(index, x, y, int(self.visibility[index]) if self.visibility is not None else -1)
+
+    def __setitem__(self, index: Union[int, slice], value: Any):  # type: ignore[override]
+        if isinstance(index, slice):
+            values = self._values()
+            values[index] = [self._point_values(p) for p in value]
+            self._set_values(values)
+            return
+        x, y, v = self._point_values(value)
+        self.coords[index] = (x, y)
+        if self._visibility is not None:
+            self.visibility[index] = v  # type: ignore[index]
+
+    def __delitem__(self, index: Union[int, slice]):  # type: ignore[override]
+        values = self._values()
+        del values[index]
+        self._set_values(values)
+
+    def insert(self, index: int, value: Any):
+        values = self._values()
+        values.insert(index, self._point_values(value))
+        self._set_values(values)
+
+    def append(self, value: Any):
+        x, y, v = self._point_values(value)
+        self._reserve(self._size + 1)
+        self._coords[self._size] = (x, y)
+        if self._visibility is not None:
+            self._visibility[self._size] = v
+        self._size += 1
+
+    def extend(self, values: Iterable[Any]):
+        if isinstance(values, IRPointArray):
+            values = values._values()
+        elif isinstance(values, np.ndarray):
+            values = [(x, y, -1) for x, y in values.reshape(-1, 2).tolist()]
+        else:
+            values = [self._point_values(p) for p in values]
+        self._append_values(values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IRPointArray):
+            if type(other) is not type(self):
+                return False
+            if not np.array_equal(self.coords, other.coords):
+                return False
+            return self.visibility is None or np.array_equal(self.visibility, other.visibility)  # type: ignore[arg-type]
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def to_list(self) -> List[P]:
+        """Returns the points as a list of point models"""
+        return validate_models(self.point_type, self.to_dicts())  # type: ignore[return-value]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        coords = self.coords.tolist()
+        if self.visibility is not None:
+            return [{"x": x, "y": y, "visible": visibilities[v]} for (x, y), v in zip(coords, self.visibility.tolist())]
+        return [{"x": x, "y": y} for x, y in coords]
+
+    @classmethod
+    def validate(cls, value: Any) -> Self:
+        """Converts a list of points, an array of coordinates or another container to this container"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, np.ndarray):
+            return cls.from_array(value)
+        if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+            raise ValueError(f"Expected a sequence of points, got {type(value)}")
+        return cls(value)
+
+    @classmethod
+    def _validate_field(cls, value: Any) -> Self:
+        # Only the container itself or an array opt into the container, lists of points stay lists
+        if isinstance(value, (cls, np.ndarray)):
+            return cls.validate(value)
+        raise ValueError(f"Expected {cls.__name__} or an array of coordinates, got {type(value)}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate_field,
+            serialization=core_schema.plain_serializer_function_ser_schema(cls.to_dicts),
+        )
@@ -1,6 +1,7 @@
-from typing import List, Optional, TYPE_CHECKING, Dict
+from typing import List, Optional, TYPE_CHECKING, Dict, Union
 
 from dagshub_annotation_converter.ir.image.annotations.base import IRImageAnnotationBase
+from dagshub_annotation_converter.ir.image.annotations.points import IRPointArray
 from dagshub_annotation_converter.util.pydantic_util import ParentModel
 
 if TYPE_CHECKING:
@@ -13,6 +14,11 @@ class IRPosePoint(ParentModel):
     visible: Optional[bool] = None
 
 
+class IRPosePoints(IRPointArray[IRPosePoint]):
+    point_type = IRPosePoint
+    has_visibility = True
+
+
 class IRPoseImageAnnotation(IRImageAnnotationBase):
     # Parameters of the bounding box
     top: float
@@ -20,7 +26,7 @@ class IRPoseImageAnnotation(IRImageAnnotationBase):
     width: float
     height: float
 
-    points: List[IRPosePoint] = []
+    points: Union[List[IRPosePoint], IRPosePoints] = []
 
     def _normalize(self):
         self.top = self.top / self.image_height
@@ -28,9 +34,13 @@ class IRPoseImageAnnotation(IRImageAnnotationBase):
         self.width = self.width / self.image_width
         self.height = self.height / self.image_height
 
-        for point in self.points:
-            point.x = point.x / self.image_width
-            point.y = point.y / self.image_height
+        # Creates new points instead of changing them in place, the points are shared with the original annotation
+        if isinstance(self.points, IRPosePoints):
+            self.points = self.points.normalized(self.image_width, self.image_height)
+            return
+        self.points = [
+            IRPosePoint(x=p.x / self.image_width, y=p.y / self.image_height, visible=p.visible) for p in self.points
+        ]
 
     def _denormalize(self):
         self.top = self.top * self.image_height
@@ -38,9 +48,16 @@ class IRPoseImageAnnotation(IRImageAnnotationBase):
         self.width = self.width * self.image_width
         self.height = self.height * self.image_height
 
-        for point in self.points:
-            point.x = point.x * self.image_width
-            point.y = point.y * self.image_height
+        if isinstance(self.points, IRPosePoints):
+            self.points = self.points.denormalized(self.image_width, self.image_height)
+            return
+        self.points = [
+            IRPosePoint(x=p.x * self.image_width, y=p.y * self.image_height, visible=p.visible) for p in self.points
+        ]
+
+    def point_array(self) -> IRPosePoints:
+        """Returns the points as an array-backed container. Points that are stored in a list get copied"""
+        return IRPosePoints.validate(self.points)
 
     def add_point(self, x: float, y: float, visible: Optional[bool] = None):
         self.points.append(IRPosePoint(x=x, y=y, visible=visible))
@@ -48,19 +65,23 @@ class IRPoseImageAnnotation(IRImageAnnotationBase):
     @staticmethod
     def from_points(
         categories: Dict[str, float],
-        points: List[IRPosePoint],
+        points: Union[List[IRPosePoint], IRPosePoints],
         coordinate_style: "CoordinateStyle",
         image_width: int,
         image_height: int,
         filename: Optional[str] = None,
     ) -> "IRPoseImageAnnotation":
-        point_xs = list(map(lambda p: p.x, points))
-        point_ys = list(map(lambda p: p.y, points))
+        if len(points) == 0:
+            raise ValueError("Can't create a pose annotation without points")
 
-        min_x = min(point_xs)
-        max_x = max(point_xs)
-        min_y = min(point_ys)
-        max_y = max(point_ys)
+        if isinstance(points, IRPosePoints):
+            min_x, min_y = points.coords.min(axis=0).tolist()
+            max_x, max_y = points.coords.max(axis=0).tolist()
+        else:
+            point_xs = [p.x for p in points]
+            point_ys = [p.y for p in points]
+            min_x, max_x = min(point_xs), max(point_xs)
+            min_y, max_y = min(point_ys), max(point_ys)
 
         return IRPoseImageAnnotation(
             categories=categories,
@@ -1,7 +1,7 @@
-from typing import List
-
+from typing import List, Union
 
 from dagshub_annotation_converter.ir.image.annotations.base import IRImageAnnotationBase
+from dagshub_annotation_converter.ir.image.annotations.points import IRPointArray
 from dagshub_annotation_converter.util.pydantic_util import ParentModel
 
 
@@ -10,14 +10,28 @@ class IRSegmentationPoint(ParentModel):
     y: float
 
 
+class IRSegmentationPoints(IRPointArray[IRSegmentationPoint]):
+    point_type = IRSegmentationPoint
+
+
 class IRSegmentationImageAnnotation(IRImageAnnotationBase):
-    points: List[IRSegmentationPoint] = []
+    points: Union[List[IRSegmentationPoint], IRSegmentationPoints] = []
 
     def _normalize(self):
+        if isinstance(self.points, IRSegmentationPoints):
+            self.points = self.points.normalized(self.image_width, self.image_height)
+            return
         self.points = [IRSegmentationPoint(x=p.x / self.image_width, y=p.y / self.image_height) for p in self.points]
 
     def _denormalize(self):
+        if isinstance(self.points, IRSegmentationPoints):
+            self.points = self.points.denormalized(self.image_width, self.image_height)
+            return
         self.points = [IRSegmentationPoint(x=p.x * self.image_width, y=p.y * self.image_height) for p in self.points]
 
+    def point_array(self) -> IRSegmentationPoints:
+        """Returns the points as an array-backed container. Points that are stored in a list get copied"""
+        return IRSegmentationPoints.validate(self.points)
+
     def add_point(self, x: float, y: float):
         self.points.append(IRSegmentationPoint(x=x, y=y))
@@ -0,0 +1,468 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from dagshub_annotation_converter.ir.image.annotations.base import IRImageAnnotationBase
+from dagshub_annotation_converter.ir.image.annotations.bbox import IRBBoxImageAnnotation
+from dagshub_annotation_converter.ir.image.annotations.ellipse import IREllipseImageAnnotation
+from dagshub_annotation_converter.ir.image.annotations.pose import IRPoseImageAnnotation, IRPosePoints
+from dagshub_annotation_converter.ir.image.annotations.segmentation import (
+    IRSegmentationImageAnnotation,
+    IRSegmentationPoints,
+)
+from dagshub_annotation_converter.ir.image.common import CoordinateStyle
+from dagshub_annotation_converter.util.pydantic_util import validate_models
+
+# Codes of the annotation types in IRAnnotationTable.kinds
+BBOX_KIND = 0
+SEGMENTATION_KIND = 1
+POSE_KIND = 2
+ELLIPSE_KIND = 3
+
+annotation_kinds: Dict[Type[IRImageAnnotationBase], int] = {
+    IRBBoxImageAnnotation: BBOX_KIND,
+    IRSegmentationImageAnnotation: SEGMENTATION_KIND,
+    IRPoseImageAnnotation: POSE_KIND,
+    IREllipseImageAnnotation: ELLIPSE_KIND,
+}
+
+_annotation_types: Dict[int, Type[IRImageAnnotationBase]] = {v: k for k, v in annotation_kinds.items()}
+
+_coordinate_style_codes = {CoordinateStyle.NORMALIZED: 0, CoordinateStyle.DENORMALIZED: 1}
+_coordinate_styles = [CoordinateStyle.NORMALIZED, CoordinateStyle.DENORMALIZED]
+
+
+def offsets_from_counts(counts: Sequence[int]) -> np.ndarray:
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _ragged_take(offsets: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Selects rows ``indices`` of a ragged array described by ``offsets``.
+
+    :return: offsets of the new ragged array, and indices of its values in the old one
+    """
+    starts = offsets[indices]
+    counts = offsets[indices + 1] - starts
+    new_offsets = offsets_from_counts(counts)
+    flat = np.repeat(starts - new_offsets[:-1], counts) + np.arange(new_offsets[-1])
+    return new_offsets, flat
+
+
+class IRAnnotationTable:
+    """
+    Columnar (struct of arrays) storage of IR image annotations.
+
+    Every annotation is a row of the table. Points of polygons and poses are stored in one shared buffer,
+    so no per-point objects are allocated. Converts losslessly to and from the IR annotation objects.
+
+    Columns:
+
+    - ``kinds`` - (N,) type of the annotation, one of the ``*_KIND`` constants
+    - ``filenames`` + ``filename_ids`` - unique filenames and the (N,) index of the filename of each row (-1 - None)
+    - ``category_names`` + ``category_offsets`` + ``category_ids`` + ``confidences`` -
+      unique category names, and a ragged array of the categories with their confidence for each row.
+      Categories of row ``i`` are ``category_ids[category_offsets[i]:category_offsets[i + 1]]``
+    - ``coordinate_styles`` - (N,) 0 for normalized rows, 1 for denormalized
+    - ``image_sizes`` - (N, 2) width and height of the image
+    - ``boxes`` - (N, 4) left, top, width, height for bounding boxes and poses;
+      center_x, center_y, radius_x, radius_y for ellipses; NaN for segmentations
+    - ``rotations`` - (N,) rotation of bounding boxes and ellipses in degrees, 0 for the rest
+    - ``point_offsets`` + ``points`` + ``point_visibility`` - ragged array of the points of each row.
+      Points of row ``i`` are ``points[point_offsets[i]:point_offsets[i + 1]]``.
+      Visibility is -1 for unknown (``None``), 0 for hidden and 1 for visible.
+    - ``imported_ids`` - (N,) list with the ``imported_id`` of each row
+    """
+
+    def __init__(
+        self,
+        kinds: np.ndarray,
+        filenames: List[Optional[str]],
+        filename_ids: np.ndarray,
+        category_names: List[str],
+        category_offsets: np.ndarray,
+        category_ids: np.ndarray,
+        confidences: np.ndarray,
+        coordinate_styles: np.ndarray,
+        image_sizes: np.ndarray,
+        boxes: np.ndarray,
+        rotations: np.ndarray,
+        point_offsets: np.ndarray,
+        points: np.ndarray,
+        point_visibility: np.ndarray,
+        imported_ids: List[Optional[str]],
+    ):
+        self.kinds = kinds
+        self.filenames = filenames
+        self.filename_ids = filename_ids
+        self.category_names = category_names
+        self.category_offsets = category_offsets
+        self.category_ids = category_ids
+        self.confidences = confidences
+        self.coordinate_styles = coordinate_styles
+        self.image_sizes = image_sizes
+        self.boxes = boxes
+        self.rotations = rotations
+        self.point_offsets = point_offsets
+        self.points = points
+        self.point_visibility = point_visibility
+        self.imported_ids = imported_ids
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __repr__(self) -> str:
+        return f"IRAnnotationTable({len(self)} annotations, {len(self.points)} points)"
+
+    @staticmethod
+    def empty() -> "IRAnnotationTable":
+        return IRAnnotationTableBuilder().build()
+
+    @staticmethod
+    def from_annotations(annotations: Iterable[IRImageAnnotationBase]) -> "IRAnnotationTable":
+        builder = IRAnnotationTableBuilder()
+        for ann in annotations:
+            builder.add_annotation(ann)
+        return builder.build()
+
+    def to_annotations(self, point_arrays: bool = False) -> List[IRImageAnnotationBase]:
+        """
+        Materializes all rows as IR annotation objects.
+        Rows of the same annotation type are validated in one batch.
+
+        :param point_arrays: Store the points of segmentations and poses in array-backed containers
+            (:class:`IRSegmentationPoints`, :class:`IRPosePoints`) instead of lists of point models.
+            Much cheaper for annotations with lots of points,
+            but changing the attributes of a point taken out of a container doesn't change the annotation.
+        """
+        res: List[IRImageAnnotationBase] = [None] * len(self)  # type: ignore[list-item]
+        for kind, ann_type in _annotation_types.items():
+            rows = np.flatnonzero(self.kinds == kind)
+            if len(rows) == 0:
+                continue
+            annotations = validate_models(ann_type, self._raw_annotations(kind, rows, point_arrays))
+            for row, ann in zip(rows.tolist(), annotations):
+                res[row] = ann
+        return res
+
+    def filename(self, row: int) -> Optional[str]:
+        filename_id = self.filename_ids[row]
+        return None if filename_id < 0 else self.filenames[filename_id]
+
+    def row_categories(self, row: int) -> Dict[str, float]:
+        start, end = self.category_offsets[row], self.category_offsets[row + 1]
+        return {
+            self.category_names[cat_id]: conf
+            for cat_id, conf in zip(self.category_ids[start:end].tolist(), self.confidences[start:end].tolist())
+        }
+
+    def row_points(self, row: int) -> np.ndarray:
+        """(K, 2) view of the points of the row"""
+        return self.points[self.point_offsets[row] : self.point_offsets[row + 1]]
+
+    def single_category_ids(self) -> np.ndarray:
+        """
+        Returns (N,) ids of the category of each row.
+        Raises a ValueError if any row doesn't have exactly one category.
+        """
+        if not np.all(np.diff(self.category_offsets) == 1):
+            raise ValueError("Some of the annotations in the table don't have exactly one category")
+        return self.category_ids
+
+    def annotation(self, row: int, point_arrays: bool = False) -> IRImageAnnotationBase:
+        """Materializes the row as an IR annotation object. See :func:`to_annotations` for ``point_arrays``"""
+        kind = int(self.kinds[row])
+        if kind not in _annotation_types:
+            raise ValueError(f"Unknown annotation kind {kind}")
+        return validate_models(_annotation_types[kind], self._raw_annotations(kind, np.array([row]), point_arrays))[0]
+
+    def _raw_annotations(self, kind: int, rows: np.ndarray, point_arrays: bool = False) -> List[Dict[str, Any]]:
+        """Returns the field values of the rows (all of the same kind), ready to be validated into the models"""
+        filenames = [None if i < 0 else self.filenames[i] for i in self.filename_ids[rows].tolist()]
+        category_starts = self.category_offsets[rows]
+        if np.all(self.category_offsets[rows + 1] - category_starts == 1):
+            names = self.category_names
+            categories = [
+                {names[cat_id]: conf}
+                for cat_id, conf in zip(
+                    self.category_ids[category_starts].tolist(), self.confidences[category_starts].tolist()
+                )
+            ]
+        else:
+            categories = [self.row_categories(row) for row in rows.tolist()]
+        raw: List[Dict[str, Any]] = [
+            {
+                "filename": filename,
+                "categories": row_categories,
+                "coordinate_style": _coordinate_styles[style],
+                "imported_id": self.imported_ids[row],
+                "image_width": width,
+                "image_height": height,
+            }
+            for filename, row_categories, style, row, (width, height) in zip(
+                filenames,
+                categories,
+                self.coordinate_styles[rows].tolist(),
+                rows.tolist(),
+                self.image_sizes[rows].tolist(),
+            )
+        ]
+
+        boxes = self.boxes[rows].tolist()
+        rotations = self.rotations[rows].tolist()
+        if kind == BBOX_KIND:
+            for values, (b0, b1, b2, b3), rotation in zip(raw, boxes, rotations):
+                values.update(left=b0, top=b1, width=b2, height=b3, rotation=rotation)
+            return raw
+        if kind == ELLIPSE_KIND:
+            for values, (b0, b1, b2, b3), rotation in zip(raw, boxes, rotations):
+                values.update(center_x=b0, center_y=b1, radius_x=b2, radius_y=b3, rotation=rotation)
+            return raw
+
+        starts = self.point_offsets[rows].tolist()
+        ends = self.point_offsets[rows + 1].tolist()
+        if kind == SEGMENTATION_KIND:
+            for values, start, end in zip(raw, starts, ends):
+                segmentation_points = IRSegmentationPoints.from_array(self.points[start:end])
+                values["points"] = segmentation_points if point_arrays else segmentation_points.to_dicts()
+            return raw
+        for values, (b0, b1, b2, b3), start, end in zip(raw, boxes, starts, ends):
+            pose_points = IRPosePoints.from_array(self.points[start:end], self.point_visibility[start:end])
+            values.update(
+                left=b0,
+                top=b1,
+                width=b2,
+                height=b3,
+                points=pose_points if point_arrays else pose_points.to_dicts(),
+            )
+        return raw
+
+    def take(self, rows: Sequence[int]) -> "IRAnnotationTable":
+        """Returns a new table with only the selected rows (indices or a boolean mask)"""
+        rows = np.arange(len(self))[np.asarray(rows)] if len(rows) else np.zeros(0, dtype=np.int64)
+        category_offsets, category_idx = _ragged_take(self.category_offsets, rows)
+        point_offsets, point_idx = _ragged_take(self.point_offsets, rows)
+        return IRAnnotationTable(
+            kinds=self.kinds[rows],
+            filenames=self.filenames,
+            filename_ids=self.filename_ids[rows],
+            category_names=self.category_names,
+            category_offsets=category_offsets,
+            category_ids=self.category_ids[category_idx],
+            confidences=self.confidences[category_idx],
+            coordinate_styles=self.coordinate_styles[rows],
+            image_sizes=self.image_sizes[rows],
+            boxes=self.boxes[rows],
+            rotations=self.rotations[rows],
+            point_offsets=point_offsets,
+            points=self.points[point_idx],
+            point_visibility=self.point_visibility[point_idx],
+            imported_ids=[self.imported_ids[i] for i in rows.tolist()],
+        )
+
+    @staticmethod
+    def concat(tables: Sequence["IRAnnotationTable"]) -> "IRAnnotationTable":
+        """Concatenates the tables, merging their filename and category lookups"""
+        builder = IRAnnotationTableBuilder()
+        for table in tables:
+            builder.add_table(table)
+        return builder.build()
+
+    def group_by_filename(self) -> Dict[Optional[str], np.ndarray]:
+        """
+        Returns the row indices of each filename, in order of the first appearance of the filename
+        """
+        unique_ids, first_rows, inverse = np.unique(self.filename_ids, return_index=True, return_inverse=True)
+        order = np.argsort(first_rows, kind="stable")
+        rows_by_group = np.argsort(inverse.ravel(), kind="stable")
+        group_offsets = offsets_from_counts(np.bincount(inverse.ravel(), minlength=len(unique_ids)))
+        res: Dict[Optional[str], np.ndarray] = {}
+        for group in order.tolist():
+            filename_id = unique_ids[group]
+            filename = None if filename_id < 0 else self.filenames[filename_id]
+            res[filename] = rows_by_group[group_offsets[group] : group_offsets[group + 1]]
+        return res
+
+    def _scaled(self, target_style: CoordinateStyle) -> "IRAnnotationTable":
+        target = _coordinate_style_codes[target_style]
+        rows_to_scale = self.coordinate_styles != target
+        if not np.any(rows_to_scale):
+            return self
+
+        # Every box-like column is (x, y, x, y), so boxes and points are scaled by (width, height)
+        scale = self.image_sizes.astype(np.float64)
+        scale[~rows_to_scale] = 1.0
+        point_scale = np.repeat(scale, np.diff(self.point_offsets), axis=0)
+        op = np.divide if target_style == CoordinateStyle.NORMALIZED else np.multiply
+
+        res = IRAnnotationTable(**self.__dict__)
+        res.boxes = op(self.boxes, np.tile(scale, 2))
+        res.points = op(self.points, point_scale)
+        res.coordinate_styles = np.full_like(self.coordinate_styles, target)
+        return res
+
+    def normalized(self) -> "IRAnnotationTable":
+        """Returns a table with all rows normalized"""
+        return self._scaled(CoordinateStyle.NORMALIZED)
+
+    def denormalized(self) -> "IRAnnotationTable":
+        """Returns a table with all rows denormalized"""
+        return self._scaled(CoordinateStyle.DENORMALIZED)
+
+
+class IRAnnotationTableBuilder:
+    """
+    Accumulates rows of an :class:`IRAnnotationTable`.
+    Format importers can add rows directly with :func:`add_row`, without creating IR annotation objects.
+    """
+
+    def __init__(self):
+        self._filename_lookup: Dict[Optional[str], int] = {}
+        self._filenames: List[Optional[str]] = []
+        self._category_lookup: Dict[str, int] = {}
+        self._category_names: List[str] = []
+
+        self._kinds: List[int] = []
+        self._filename_ids: List[int] = []
+        self._category_counts: List[int] = []
+        self._category_ids: List[int] = []
+        self._confidences: List[float] = []
+        self._coordinate_styles: List[int] = []
+        self._image_sizes: List[Tuple[int, int]] = []
+        self._boxes: List[Tuple[float, float, float, float]] = []
+        self._rotations: List[float] = []
+        self._point_counts: List[int] = []
+        self._points: List[np.ndarray] = []
+        self._point_visibility: List[np.ndarray] = []
+        self._imported_ids: List[Optional[str]] = []
+
+    def _filename_id(self, filename: Optional[str]) -> int:
+        if filename is None:
+            return -1
+        filename_id = self._filename_lookup.get(filename)
+        if filename_id is None:
+            filename_id = len(self._filenames)
+            self._filename_lookup[filename] = filename_id
+            self._filenames.append(filename)
+        return filename_id
+
+    def category_id(self, name: str) -> int:
+        cat_id = self._category_lookup.get(name)
+        if cat_id is None:
+            cat_id = len(self._category_names)
+            self._category_lookup[name] = cat_id
+            self._category_names.append(name)
+        return cat_id
+
+    def add_row(
+        self,
+        kind: int,
+        categories: Dict[str, float],
+        coordinate_style: CoordinateStyle,
+        image_width: int,
+        image_height: int,
+        box: Tuple[float, float, float, float] = (np.nan, np.nan, np.nan, np.nan),
+        rotation: float = 0.0,
+        points: Optional[np.ndarray] = None,
+        point_visibility: Optional[np.ndarray] = None,
+        filename: Optional[str] = None,
+        imported_id: Optional[str] = None,
+    ):
+        """
+        Adds a row to the table. See :class:`IRAnnotationTable` for the meaning of the values.
+
+        :param points: (K, 2) array of points
+        :param point_visibility: (K,) array of visibility codes. Defaults to unknown visibility
+        """
+        self._kinds.append(kind)
+        self._filename_ids.append(self._filename_id(filename))
+        self._category_counts.append(len(categories))
+        for name, conf in categories.items():
+            self._category_ids.append(self.category_id(name))
+            self._confidences.append(conf)
+        self._coordinate_styles.append(_coordinate_style_codes[coordinate_style])
+        self._image_sizes.append((image_width, image_height))
+        self._boxes.append(box)
+        self._rotations.append(rotation)
+        self._imported_ids.append(imported_id)
+
+        if points is None or len(points) == 0:
+            self._point_counts.append(0)
+            return
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if point_visibility is None:
+            point_visibility = np.full(len(points), -1, dtype=np.int8)
+        self._point_counts.append(len(points))
+        self._points.append(points)
+        self._point_visibility.append(np.asarray(point_visibility, dtype=np.int8))
+
+    def add_annotation(self, ann: IRImageAnnotationBase):
+        kind = annotation_kinds.get(type(ann))
+        if kind is None:
+            raise ValueError(f"Unsupported IR annotation type: {type(ann)}")
+
+        common = {
+            "kind": kind,
+            "categories": ann.categories,
+            "coordinate_style": ann.coordinate_style,
+            "image_width": ann.image_width,
+            "image_height": ann.image_height,
+            "filename": ann.filename,
+            "imported_id": ann.imported_id,
+        }
+        if isinstance(ann, IRBBoxImageAnnotation):
+            self.add_row(box=(ann.left, ann.top, ann.width, ann.height), rotation=ann.rotation, **common)
+        elif isinstance(ann, IREllipseImageAnnotation):
+            self.add_row(box=(ann.center_x, ann.center_y, ann.radius_x, ann.radius_y), rotation=ann.rotation, **common)
+        elif isinstance(ann, IRSegmentationImageAnnotation):
+            self.add_row(points=ann.point_array().coords, **common)
+        elif isinstance(ann, IRPoseImageAnnotation):
+            points = ann.point_array()
+            self.add_row(
+                box=(ann.left, ann.top, ann.width, ann.height),
+                points=points.coords,
+                point_visibility=points.visibility,
+                **common,
+            )
+
+    def add_table(self, table: IRAnnotationTable):
+        """Appends all rows of another table, remapping its filenames and categories"""
+        filename_map = np.array([self._filename_id(f) for f in table.filenames] + [-1], dtype=np.int64)
+        category_map = np.array([self.category_id(c) for c in table.category_names], dtype=np.int64)
+
+        self._kinds.extend(table.kinds.tolist())
+        self._filename_ids.extend(filename_map[table.filename_ids].tolist())
+        self._category_counts.extend(np.diff(table.category_offsets).tolist())
+        self._category_ids.extend(category_map[table.category_ids].tolist() if len(table.category_ids) else [])
+        self._confidences.extend(table.confidences.tolist())
+        self._coordinate_styles.extend(table.coordinate_styles.tolist())
+        self._image_sizes.extend(map(tuple, table.image_sizes.tolist()))
+        self._boxes.extend(map(tuple, table.boxes.tolist()))
+        self._rotations.extend(table.rotations.tolist())
+        self._point_counts.extend(np.diff(table.point_offsets).tolist())
+        self._points.append(table.points)
+        self._point_visibility.append(table.point_visibility)
+        self._imported_ids.extend(table.imported_ids)
+
+    def build(self) -> IRAnnotationTable:
+        return IRAnnotationTable(
+            kinds=np.array(self._kinds, dtype=np.int8),
+            filenames=list(self._filenames),
+            filename_ids=np.array(self._filename_ids, dtype=np.int64),
+            category_names=list(self._category_names),
+            category_offsets=offsets_from_counts(self._category_counts),
+            category_ids=np.array(self._category_ids, dtype=np.int64),
+            confidences=np.array(self._confidences, dtype=np.float64),
+            coordinate_styles=np.array(self._coordinate_styles, dtype=np.int8),
+            image_sizes=np.array(self._image_sizes, dtype=np.int64).reshape(-1, 2),
+            boxes=np.array(self._boxes, dtype=np.float64).reshape(-1, 4),
+            rotations=np.array(self._rotations, dtype=np.float64),
+            point_offsets=offsets_from_counts(self._point_counts),
+            points=np.concatenate(self._points) if self._points else np.zeros((0, 2), dtype=np.float64),
+            point_visibility=(
+                np.concatenate(self._point_visibility) if self._point_visibility else np.zeros(0, dtype=np.int8)
+            ),
+            imported_ids=list(self._imported_ids),
+        )
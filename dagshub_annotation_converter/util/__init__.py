@@ -1,9 +1,16 @@
 from .image import is_image, supported_image_formats
 from .path import replace_folder, get_extension
+from .image_dimensions import get_image_dimensions, probe_image_dimensions
+from .dimension_cache import ImageDimensionCache
+from .file_writer import BufferedFileWriter
 
 __all__ = [
     "is_image",
     "supported_image_formats",
     "replace_folder",
     "get_extension",
+    "get_image_dimensions",
+    "probe_image_dimensions",
+    "ImageDimensionCache",
+    "BufferedFileWriter",
 ]
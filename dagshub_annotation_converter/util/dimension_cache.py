@@ -0,0 +1,168 @@
+import logging
+import os
+import sqlite3
+import threading
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from dagshub_annotation_converter.util.image_dimensions import ImageDimensions, get_image_dimensions
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dimensions (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+)
+"""
+_LAST_USED_INDEX = "CREATE INDEX IF NOT EXISTS dimensions_last_used ON dimensions (last_used)"
+
+
+class ImageDimensionCache:
+    """
+    Persistent cache of image dimensions, stored in an SQLite database.
+
+    Entries are keyed by the path of the image relative to ``base_dir``,
+    and are only considered valid while the size and the modification time of the file stay the same.
+    When there are more than ``max_entries`` entries in the cache, the least recently used ones get evicted.
+
+    Lookups of unchanged images only ``stat()`` the file, the image itself is never opened.
+    Writes are batched, call :func:`close` (or use the cache as a context manager) to persist them.
+
+    :param db_path: Path to the database file. Gets created if it doesn't exist.
+    :param base_dir: Directory that the keys are relative to. Defaults to the directory of ``db_path``.
+    :param max_entries: Maximum amount of entries to keep. ``None`` means no limit.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, PathLike],
+        base_dir: Optional[Union[str, PathLike]] = None,
+        max_entries: Optional[int] = 5_000_000,
+    ):
+        self.db_path = Path(db_path)
+        self.base_dir = Path(base_dir) if base_dir is not None else self.db_path.parent
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_LAST_USED_INDEX)
+
+        (last_used, row_count) = self._conn.execute(
+            "SELECT COALESCE(MAX(last_used), 0), COUNT(*) FROM dimensions"
+        ).fetchone()
+        self._clock: int = last_used
+        # Kept up to date on every flush, so eviction doesn't need to count the rows
+        self._row_count: int = row_count
+        # Batched writes: new/changed entries and access times of hit entries
+        self._pending_entries: Dict[str, Tuple[int, int, int, int, int]] = {}
+        self._pending_touches: Dict[str, int] = {}
+        self._flush_threshold = 10_000
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.base_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get_dimensions(self, path: Union[str, PathLike]) -> ImageDimensions:
+        """
+        Returns the (width, height) of the image, reading it from the cache if the file hasn't changed.
+        """
+        path = Path(path)
+        key = self._key(path)
+        stat = os.stat(path)
+
+        with self._lock:
+            pending = self._pending_entries.get(key)
+            if pending is not None:
+                row: Optional[Tuple[int, int, int, int]] = pending[:4]
+            else:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, width, height FROM dimensions WHERE path = ?", (key,)
+                ).fetchone()
+            if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                self.hits += 1
+                self._pending_touches[key] = self._tick()
+                self._flush_if_full()
+                return row[2], row[3]
+
+        width, height = get_image_dimensions(path)
+
+        with self._lock:
+            self.misses += 1
+            self._pending_entries[key] = (stat.st_size, stat.st_mtime_ns, width, height, self._tick())
+            self._flush_if_full()
+        return width, height
+
+    def _flush_if_full(self):
+        if len(self._pending_entries) + len(self._pending_touches) >= self._flush_threshold:
+            self._flush()
+
+    def _flush(self):
+        with self._conn:
+            if self._pending_touches:
+                self._conn.executemany(
+                    "UPDATE dimensions SET last_used = ? WHERE path = ?",
+                    [(last_used, key) for key, last_used in self._pending_touches.items()],
+                )
+            if self._pending_entries:
+                entries = [(key, *entry) for key, entry in self._pending_entries.items()]
+                # Existing rows are updated first, so the insert only adds the rows that are really new
+                # and its row count is the amount of added rows, even if other threads added the same image
+                self._conn.executemany(
+                    "UPDATE dimensions SET size = ?, mtime_ns = ?, width = ?, height = ?, last_used = ? WHERE path = ?",
+                    [(*entry[1:], entry[0]) for entry in entries],
+                )
+                cursor = self._conn.executemany(
+                    "INSERT OR IGNORE INTO dimensions (path, size, mtime_ns, width, height, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    entries,
+                )
+                self._row_count += cursor.rowcount
+            self._pending_touches.clear()
+            self._pending_entries.clear()
+            self._evict()
+
+    def _evict(self):
+        if self.max_entries is None:
+            return
+        if self._row_count <= self.max_entries:
+            return
+        logger.debug(f"Evicting {self._row_count - self.max_entries} entries from the dimension cache {self.db_path}")
+        cursor = self._conn.execute(
+            "DELETE FROM dimensions WHERE path IN (SELECT path FROM dimensions ORDER BY last_used ASC LIMIT ?)",
+            (self._row_count - self.max_entries,),
+        )
+        self._row_count -= cursor.rowcount
+
+    def flush(self):
+        """Persists all pending writes to the database"""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._row_count
+
+    def __enter__(self) -> "ImageDimensionCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,95 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import Deque, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedFileWriter:
+    """
+    Writes lots of small text files, e.g. the label files of a dataset.
+
+    Directories that were already created are remembered, so every directory gets created only once.
+    With more than one worker, the files are written in a thread pool, which hides the latency of slow
+    (e.g. network) filesystems. At most ``max_pending`` writes are queued at a time, after that :func:`write` blocks
+    until the oldest one finishes, so the memory use stays bounded.
+
+    The files are written in the same way as with ``open(path, "w")``, so the contents are identical.
+    Errors of the writes are raised from :func:`write` or :func:`close`.
+    Call :func:`close` (or use the writer as a context manager) to wait for all writes to finish.
+
+    :param workers: Amount of threads to write the files with. With 1 worker the files are written right away.
+    :param max_pending: Maximum amount of queued writes. Defaults to 64 per worker.
+    :param atomic: Write every file to a temporary file next to it first, and then rename it into place,
+        so a file is never left half-written.
+    """
+
+    def __init__(self, workers: int = 1, max_pending: Optional[int] = None, atomic: bool = False):
+        self.atomic = atomic
+        self.files_written = 0
+
+        self._created_dirs: Set[Path] = set()
+        self._stats_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._pending: Deque["Future[None]"] = deque()
+        self._max_pending = max_pending if max_pending is not None else workers * 64
+        self._start = time.perf_counter()
+
+    def ensure_dir(self, path: Path):
+        """Creates the directory with all of its parents, if it wasn't created by the writer before"""
+        if path in self._created_dirs:
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        self._created_dirs.add(path)
+
+    def write(self, path: Union[str, PathLike], content: str):
+        """Writes ``content`` to the file at ``path``, creating its directory if needed"""
+        path = Path(path)
+        if self._pool is None:
+            self._write(path, content)
+            return
+        while len(self._pending) >= self._max_pending:
+            self._pending.popleft().result()
+        self._pending.append(self._pool.submit(self._write, path, content))
+
+    def _write(self, path: Path, content: str):
+        self.ensure_dir(path.parent)
+        if self.atomic:
+            tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+        else:
+            with open(path, "w") as f:
+                f.write(content)
+        with self._stats_lock:
+            self.files_written += 1
+
+    def close(self):
+        """Waits for all queued writes to finish and logs the throughput"""
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+        elapsed = max(time.perf_counter() - self._start, 1e-9)
+        logger.info(f"Wrote {self.files_written} files in {elapsed:.2f}s ({self.files_written / elapsed:,.0f} files/s)")
+
+    def __enter__(self) -> "BufferedFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,172 @@
+import logging
+import struct
+from os import PathLike
+from typing import BinaryIO, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ImageDimensions = Tuple[int, int]
+
+# How many bytes are read upfront. Enough to cover the fixed headers of every format except JPEG and TIFF,
+# for which the rest of the file is scanned on demand
+_HEADER_SIZE = 32
+
+# Start Of Frame markers (excluding DHT/JPG/DAC markers that share the range)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers that don't have a length segment after them
+_JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xDA)}
+
+_TIFF_WIDTH_TAG = 256
+_TIFF_HEIGHT_TAG = 257
+
+
+def _probe_png(head: bytes) -> Optional[ImageDimensions]:
+    if head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+def _probe_gif(head: bytes) -> Optional[ImageDimensions]:
+    return struct.unpack("<HH", head[6:10])
+
+
+def _probe_bmp(head: bytes) -> Optional[ImageDimensions]:
+    (header_size,) = struct.unpack("<I", head[14:18])
+    if header_size == 12:
+        # OS/2 BITMAPCOREHEADER
+        return struct.unpack("<HH", head[18:22])
+    width, height = struct.unpack("<ii", head[18:26])
+    # Negative height means the image is stored top-down
+    return width, abs(height)
+
+
+def _probe_webp(head: bytes) -> Optional[ImageDimensions]:
+    chunk = head[12:16]
+    if chunk == b"VP8 ":
+        # Lossy: keyframe start code, followed by 14-bit dimensions
+        if head[23:26] != b"\x9d\x01\x2a":
+            return None
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        # Lossless: signature byte, followed by 14-bit (dimension - 1) values
+        if head[20] != 0x2F:
+            return None
+        (bits,) = struct.unpack("<I", head[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        # Extended: 24-bit (canvas dimension - 1) values
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def _probe_jpeg(f: BinaryIO) -> Optional[ImageDimensions]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        # Markers can be padded with any number of 0xFF fill bytes
+        marker = 0xFF
+        while marker == 0xFF:
+            byte = f.read(1)
+            if not byte:
+                return None
+            marker = byte[0]
+        if marker == 0x00 or marker in _JPEG_STANDALONE_MARKERS:
+            continue
+        segment_header = f.read(2)
+        if len(segment_header) != 2:
+            return None
+        (segment_length,) = struct.unpack(">H", segment_header)
+        if marker in _JPEG_SOF_MARKERS:
+            frame_header = f.read(5)
+            if len(frame_header) != 5:
+                return None
+            height, width = struct.unpack(">HH", frame_header[1:5])
+            if height == 0 or width == 0:
+                # Height defined later by a DNL marker, let PIL deal with it
+                return None
+            return width, height
+        f.seek(segment_length - 2, 1)
+
+
+def _probe_tiff(f: BinaryIO, head: bytes) -> Optional[ImageDimensions]:
+    endian = "<" if head[:2] == b"II" else ">"
+    (ifd_offset,) = struct.unpack(f"{endian}I", head[4:8])
+    f.seek(ifd_offset)
+    (entry_count,) = struct.unpack(f"{endian}H", f.read(2))
+    entries = f.read(entry_count * 12)
+
+    width: Optional[int] = None
+    height: Optional[int] = None
+    for i in range(0, len(entries) - 11, 12):
+        tag, value_type = struct.unpack(f"{endian}HH", entries[i : i + 4])
+        if tag not in (_TIFF_WIDTH_TAG, _TIFF_HEIGHT_TAG):
+            continue
+        # SHORT (3) or LONG (4), value is stored inline
+        if value_type == 3:
+            (value,) = struct.unpack(f"{endian}H", entries[i + 8 : i + 10])
+        elif value_type == 4:
+            (value,) = struct.unpack(f"{endian}I", entries[i + 8 : i + 12])
+        else:
+            return None
+        if tag == _TIFF_WIDTH_TAG:
+            width = value
+        else:
+            height = value
+        if width is not None and height is not None:
+            return width, height
+    return None
+
+
+def probe_image_dimensions(f: BinaryIO) -> Optional[ImageDimensions]:
+    """
+    Reads the dimensions of the image from its header, without decoding the image.
+    Supports PNG, JPEG, GIF, BMP, WebP and TIFF.
+
+    :param f: File opened in binary mode, positioned at the start of the image
+    :return: (width, height) of the image, or None if the format is unsupported or the header couldn't be parsed
+    """
+    head = f.read(_HEADER_SIZE)
+    try:
+        if head.startswith(b"\x89PNG\r\n\x1a\n"):
+            return _probe_png(head)
+        if head.startswith(b"\xff\xd8"):
+            return _probe_jpeg(f)
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return _probe_webp(head)
+        if head[:2] == b"BM":
+            return _probe_bmp(head)
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return _probe_gif(head)
+        if head[:4] in (b"II*\x00", b"MM\x00*"):
+            return _probe_tiff(f, head)
+    except (struct.error, IndexError, ValueError):
+        return None
+    return None
+
+
+def get_image_dimensions(path: Union[str, PathLike]) -> ImageDimensions:
+    """
+    Returns the dimensions of the image at ``path``.
+
+    Tries to read only the header of the file first, and falls back to PIL
+    for formats that aren't supported by :func:`probe_image_dimensions`.
+
+    :return: (width, height) of the image
+    """
+    with open(path, "rb") as f:
+        dimensions = probe_image_dimensions(f)
+    if dimensions is not None:
+        return dimensions
+
+    logger.debug(f"Couldn't read the dimensions of {path} from the header, falling back to PIL")
+    import PIL.Image
+
+    with PIL.Image.open(path) as img:
+        return img.size
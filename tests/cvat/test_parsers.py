@@ -9,6 +9,7 @@ from dagshub_annotation_converter.formats.cvat import (
     parse_points,
     parse_skeleton, parse_ellipse,
 )
+from dagshub_annotation_converter.formats.cvat.context import CVATImageInfo, parse_image_tag
 from dagshub_annotation_converter.ir.image import (
     CoordinateStyle,
     IRBBoxImageAnnotation,
@@ -23,9 +24,9 @@ def wrap_in_image_tag(data: str) -> str:
     return f'<image id="0" name="000.png" width="1920" height="1200">{data}</image>'
 
 
-def to_xml(data: str) -> Tuple[ElementBase, ElementBase]:
-    """Returns the image element + annotation element"""
-    return lxml.etree.fromstring(wrap_in_image_tag(data)), lxml.etree.fromstring(data)
+def to_xml(data: str) -> Tuple[CVATImageInfo, ElementBase]:
+    """Returns the parsed image info + annotation element"""
+    return parse_image_tag(lxml.etree.fromstring(wrap_in_image_tag(data))), lxml.etree.fromstring(data)
 
 
 def test_box():
@@ -0,0 +1,79 @@
+import datetime
+import json
+
+import pytest
+
+from dagshub_annotation_converter.converters.label_studio import export_to_label_studio_tasks
+from dagshub_annotation_converter.formats.label_studio.ids import SeededIdProvider
+from dagshub_annotation_converter.formats.label_studio.task import LabelStudioTask
+from dagshub_annotation_converter.ir.image import (
+    IRBBoxImageAnnotation,
+    IRPoseImageAnnotation,
+    IRPosePoint,
+    CoordinateStyle,
+)
+
+timestamp = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def annotations():
+    res = []
+    # More images than fit into a single chunk
+    for i in range(300):
+        common = {
+            "categories": {f"class_{i % 3}": 1.0},
+            "coordinate_style": CoordinateStyle.DENORMALIZED,
+            "image_width": 640,
+            "image_height": 480,
+            "filename": f"images/{i}.jpg",
+        }
+        res.append(IRBBoxImageAnnotation(left=i, top=10, width=20, height=30, **common))
+        if i % 7 == 0:
+            points = [IRPosePoint(x=i, y=10), IRPosePoint(x=i + 5, y=20), IRPosePoint(x=i + 10, y=15)]
+            res.append(IRPoseImageAnnotation.from_points(points=points, **common))
+    return res
+
+
+def test_export(tmp_path, annotations):
+    export_path = export_to_label_studio_tasks(annotations, tmp_path / "tasks.json")
+
+    tasks = [LabelStudioTask.model_validate(task) for task in json.loads(export_path.read_text())]
+    assert [task.data["image"] for task in tasks] == [f"images/{i}.jpg" for i in range(300)]
+    assert len(tasks[0].to_ir_annotations()) == 2
+    assert len(tasks[1].to_ir_annotations()) == 1
+
+
+@pytest.mark.parametrize("json_lines", [False, True])
+def test_parallel_export_same_as_serial(tmp_path, annotations, json_lines):
+    outputs = []
+    for workers in [1, 2]:
+        export_path = export_to_label_studio_tasks(
+            annotations,
+            tmp_path / f"tasks_{workers}.json",
+            workers=workers,
+            json_lines=json_lines,
+            id_provider=SeededIdProvider(1),
+            timestamp=timestamp,
+        )
+        outputs.append(export_path.read_text())
+
+    assert outputs[0] == outputs[1]
+
+
+def test_parallel_export_without_timestamp_same_as_serial(tmp_path, annotations):
+    outputs = []
+    for workers in [1, 2]:
+        export_path = export_to_label_studio_tasks(
+            annotations, tmp_path / f"tasks_{workers}.json", workers=workers, id_provider=SeededIdProvider(1)
+        )
+        outputs.append(export_path.read_text())
+
+    assert outputs[0] == outputs[1]
+
+
+def test_export_without_filename_fails(tmp_path, annotations):
+    annotations[0].filename = None
+
+    with pytest.raises(ValueError):
+        export_to_label_studio_tasks(annotations, tmp_path / "tasks.json")
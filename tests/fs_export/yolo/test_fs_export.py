@@ -1,9 +1,16 @@
 from pathlib import Path
 
-from dagshub_annotation_converter.converters.yolo import export_to_fs, _get_common_folder_with_part
+from dagshub_annotation_converter.converters.common import group_sorted_annotations
+from dagshub_annotation_converter.converters.yolo import (
+    export_to_fs,
+    export_stream_to_fs,
+    _get_common_folder_with_part,
+    _SplitDetector,
+)
 from dagshub_annotation_converter.formats.yolo import YoloContext
 from dagshub_annotation_converter.ir.image import (
     CoordinateStyle,
+    IRAnnotationTable,
     IRBBoxImageAnnotation,
     IRSegmentationImageAnnotation,
     IRSegmentationPoint,
@@ -152,19 +159,19 @@ def test_not_exporting_wrong_annotations(tmp_path):
     assert not (tmp_path / "data" / "labels" / "dogs" / "2.txt").exists()
 
 
-@pytest.mark.parametrize(
-    "paths, prefix, expected",
-    (
-        (["/a/b/c", "/a/b/d", "/a/b/e"], "b", "/a/b"),
-        (["/a/b/c", "/a/b/d", "/a/b/e"], "b", "/a/b"),
-        (["/a/b/c", "/a/b/d", "/a/b/b"], "b", "/a/b"),
-        (["/a/b/c", "/a/b/d", "/a/b/e/b"], "b", "/a/b"),
-        (["/a/b/c", "/a/e/b", "/a/e/b/b"], "b", "/a/b"),
-        (["/a/b/c", "/a/b/d", "/some_other/b/e"], "b", None),  # Fails because there are two different common b folders
-        (["/a/b/c", "/a/some_other/d", "/a/b/e"], "b", "/a/b"),
-        (["/a/b/c", "/a/bbb/d", "/a/b/e"], "b", "/a/b"),
-    ),
+common_folder_cases = (
+    (["/a/b/c", "/a/b/d", "/a/b/e"], "b", "/a/b"),
+    (["/a/b/c", "/a/b/d", "/a/b/e"], "b", "/a/b"),
+    (["/a/b/c", "/a/b/d", "/a/b/b"], "b", "/a/b"),
+    (["/a/b/c", "/a/b/d", "/a/b/e/b"], "b", "/a/b"),
+    (["/a/b/c", "/a/e/b", "/a/e/b/b"], "b", "/a/b"),
+    (["/a/b/c", "/a/b/d", "/some_other/b/e"], "b", None),  # Fails because there are two different common b folders
+    (["/a/b/c", "/a/some_other/d", "/a/b/e"], "b", "/a/b"),
+    (["/a/b/c", "/a/bbb/d", "/a/b/e"], "b", "/a/b"),
 )
+
+
+@pytest.mark.parametrize("paths, prefix, expected", common_folder_cases)
 def test__get_common_folder_with_part(paths, prefix, expected):
     paths = [Path(p) for p in paths]
     actual = _get_common_folder_with_part(paths, prefix)
@@ -175,6 +182,27 @@ def test__get_common_folder_with_part(paths, prefix, expected):
     assert actual == expected
 
 
+@pytest.mark.parametrize("paths, prefix, expected", common_folder_cases)
+def test_split_detector(paths, prefix, expected):
+    detector = _SplitDetector(splits=[prefix])
+    for path in paths:
+        detector.add(path)
+
+    if expected is not None:
+        expected = Path(expected)
+
+    assert detector.folder(prefix) == expected
+
+
+def test_split_detector_guesses_splits():
+    detector = _SplitDetector()
+    for path in ["images/train/1.jpg", "images/train/2.jpg", "images/val/3.jpg", "val/images/4.jpg"]:
+        detector.add(path)
+
+    # The shortest folder wins
+    assert detector.guess() == (Path("images/train"), Path("val"), None)
+
+
 def test_export_with_image_in_path(tmp_path):
     ctx = YoloContext(annotation_type="bbox", path=Path("data/images"))
     ctx.categories.add(name="cat")
@@ -211,3 +239,170 @@ def test_export_with_image_in_path(tmp_path):
     assert (tmp_path / "yolo_dagshub.yaml").exists()
     assert (tmp_path / "data" / "labels" / "cats" / "1.txt").exists()
     assert (tmp_path / "data" / "labels" / "dogs" / "2.txt").exists()
+
+
+@pytest.mark.parametrize("annotation_type", ("bbox", "segmentation", "pose"))
+@pytest.mark.parametrize("keypoint_dim", (2, 3))
+def test_table_export_matches_annotation_export(tmp_path, annotation_type, keypoint_dim):
+    annotations = [
+        IRBBoxImageAnnotation(
+            filename="images/cats/1.jpg",
+            categories={"cat": 1.0},
+            top=0.1,
+            left=0.2,
+            width=0.3,
+            height=0.4,
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+        ),
+        IRSegmentationImageAnnotation(
+            filename="images/cats/1.jpg",
+            categories={"dog": 1.0},
+            points=[IRSegmentationPoint(x=0.1, y=0.5), IRSegmentationPoint(x=0.5, y=0.7)],
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+        ),
+        IRPoseImageAnnotation.from_points(
+            filename="images/dogs/2.jpg",
+            categories={"dog": 1.0},
+            points=[IRPosePoint(x=0.1, y=0.5, visible=True), IRPosePoint(x=0.3, y=0.6, visible=False)],
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+        ),
+    ]
+
+    def make_context():
+        ctx = YoloContext(annotation_type=annotation_type, path=Path("data"))
+        ctx.categories.add(name="cat")
+        ctx.categories.add(name="dog")
+        ctx.keypoint_dim = keypoint_dim
+        ctx.keypoints_in_annotation = 2
+        return ctx
+
+    export_to_fs(make_context(), annotations, export_dir=tmp_path / "objects")
+    export_to_fs(make_context(), IRAnnotationTable.from_annotations(annotations), export_dir=tmp_path / "table")
+
+    object_files = sorted(p.relative_to(tmp_path / "objects") for p in (tmp_path / "objects").rglob("*.*"))
+    table_files = sorted(p.relative_to(tmp_path / "table") for p in (tmp_path / "table").rglob("*.*"))
+    assert object_files == table_files
+    for f in object_files:
+        assert (tmp_path / "objects" / f).read_bytes() == (tmp_path / "table" / f).read_bytes()
+
+
+@pytest.mark.parametrize("atomic_writes", (False, True))
+def test_parallel_export_matches_serial_export(tmp_path, atomic_writes):
+    annotations = [
+        IRBBoxImageAnnotation(
+            filename=f"images/{split}/{i}.jpg",
+            categories={"cat" if i % 2 else "dog": 1.0},
+            top=0.1,
+            left=0.2,
+            width=0.3,
+            height=0.4,
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+        )
+        for split in ("train", "val")
+        for i in range(50)
+    ]
+
+    def make_context():
+        ctx = YoloContext(annotation_type="bbox", path=Path("data"))
+        ctx.categories.add(name="cat")
+        ctx.categories.add(name="dog")
+        return ctx
+
+    export_to_fs(make_context(), annotations, export_dir=tmp_path / "serial")
+    export_to_fs(make_context(), annotations, export_dir=tmp_path / "parallel", workers=4, atomic_writes=atomic_writes)
+
+    serial_files = sorted(p.relative_to(tmp_path / "serial") for p in (tmp_path / "serial" / "data").rglob("*"))
+    parallel_files = sorted(p.relative_to(tmp_path / "parallel") for p in (tmp_path / "parallel" / "data").rglob("*"))
+    assert len(serial_files) == 103
+    assert serial_files == parallel_files
+    for f in serial_files:
+        if f.suffix == ".txt":
+            assert (tmp_path / "serial" / f).read_bytes() == (tmp_path / "parallel" / f).read_bytes()
+
+
+def test_stream_export_matches_export(tmp_path):
+    annotations = [
+        IRBBoxImageAnnotation(
+            filename=f"images/{split}/{i // 2}.jpg",
+            categories={"cat" if i % 2 else "dog": 1.0},
+            top=0.1,
+            left=0.2,
+            width=0.3,
+            height=0.4,
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+        )
+        for split in ("train", "val")
+        for i in range(10)
+    ]
+
+    def make_context():
+        ctx = YoloContext(annotation_type="bbox", path=Path("data"))
+        ctx.categories.add(name="cat")
+        ctx.categories.add(name="dog")
+        return ctx
+
+    ctx = make_context()
+    export_to_fs(ctx, annotations, export_dir=tmp_path / "list")
+    stream_ctx = make_context()
+    # A generator, so the annotations are consumed only once
+    stream = group_sorted_annotations(ann for ann in annotations)
+    export_stream_to_fs(stream_ctx, stream, export_dir=tmp_path / "stream")
+
+    list_files = sorted(p.relative_to(tmp_path / "list") for p in (tmp_path / "list" / "data").rglob("*.txt"))
+    stream_files = sorted(p.relative_to(tmp_path / "stream") for p in (tmp_path / "stream" / "data").rglob("*.txt"))
+    assert len(list_files) == 10
+    assert list_files == stream_files
+    for f in list_files:
+        assert (tmp_path / "list" / f).read_bytes() == (tmp_path / "stream" / f).read_bytes()
+    assert stream_ctx.train_path == ctx.train_path == Path("images/train")
+    assert stream_ctx.val_path == ctx.val_path == Path("images/val")
+
+
+def test_group_sorted_annotations_requires_sorted_stream():
+    def make_bbox(filename):
+        return IRBBoxImageAnnotation(
+            filename=filename,
+            categories={"cat": 1.0},
+            top=0.1,
+            left=0.2,
+            width=0.3,
+            height=0.4,
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+        )
+
+    grouped = list(group_sorted_annotations([make_bbox("a.jpg"), make_bbox("a.jpg"), make_bbox("b.jpg")]))
+    assert [(filename, len(anns)) for filename, anns in grouped] == [("a.jpg", 2), ("b.jpg", 1)]
+
+    with pytest.raises(ValueError):
+        list(group_sorted_annotations([make_bbox("a.jpg"), make_bbox("b.jpg"), make_bbox("a.jpg")]))
+
+
+def test_group_sorted_annotations_rejects_unsorted_stream():
+    def make_bbox(filename):
+        return IRBBoxImageAnnotation(
+            filename=filename,
+            categories={"cat": 1.0},
+            top=0.1,
+            left=0.2,
+            width=0.3,
+            height=0.4,
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+        )
+
+    # Annotations of every file are consecutive, but the files aren't sorted
+    with pytest.raises(ValueError):
+        list(group_sorted_annotations([make_bbox("b.jpg"), make_bbox("b.jpg"), make_bbox("a.jpg")]))
@@ -1,6 +1,17 @@
+import copy
 from pathlib import Path
+from zipfile import ZipFile
 
-from dagshub_annotation_converter.converters.cvat import load_cvat_from_xml_file
+import lxml.etree
+
+from dagshub_annotation_converter.converters.cvat import (
+    load_cvat_from_xml_file,
+    load_cvat_table_from_xml_file,
+    iter_cvat_from_xml_file,
+    load_cvat_from_zip,
+    load_cvat_from_xml_string,
+    load_cvat_table_from_xml_string,
+)
 from dagshub_annotation_converter.ir.image import (
     IRBBoxImageAnnotation,
     IRSegmentationImageAnnotation,
@@ -33,3 +44,54 @@ def test_cvat_import():
     actual_annotations = [[type(ann) for ann in annotations[file]] for file in expected_files]
 
     assert expected_annotations == actual_annotations
+
+
+def test_cvat_table_import():
+    annotation_file = Path(__file__).parent / "annotations.xml"
+    annotations = load_cvat_from_xml_file(annotation_file)
+
+    table = load_cvat_table_from_xml_file(annotation_file)
+
+    assert table.to_annotations() == [ann for anns in annotations.values() for ann in anns]
+
+
+def test_iter_cvat_from_xml_file():
+    annotation_file = Path(__file__).parent / "annotations.xml"
+    expected = load_cvat_from_xml_string(annotation_file.read_bytes())
+
+    with open(annotation_file, "rb") as f:
+        it = iter_cvat_from_xml_file(f)
+        name, annotations = next(it)
+        assert name == "001.png"
+        assert annotations == expected["001.png"]
+        assert dict([(name, annotations), *it]) == expected
+
+
+def test_cvat_zip_import(tmp_path):
+    annotation_file = Path(__file__).parent / "annotations.xml"
+    zip_path = tmp_path / "export.zip"
+    with ZipFile(zip_path, "w") as z:
+        z.write(annotation_file, "annotations.xml")
+
+    assert load_cvat_from_zip(zip_path) == load_cvat_from_xml_file(annotation_file)
+
+
+def test_parallel_import_matches_serial():
+    # Make enough copies of the images to be split into multiple chunks
+    root = lxml.etree.parse(str(Path(__file__).parent / "annotations.xml")).getroot()
+    images = root.findall("image")
+    for i in range(600):
+        image = copy.deepcopy(images[i % len(images)])
+        image.attrib["name"] = f"copy_{i}_{image.attrib['name']}"
+        root.append(image)
+    xml_text = lxml.etree.tostring(root)
+
+    serial = load_cvat_from_xml_string(xml_text)
+    parallel = load_cvat_from_xml_string(xml_text, workers=2)
+
+    assert len(parallel) == 604
+    assert list(parallel.keys()) == list(serial.keys())
+    assert parallel == serial
+
+    parallel_table = load_cvat_table_from_xml_string(xml_text, workers=2)
+    assert parallel_table.to_annotations() == [ann for anns in serial.values() for ann in anns]
@@ -0,0 +1,86 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from dagshub_annotation_converter.converters.label_studio import iter_ls_tasks, iter_ls_annotations
+from dagshub_annotation_converter.formats.label_studio.task import parse_ls_task
+from dagshub_annotation_converter.ir.image import IRBBoxImageAnnotation, IRSegmentationImageAnnotation
+from tests.label_studio.common import generate_task, generate_annotation
+
+
+@pytest.fixture
+def tasks():
+    res = []
+    for i in range(20):
+        task = json.loads(
+            generate_task(
+                [
+                    generate_annotation(
+                        {"x": 25, "y": 25, "width": 50, "height": 50, "rectanglelabels": ["dog"]},
+                        "rectanglelabels",
+                        f"bbox{i}",
+                    ),
+                    generate_annotation(
+                        {"points": [[10, 20], [30, 40], [50, 60]], "polygonlabels": ["cat"]},
+                        "polygonlabels",
+                        f"poly{i}",
+                    ),
+                ]
+            )
+        )
+        task["id"] = i
+        task["data"]["image"] = f"images/{i}.jpg"
+        res.append(task)
+    return res
+
+
+def as_json_array(tasks) -> bytes:
+    return json.dumps(tasks, indent=2).encode()
+
+
+def as_json_lines(tasks) -> bytes:
+    return "\n".join(json.dumps(task) for task in tasks).encode()
+
+
+@pytest.mark.parametrize("serialize", [as_json_array, as_json_lines])
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 100, 2**20])
+def test_iter_ls_tasks(tasks, serialize, compress, chunk_size):
+    data = serialize(tasks)
+    if compress:
+        data = gzip.compress(data)
+
+    actual = list(iter_ls_tasks(io.BytesIO(data), chunk_size=chunk_size))
+    expected = [parse_ls_task(json.dumps(task)) for task in tasks]
+
+    assert actual == expected
+
+
+def test_iter_ls_tasks_from_file(tmp_path, tasks):
+    export_path = tmp_path / "export.json.gz"
+    export_path.write_bytes(gzip.compress(as_json_array(tasks)))
+
+    assert [task.id for task in iter_ls_tasks(export_path)] == list(range(len(tasks)))
+
+
+@pytest.mark.parametrize("data", [b"", b"[]", b" [\n] \n"])
+def test_empty_export(data):
+    assert list(iter_ls_tasks(io.BytesIO(data))) == []
+
+
+def test_unclosed_array_fails(tasks):
+    data = as_json_array(tasks).rstrip(b"\n]")
+
+    with pytest.raises(ValueError):
+        list(iter_ls_tasks(io.BytesIO(data)))
+
+
+def test_iter_ls_annotations(tasks):
+    res = list(iter_ls_annotations(io.BytesIO(as_json_lines(tasks))))
+
+    assert [filename for filename, _ in res] == [f"images/{i}.jpg" for i in range(len(tasks))]
+    for filename, anns in res:
+        assert [type(ann) for ann in anns] == [IRBBoxImageAnnotation, IRSegmentationImageAnnotation]
+        assert all(ann.filename == filename for ann in anns)
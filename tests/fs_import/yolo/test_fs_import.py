@@ -1,8 +1,10 @@
+import shutil
 from pathlib import Path
 
 import pytest
 
-from dagshub_annotation_converter.converters.yolo import load_yolo_from_fs
+from dagshub_annotation_converter.converters.yolo import load_yolo_from_fs, iter_yolo_from_fs, load_yolo_table_from_fs
+from dagshub_annotation_converter.formats.yolo import YoloContext
 from dagshub_annotation_converter.ir.image import (
     IRBBoxImageAnnotation,
     CoordinateStyle,
@@ -181,3 +183,93 @@ def test_pose_3dim(data_folder, img_path):
     expected = generate_expected(img_path, ctx, to_keypoints)
 
     assert annotations == expected
+
+
+def test_cached_dimensions(data_folder, img_path, tmp_path, monkeypatch):
+    shutil.copytree(data_folder, tmp_path / "res")
+    yaml = tmp_path / "res" / "bbox_and_segmentation.yaml"
+
+    annotations, _ = load_yolo_from_fs("bbox", yaml, label_dir_name="labels_bbox", cache_dimensions=True)
+    assert (tmp_path / "res" / "bbox_and_segmentation.yaml.dimensions.sqlite").exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Image shouldn't be opened on a cached import")
+
+    monkeypatch.setattr("dagshub_annotation_converter.util.dimension_cache.get_image_dimensions", fail)
+    cached_annotations, _ = load_yolo_from_fs("bbox", yaml, label_dir_name="labels_bbox", cache_dimensions=True)
+
+    assert cached_annotations == annotations
+    assert cached_annotations[img_path][0].image_width == 640
+
+
+@pytest.mark.parametrize(
+    "annotation_type, yaml_name, label_dir_name",
+    (
+        ("bbox", "bbox_and_segmentation.yaml", "labels_bbox"),
+        ("segmentation", "bbox_and_segmentation.yaml", "labels_segmentation"),
+        ("pose", "pose_3dim.yaml", "labels_pose_3dim"),
+    ),
+)
+def test_parallel_import_matches_serial(data_folder, tmp_path, annotation_type, yaml_name, label_dir_name):
+    # Make multiple copies of the image, so there's something to distribute between workers
+    shutil.copytree(data_folder, tmp_path / "res")
+    data_dir = tmp_path / "res" / "data"
+    for i in range(20):
+        shutil.copy(data_dir / "images" / "testimg.png", data_dir / "images" / f"img{i}.png")
+        shutil.copy(data_dir / label_dir_name / "testimg.txt", data_dir / label_dir_name / f"img{i}.txt")
+
+    yaml = tmp_path / "res" / yaml_name
+    serial, _ = load_yolo_from_fs(annotation_type, yaml, label_dir_name=label_dir_name)
+    parallel, _ = load_yolo_from_fs(annotation_type, yaml, label_dir_name=label_dir_name, workers=4)
+
+    assert len(parallel) == 21
+    assert list(parallel.keys()) == list(serial.keys())
+    assert parallel == serial
+
+
+def test_iter_yolo_from_fs(data_folder, img_path):
+    yaml = data_folder / "bbox_and_segmentation.yaml"
+    expected, _ = load_yolo_from_fs("bbox", yaml, label_dir_name="labels_bbox")
+
+    ctx = YoloContext.from_yaml_file(yaml, annotation_type="bbox")
+    ctx.label_dir_name = "labels_bbox"
+    it = iter_yolo_from_fs(ctx, import_dir=data_folder)
+
+    rel_path, annotations = next(it)
+    assert rel_path == img_path
+    assert annotations == expected[img_path]
+    assert next(it, None) is None
+
+
+@pytest.mark.parametrize(
+    "annotation_type, yaml_name, label_dir_name",
+    (
+        ("bbox", "bbox_and_segmentation.yaml", "labels_bbox"),
+        ("segmentation", "bbox_and_segmentation.yaml", "labels_segmentation"),
+        ("pose", "pose_2dim.yaml", "labels_pose_2dim"),
+        ("pose", "pose_3dim.yaml", "labels_pose_3dim"),
+    ),
+)
+def test_load_table_matches_annotations(data_folder, annotation_type, yaml_name, label_dir_name):
+    yaml = data_folder / yaml_name
+    expected, ctx = load_yolo_from_fs(annotation_type, yaml, label_dir_name=label_dir_name)
+
+    table = load_yolo_table_from_fs(ctx, import_dir=data_folder)
+
+    assert table.to_annotations() == [ann for anns in expected.values() for ann in anns]
+
+
+def test_parallel_load_table_matches_serial(data_folder, tmp_path):
+    shutil.copytree(data_folder, tmp_path / "res")
+    data_dir = tmp_path / "res" / "data"
+    for i in range(20):
+        shutil.copy(data_dir / "images" / "testimg.png", data_dir / "images" / f"img{i}.png")
+        shutil.copy(data_dir / "labels_pose_3dim" / "testimg.txt", data_dir / "labels_pose_3dim" / f"img{i}.txt")
+
+    ctx = YoloContext.from_yaml_file(tmp_path / "res" / "pose_3dim.yaml", annotation_type="pose")
+    ctx.label_dir_name = "labels_pose_3dim"
+    serial = load_yolo_table_from_fs(ctx, import_dir=tmp_path / "res")
+    parallel = load_yolo_table_from_fs(ctx, import_dir=tmp_path / "res", workers=4)
+
+    assert len(parallel) == len(serial) > 0
+    assert parallel.to_annotations() == serial.to_annotations()
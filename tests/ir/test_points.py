@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+
+from dagshub_annotation_converter.ir.image import (
+    CoordinateStyle,
+    IRAnnotationTable,
+    IRPoseImageAnnotation,
+    IRPosePoint,
+    IRPosePoints,
+    IRSegmentationImageAnnotation,
+    IRSegmentationPoint,
+    IRSegmentationPoints,
+)
+
+
+def test_list_api():
+    points = IRPosePoints([IRPosePoint(x=1, y=2, visible=True), (3, 4), {"x": 5, "y": 6, "visible": False}])
+
+    assert len(points) == 3
+    assert points[0] == IRPosePoint(x=1, y=2, visible=True)
+    assert points[-1] == IRPosePoint(x=5, y=6, visible=False)
+    assert list(points) == [
+        IRPosePoint(x=1, y=2, visible=True),
+        IRPosePoint(x=3, y=4),
+        IRPosePoint(x=5, y=6, visible=False),
+    ]
+
+    points.append(IRPosePoint(x=7, y=8))
+    points[1] = IRPosePoint(x=0, y=0, visible=False)
+    del points[0]
+    points.insert(0, (9, 9, True))
+
+    assert points == [
+        IRPosePoint(x=9, y=9, visible=True),
+        IRPosePoint(x=0, y=0, visible=False),
+        IRPosePoint(x=5, y=6, visible=False),
+        IRPosePoint(x=7, y=8),
+    ]
+    assert points[1:3] == [IRPosePoint(x=0, y=0, visible=False), IRPosePoint(x=5, y=6, visible=False)]
+    np.testing.assert_array_equal(points.visibility, [1, 0, 0, -1])
+
+
+def test_points_are_views():
+    ann = IRPoseImageAnnotation.from_points(
+        categories={"cat": 1.0},
+        points=IRPosePoints([IRPosePoint(x=1, y=2, visible=True), IRPosePoint(x=3, y=4)]),
+        image_width=100,
+        image_height=100,
+        coordinate_style=CoordinateStyle.DENORMALIZED,
+    )
+    assert isinstance(ann.points, IRPosePoints)
+
+    ann.points[0].x = 10
+    for point in ann.points:
+        point.y *= 2
+        point.visible = False
+
+    np.testing.assert_array_equal(ann.points.coords, [[10, 4], [3, 8]])
+    np.testing.assert_array_equal(ann.points.visibility, [0, 0])
+    assert ann.points == [IRPosePoint(x=10, y=4, visible=False), IRPosePoint(x=3, y=8, visible=False)]
+
+
+def test_copied_points_are_detached():
+    points = IRSegmentationPoints([IRSegmentationPoint(x=1, y=2)])
+
+    copied = points[0].model_copy()
+    copied.x = 5
+
+    assert type(copied) is IRSegmentationPoint
+    assert points[0] == IRSegmentationPoint(x=1, y=2)
+
+
+def test_append_grows_storage():
+    points = IRSegmentationPoints()
+    for i in range(1000):
+        points.append((i, -i))
+
+    assert len(points) == 1000
+    assert points.coords.shape == (1000, 2)
+    assert points.coords.dtype == np.float64
+    assert points[999] == IRSegmentationPoint(x=999, y=-999)
+
+
+def test_compact_storage():
+    coords = np.random.default_rng(0).random((10_000, 2))
+    ann = IRSegmentationImageAnnotation(
+        categories={"cat": 1.0},
+        points=coords,
+        image_width=100,
+        image_height=100,
+        coordinate_style=CoordinateStyle.NORMALIZED,
+    )
+
+    assert isinstance(ann.points, IRSegmentationPoints)
+    assert ann.points.coords.nbytes == 16 * len(coords)
+    np.testing.assert_array_equal(ann.points.coords, coords)
+
+
+def test_points_stay_lists_by_default():
+    ann = IRPoseImageAnnotation.from_points(
+        categories={"cat": 1.0},
+        points=[IRPosePoint(x=1, y=2, visible=True), IRPosePoint(x=3, y=4)],
+        image_width=100,
+        image_height=100,
+        coordinate_style=CoordinateStyle.DENORMALIZED,
+    )
+    assert isinstance(ann.points, list)
+
+    ann.points[0].x = 10
+    for point in ann.points:
+        point.visible = False
+    assert ann.points == [IRPosePoint(x=10, y=2, visible=False), IRPosePoint(x=3, y=4, visible=False)]
+
+    ann.points = ann.points + [IRPosePoint(x=5, y=6)]
+    assert len(ann.points) == 3
+    np.testing.assert_array_equal(ann.point_array().coords, [[10, 2], [3, 4], [5, 6]])
+    np.testing.assert_array_equal(ann.point_array().visibility, [0, 0, -1])
+
+
+def test_validation_keeps_containers():
+    ann = IRSegmentationImageAnnotation(
+        categories={"cat": 1.0},
+        points=IRSegmentationPoints([IRSegmentationPoint(x=1, y=2)]),
+        image_width=100,
+        image_height=100,
+        coordinate_style=CoordinateStyle.DENORMALIZED,
+    )
+    assert isinstance(ann.points, IRSegmentationPoints)
+    assert ann.points == [IRSegmentationPoint(x=1, y=2)]
+    assert ann.model_dump()["points"] == [{"x": 1.0, "y": 2.0}]
+    assert ann.normalized().points == [IRSegmentationPoint(x=0.01, y=0.02)]
+
+    with pytest.raises(ValueError):
+        IRSegmentationImageAnnotation(
+            categories={"cat": 1.0},
+            points="not points",
+            image_width=100,
+            image_height=100,
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+        )
+
+
+def test_table_points_opt_in():
+    ann = IRPoseImageAnnotation.from_points(
+        categories={"cat": 1.0},
+        points=[IRPosePoint(x=1, y=2, visible=True), IRPosePoint(x=3, y=4)],
+        image_width=100,
+        image_height=100,
+        coordinate_style=CoordinateStyle.DENORMALIZED,
+    )
+    table = IRAnnotationTable.from_annotations([ann])
+
+    assert isinstance(table.to_annotations()[0].points, list)
+    assert isinstance(table.to_annotations(point_arrays=True)[0].points, IRPosePoints)
+    assert table.to_annotations() == table.to_annotations(point_arrays=True) == [ann]
+
+
+def test_pose_normalization_doesnt_change_original():
+    ann = IRPoseImageAnnotation.from_points(
+        categories={"cat": 1.0},
+        points=[IRPosePoint(x=10, y=20, visible=True), IRPosePoint(x=30, y=60, visible=False)],
+        image_width=100,
+        image_height=200,
+        coordinate_style=CoordinateStyle.DENORMALIZED,
+    )
+
+    normalized = ann.normalized()
+
+    assert normalized.points == [IRPosePoint(x=0.1, y=0.1, visible=True), IRPosePoint(x=0.3, y=0.3, visible=False)]
+    assert ann.points == [IRPosePoint(x=10, y=20, visible=True), IRPosePoint(x=30, y=60, visible=False)]
+    assert normalized.denormalized().points == ann.points
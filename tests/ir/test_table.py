@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from dagshub_annotation_converter.ir.image import (
+    CoordinateStyle,
+    IRAnnotationTable,
+    IRBBoxImageAnnotation,
+    IREllipseImageAnnotation,
+    IRPoseImageAnnotation,
+    IRPosePoint,
+    IRSegmentationImageAnnotation,
+    IRSegmentationPoint,
+)
+
+
+@pytest.fixture
+def annotations():
+    return [
+        IRBBoxImageAnnotation(
+            filename="images/1.jpg",
+            categories={"cat": 1.0},
+            top=0.1,
+            left=0.2,
+            width=0.3,
+            height=0.4,
+            rotation=15.0,
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.NORMALIZED,
+            imported_id="abc",
+        ),
+        IRSegmentationImageAnnotation(
+            filename="images/2.jpg",
+            categories={"dog": 0.5, "cat": 0.25},
+            points=[IRSegmentationPoint(x=10, y=20), IRSegmentationPoint(x=30, y=40), IRSegmentationPoint(x=5, y=5)],
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+        ),
+        IRPoseImageAnnotation(
+            filename="images/1.jpg",
+            categories={"dog": 1.0},
+            top=10,
+            left=20,
+            width=30,
+            height=40,
+            points=[
+                IRPosePoint(x=20, y=10, visible=True),
+                IRPosePoint(x=50, y=50, visible=False),
+                IRPosePoint(x=1, y=2),
+            ],
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+        ),
+        IREllipseImageAnnotation(
+            categories={"cat": 1.0},
+            center_x=50,
+            center_y=60,
+            radius_x=10,
+            radius_y=20,
+            rotation=30,
+            image_width=100,
+            image_height=200,
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+        ),
+    ]
+
+
+def test_roundtrip(annotations):
+    table = IRAnnotationTable.from_annotations(annotations)
+
+    assert len(table) == 4
+    assert table.points.shape == (6, 2)
+    assert table.filenames == ["images/1.jpg", "images/2.jpg"]
+    assert table.category_names == ["cat", "dog"]
+    assert table.to_annotations() == annotations
+
+
+def test_normalization(annotations):
+    table = IRAnnotationTable.from_annotations(annotations)
+
+    expected = [ann.normalized() for ann in annotations]
+    assert table.normalized().to_annotations() == expected
+
+    expected = [ann.denormalized() for ann in annotations]
+    assert table.denormalized().to_annotations() == expected
+
+
+def test_take(annotations):
+    table = IRAnnotationTable.from_annotations(annotations)
+
+    assert table.take([2, 1]).to_annotations() == [annotations[2], annotations[1]]
+    assert table.take(np.array([True, False, False, True])).to_annotations() == [annotations[0], annotations[3]]
+    assert len(table.take([])) == 0
+
+
+def test_concat(annotations):
+    first = IRAnnotationTable.from_annotations(annotations[:2])
+    second = IRAnnotationTable.from_annotations(annotations[2:])
+
+    assert IRAnnotationTable.concat([first, second]).to_annotations() == annotations
+
+
+def test_group_by_filename(annotations):
+    table = IRAnnotationTable.from_annotations(annotations)
+
+    groups = table.group_by_filename()
+
+    assert list(groups.keys()) == ["images/1.jpg", "images/2.jpg", None]
+    assert groups["images/1.jpg"].tolist() == [0, 2]
+    assert groups["images/2.jpg"].tolist() == [1]
+    assert groups[None].tolist() == [3]
+
+
+def test_single_category_ids(annotations):
+    table = IRAnnotationTable.from_annotations(annotations)
+
+    with pytest.raises(ValueError):
+        table.single_category_ids()
+
+    assert table.take([0, 2, 3]).single_category_ids().tolist() == [0, 1, 0]
@@ -0,0 +1,78 @@
+import datetime
+import io
+import threading
+
+from dagshub_annotation_converter.converters.label_studio import export_ls_tasks_from_table
+from dagshub_annotation_converter.formats.label_studio.ids import (
+    CounterIdProvider,
+    SeededIdProvider,
+    get_id_provider,
+    use_id_provider,
+)
+from dagshub_annotation_converter.formats.label_studio.task import LabelStudioTask
+from dagshub_annotation_converter.ir.image import IRBBoxImageAnnotation, CoordinateStyle, IRAnnotationTable
+
+
+def make_table() -> IRAnnotationTable:
+    return IRAnnotationTable.from_annotations(
+        IRBBoxImageAnnotation(
+            categories={"dog": 1.0},
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+            image_width=640,
+            image_height=480,
+            left=10 * i,
+            top=20,
+            width=30,
+            height=40,
+            filename=f"{i % 3}.jpg",
+        )
+        for i in range(10)
+    )
+
+
+def test_counter_provider():
+    previous = get_id_provider()
+    with use_id_provider(CounterIdProvider()):
+        task = LabelStudioTask()
+        task.add_ir_annotation(make_table().annotation(0))
+        other_task = LabelStudioTask()
+
+    assert get_id_provider() is previous
+    assert (task.id, other_task.id) == (1, 2)
+    assert task.annotations[0].result[0].id == "0000000001"
+
+
+def test_seeded_provider_is_reproducible():
+    first, second = SeededIdProvider(42), SeededIdProvider(42)
+
+    assert [first.result_id() for _ in range(5)] == [second.result_id() for _ in range(5)]
+    assert first.task_id() == second.task_id()
+    assert SeededIdProvider(43).result_id() != SeededIdProvider(42).result_id()
+
+
+def test_reexport_is_byte_identical():
+    timestamp = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    exports = []
+    for _ in range(2):
+        f = io.StringIO()
+        export_ls_tasks_from_table(f, make_table(), id_provider=SeededIdProvider(7), timestamp=timestamp)
+        exports.append(f.getvalue())
+
+    assert exports[0] == exports[1]
+
+
+def test_provider_is_per_thread():
+    providers = {}
+
+    def record_provider(name):
+        providers[name] = get_id_provider()
+
+    counter = CounterIdProvider()
+    with use_id_provider(counter):
+        thread = threading.Thread(target=record_provider, args=("thread",))
+        thread.start()
+        thread.join()
+        record_provider("main")
+
+    assert providers["main"] is counter
+    assert providers["thread"] is not counter
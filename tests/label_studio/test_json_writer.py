@@ -0,0 +1,197 @@
+import datetime
+import io
+import json
+import uuid
+
+import numpy as np
+import pytest
+from pydantic_core import to_json
+
+from dagshub_annotation_converter.converters.label_studio import export_ls_tasks, export_ls_tasks_from_table
+from dagshub_annotation_converter.formats.label_studio.json_writer import (
+    ir_annotations_to_task_json,
+    json_float,
+)
+from dagshub_annotation_converter.formats.label_studio.task import LabelStudioTask, parse_ls_task
+from dagshub_annotation_converter.ir.image import (
+    IRBBoxImageAnnotation,
+    IREllipseImageAnnotation,
+    IRSegmentationImageAnnotation,
+    IRSegmentationPoint,
+    IRSegmentationPoints,
+    IRPoseImageAnnotation,
+    IRPosePoint,
+    IRAnnotationTable,
+    CoordinateStyle,
+)
+from tests.label_studio.common import generate_task, generate_annotation
+
+
+@pytest.fixture
+def deterministic_ids(monkeypatch):
+    counter = iter(range(1, 10**9))
+
+    def reset():
+        nonlocal counter
+        counter = iter(range(1, 10**9))
+
+    monkeypatch.setattr(uuid, "uuid4", lambda: uuid.UUID(int=next(counter)))
+    return reset
+
+
+def make_task() -> LabelStudioTask:
+    timestamp = datetime.datetime(2021, 10, 1, tzinfo=datetime.timezone.utc)
+    return LabelStudioTask(id=42, data={"image": "images/äö.jpg"}, created_at=timestamp, updated_at=timestamp)
+
+
+@pytest.fixture
+def annotations():
+    common = {"image_width": 640, "image_height": 480, "filename": "images/äö.jpg"}
+    return [
+        IRBBoxImageAnnotation(
+            categories={"dog": 1.0},
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+            left=100,
+            top=33.3,
+            width=1e-7,
+            height=200,
+            rotation=12.5,
+            **common,
+        ),
+        IRBBoxImageAnnotation(
+            categories={'"quoted"\ncat': 1.0},
+            coordinate_style=CoordinateStyle.NORMALIZED,
+            left=0.1,
+            top=0.2,
+            width=0.3,
+            height=0.00000025,
+            **common,
+        ),
+        IREllipseImageAnnotation(
+            categories={"ball": 1.0},
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+            center_x=320,
+            center_y=240,
+            radius_x=17,
+            radius_y=3,
+            rotation=45,
+            **common,
+        ),
+        IRSegmentationImageAnnotation(
+            categories={"cat": 1.0},
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+            points=[
+                IRSegmentationPoint(x=10, y=20),
+                IRSegmentationPoint(x=30.5, y=40),
+                IRSegmentationPoint(x=0.001, y=479),
+            ],
+            **common,
+        ),
+        IRSegmentationImageAnnotation(
+            categories={"cat": 1.0},
+            coordinate_style=CoordinateStyle.NORMALIZED,
+            points=IRSegmentationPoints.from_array(np.array([(0.1, 0.2), (0.3, 0.4), (0.5, 0.6)])),
+            **common,
+        ),
+        IRPoseImageAnnotation.from_points(
+            categories={"person": 1.0},
+            points=[
+                IRPosePoint(x=100, y=100, visible=True),
+                IRPosePoint(x=200, y=150, visible=False),
+                IRPosePoint(x=150, y=300),
+            ],
+            coordinate_style=CoordinateStyle.DENORMALIZED,
+            **common,
+        ),
+    ]
+
+
+def expected_task_json(task: LabelStudioTask, annotations) -> str:
+    task = task.model_copy(deep=True)
+    task.add_ir_annotations(annotations)
+    return task.model_dump_json()
+
+
+def test_same_as_models(deterministic_ids, annotations):
+    expected = expected_task_json(make_task(), annotations)
+    deterministic_ids()
+    actual = ir_annotations_to_task_json(make_task(), annotations)
+
+    assert actual == expected
+
+
+def test_task_with_existing_annotations(deterministic_ids, annotations):
+    task = parse_ls_task(
+        generate_task(
+            [
+                generate_annotation(
+                    {"x": 25, "y": 25, "width": 50, "height": 50, "rectanglelabels": ["dog"]}, "rectanglelabels", "a"
+                )
+            ]
+        )
+    )
+    task.data["pose_points"] = [["x", "y"]]
+    task.data["pose_boxes"] = ["z"]
+
+    expected = expected_task_json(task, annotations)
+    deterministic_ids()
+    actual = ir_annotations_to_task_json(task, annotations)
+
+    assert actual == expected
+    # The task passed in doesn't change
+    assert len(task.annotations[0].result) == 1
+    assert task.data["pose_boxes"] == ["z"]
+
+
+def test_empty_task():
+    task = make_task()
+
+    assert ir_annotations_to_task_json(task, []) == task.model_dump_json()
+
+
+@pytest.mark.parametrize(
+    "value", [0.0, -0.0, 1.0, 0.1, 33.333333333333336, 1e-5, -2.5e-5, 1e-7, 1e15, 1e16, -1.5e16, 5e-324]
+)
+def test_json_float(value):
+    assert json_float(value) == to_json(value).decode()
+
+
+def test_json_float_non_finite():
+    assert json_float(float("inf")) == "null"
+    assert json_float(float("nan")) == "null"
+
+
+@pytest.mark.parametrize("json_lines", [False, True])
+def test_export_ls_tasks(deterministic_ids, annotations, json_lines):
+    tasks = [make_task(), make_task()]
+    expected = [expected_task_json(task, annotations) for task in tasks]
+    deterministic_ids()
+
+    f = io.StringIO()
+    export_ls_tasks(f, [(task, annotations) for task in tasks], json_lines=json_lines)
+
+    if json_lines:
+        assert f.getvalue() == "".join(f"{task}\n" for task in expected)
+    else:
+        assert f.getvalue() == f"[{','.join(expected)}]"
+
+
+def test_export_ls_tasks_from_table(deterministic_ids, annotations):
+    other_file = [ann.model_copy(update={"filename": "other.jpg"}) for ann in annotations]
+    table = IRAnnotationTable.from_annotations(annotations + other_file)
+
+    f = io.StringIO()
+    export_ls_tasks_from_table(f, table)
+    actual = json.loads(f.getvalue())
+    deterministic_ids()
+
+    tasks = [LabelStudioTask(data={"image": "images/äö.jpg"}), LabelStudioTask(data={"image": "other.jpg"})]
+    tasks[0].add_ir_annotations(annotations)
+    tasks[1].add_ir_annotations(other_file)
+    expected = [json.loads(task.model_dump_json()) for task in tasks]
+
+    # Ids and timestamps of the tasks are generated
+    for task in actual + expected:
+        for key in ["id", "created_at", "updated_at"]:
+            del task[key]
+    assert actual == expected
@@ -1,4 +1,5 @@
 import json
+from typing import Dict, List, Tuple
 
 import pytest
 
@@ -278,3 +279,109 @@ def test_ir_pose_addition():
     assert (kp2.value.x, kp2.value.y) == (100, 50)
     kp3 = task.annotations[0].result[3]
     assert (kp3.value.x, kp3.value.y) == (50, 100)
+
+
+def generate_pose_results(name: str, points: List[Tuple[float, float]], bbox: bool = True) -> List[Dict]:
+    results = [
+        generate_annotation({"x": x, "y": y, "keypointlabels": [name]}, "keypointlabels", f"{name}{i}")
+        for i, (x, y) in enumerate(points)
+    ]
+    if bbox:
+        results.append(
+            generate_annotation(
+                {"x": 10, "y": 20, "width": 30, "height": 40, "rectanglelabels": [name]},
+                "rectanglelabels",
+                f"{name}box",
+            )
+        )
+    return results
+
+
+def test_pose_without_bbox():
+    task = json.loads(generate_task(generate_pose_results("cat", [(10, 20), (50, 80), (30, 40)], bbox=False)))
+    task["data"]["pose_boxes"] = ["catbox"]
+    task["data"]["pose_points"] = [["cat0", "cat1", "cat2"]]
+
+    annotations = parse_ls_task(json.dumps(task)).to_ir_annotations(filename="image.jpg")
+
+    assert len(annotations) == 1
+    pose = annotations[0]
+    assert isinstance(pose, IRPoseImageAnnotation)
+    assert pose.categories == {"cat": 1.0}
+    assert pose.filename == "image.jpg"
+    assert (pose.left, pose.top) == (0.1, 0.2)
+    assert pose.width == pytest.approx(0.4)
+    assert pose.height == pytest.approx(0.6)
+    assert pose.point_array().coords.tolist() == [[0.1, 0.2], [0.5, 0.8], [0.3, 0.4]]
+
+
+def test_pose_without_points_keeps_other_poses():
+    results = generate_pose_results("cat", []) + generate_pose_results("dog", [(50, 50), (60, 70)])
+    task = json.loads(generate_task(results))
+    task["data"]["pose_boxes"] = ["catbox", "dogbox"]
+    task["data"]["pose_points"] = [["missing"], ["dog0", "dog1"]]
+
+    annotations = parse_ls_task(json.dumps(task)).to_ir_annotations()
+
+    # The bbox of the pose without points stays a bbox
+    assert [type(ann) for ann in annotations] == [IRBBoxImageAnnotation, IRPoseImageAnnotation]
+    pose = annotations[1]
+    assert pose.categories == {"dog": 1.0}
+    assert (pose.left, pose.top, pose.width, pose.height) == (0.1, 0.2, 0.3, 0.4)
+    assert pose.point_array().coords.tolist() == [[0.5, 0.5], [0.6, 0.7]]
+
+
+@pytest.fixture
+def mixed_task() -> LabelStudioTask:
+    results = (
+        generate_pose_results("cat", [(10, 20), (50, 80)])
+        + generate_pose_results("dog", [(50, 50), (60, 70)])
+        + [
+            generate_annotation(
+                {"x": 1, "y": 2, "width": 3, "height": 4, "rectanglelabels": ["dog"]}, "rectanglelabels", "box"
+            ),
+            generate_annotation({"x": 5, "y": 6, "keypointlabels": ["cat"]}, "keypointlabels", "point"),
+        ]
+    )
+    task = json.loads(generate_task(results))
+    task["data"]["pose_boxes"] = ["catbox", "dogbox"]
+    task["data"]["pose_points"] = [["cat0", "cat1"], ["dog0", "dog1"]]
+    return parse_ls_task(json.dumps(task))
+
+
+def test_iter_ir_annotations_same_as_to_ir_annotations(mixed_task):
+    expected = mixed_task.to_ir_annotations(filename="image.jpg")
+    actual = list(mixed_task.iter_ir_annotations(filename="image.jpg"))
+
+    assert actual == expected
+    assert [type(ann) for ann in actual] == [
+        IRBBoxImageAnnotation,
+        IRPoseImageAnnotation,
+        IRPoseImageAnnotation,
+        IRPoseImageAnnotation,
+    ]
+
+
+def test_iter_ir_annotations_type_filter(mixed_task):
+    bboxes = list(mixed_task.iter_ir_annotations(annotation_types=[IRBBoxImageAnnotation]))
+    # The bboxes of the poses are not yielded as separate bboxes
+    assert len(bboxes) == 1
+    assert bboxes[0].imported_id == "box"
+
+    poses = list(mixed_task.iter_ir_annotations(annotation_types=[IRPoseImageAnnotation]))
+    assert [len(pose.points) for pose in poses] == [1, 2, 2]
+
+
+def test_iter_ir_annotations_category_filter(mixed_task):
+    actual = list(mixed_task.iter_ir_annotations(categories=["dog"]))
+
+    assert [type(ann) for ann in actual] == [IRBBoxImageAnnotation, IRPoseImageAnnotation]
+    assert all(ann.categories == {"dog": 1.0} for ann in actual)
+    assert actual[1].point_array().coords.tolist() == [[0.5, 0.5], [0.6, 0.7]]
+
+
+def test_iter_ir_annotations_ground_truth_only(mixed_task):
+    mixed_task.annotations[0].ground_truth = False
+
+    assert list(mixed_task.iter_ir_annotations(ground_truth_only=True)) == []
+    assert len(list(mixed_task.iter_ir_annotations())) == 4
@@ -0,0 +1,166 @@
+import gc
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dagshub_annotation_converter.formats.label_studio.ellipselabels import EllipseLabelsAnnotation
+from dagshub_annotation_converter.formats.label_studio.keypointlabels import KeyPointLabelsAnnotation
+from dagshub_annotation_converter.formats.label_studio.polygonlabels import PolygonLabelsAnnotation
+from dagshub_annotation_converter.formats.label_studio.rectanglelabels import RectangleLabelsAnnotation
+from dagshub_annotation_converter.formats.label_studio.task import (
+    LabelStudioTask,
+    LabelStudioTaskDiff,
+    parse_ls_task,
+    parse_ls_tasks_bulk,
+)
+from dagshub_annotation_converter.ir.image import (
+    IRBBoxImageAnnotation,
+    IRPoseImageAnnotation,
+    IRPosePoint,
+    CoordinateStyle,
+)
+from tests.label_studio.common import generate_task, generate_annotation
+
+
+@pytest.fixture
+def mixed_task() -> str:
+    return generate_task(
+        [
+            generate_annotation(
+                {"x": 25, "y": 25, "width": 50, "height": 50, "rectanglelabels": ["dog"]}, "rectanglelabels", "a"
+            ),
+            generate_annotation(
+                {"points": [[10, 20], [30, 40], [50, 60]], "polygonlabels": ["cat"]}, "polygonlabels", "b"
+            ),
+            generate_annotation({"x": 50, "y": 50, "width": 1, "keypointlabels": ["nose"]}, "keypointlabels", "c"),
+            generate_annotation(
+                {"x": 50, "y": 50, "radiusX": 10, "radiusY": 20, "rotation": 0, "ellipselabels": ["ball"]},
+                "ellipselabels",
+                "d",
+            ),
+        ]
+    )
+
+
+def test_results_parsed_by_type(mixed_task):
+    results = parse_ls_task(mixed_task).annotations[0].result
+
+    assert [type(r) for r in results] == [
+        RectangleLabelsAnnotation,
+        PolygonLabelsAnnotation,
+        KeyPointLabelsAnnotation,
+        EllipseLabelsAnnotation,
+    ]
+
+
+def test_unknown_result_type_fails():
+    task = generate_task([generate_annotation({"labels": ["dog"]}, "unknownlabels", "a")])
+
+    with pytest.raises(ValidationError):
+        parse_ls_task(task)
+
+
+def test_bulk_parsing_matches_single(mixed_task):
+    tasks = []
+    for i in range(3):
+        task = json.loads(mixed_task)
+        task["id"] = i
+        tasks.append(task)
+
+    actual = parse_ls_tasks_bulk(json.dumps(tasks).encode())
+    expected = [parse_ls_task(json.dumps(task)) for task in tasks]
+
+    assert actual == expected
+    assert [t.model_dump_json() for t in actual] == [t.model_dump_json() for t in expected]
+
+
+def test_bulk_parsing_with_paused_gc(mixed_task):
+    data = f"[{mixed_task}]"
+
+    assert parse_ls_tasks_bulk(data, pause_gc=True) == parse_ls_tasks_bulk(data)
+    assert gc.isenabled()
+
+
+def test_serialization_roundtrip(mixed_task):
+    task = parse_ls_task(mixed_task)
+
+    assert parse_ls_task(task.model_dump_json()) == task
+
+
+def make_bbox(left: float, category: str = "dog") -> IRBBoxImageAnnotation:
+    return IRBBoxImageAnnotation(
+        categories={category: 1.0},
+        coordinate_style=CoordinateStyle.NORMALIZED,
+        image_width=100,
+        image_height=200,
+        left=left,
+        top=0.1,
+        width=0.2,
+        height=0.3,
+    )
+
+
+def make_pose(left: float) -> IRPoseImageAnnotation:
+    return IRPoseImageAnnotation.from_points(
+        categories={"person": 1.0},
+        points=[IRPosePoint(x=left, y=0.1), IRPosePoint(x=left + 0.1, y=0.2)],
+        coordinate_style=CoordinateStyle.NORMALIZED,
+        image_width=100,
+        image_height=200,
+    )
+
+
+@pytest.fixture
+def existing_task() -> LabelStudioTask:
+    task = LabelStudioTask()
+    task.add_ir_annotations([make_bbox(0.1), make_bbox(0.2), make_pose(0.3)])
+    return task
+
+
+def test_diff_keeps_unchanged_results(existing_task):
+    old_ids = [r.id for r in existing_task.annotations[0].result]
+
+    diff = existing_task.diff_ir_annotations([make_bbox(0.1), make_bbox(0.5), make_pose(0.3)])
+
+    assert [r.value.x for r in diff.added] == [50]
+    assert diff.removed == [old_ids[1]]
+    # The pose didn't change, so it keeps its ids
+    assert diff.pose_boxes == [old_ids[2]]
+    assert diff.pose_points == [old_ids[3:]]
+
+
+def test_diff_of_same_annotations_is_empty(existing_task):
+    diff = existing_task.diff_ir_annotations([make_bbox(0.1), make_bbox(0.2), make_pose(0.3)])
+
+    assert diff.is_empty()
+    assert existing_task.apply_diff(diff) == existing_task
+
+
+def test_apply_diff(existing_task):
+    new_annotations = [make_bbox(0.2), make_pose(0.4), make_bbox(0.9, "cat")]
+    old_results = existing_task.annotations[0].result
+
+    diff = existing_task.diff_ir_annotations(new_annotations)
+    patched = existing_task.apply_diff(diff)
+
+    # Unchanged results are reused
+    assert patched.annotations[0].result[0] is old_results[1]
+    # The task itself doesn't change
+    assert existing_task.annotations[0].result == old_results
+    assert len(existing_task.data["pose_boxes"]) == 1
+
+    rebuilt = LabelStudioTask()
+    rebuilt.add_ir_annotations(new_annotations)
+
+    def contents(task):
+        return sorted(repr(ann.model_dump(exclude={"imported_id"})) for ann in task.to_ir_annotations())
+
+    assert contents(patched) == contents(rebuilt)
+    assert len(patched.data["pose_boxes"]) == 1
+
+
+def test_diff_serialization_roundtrip(existing_task):
+    diff = existing_task.diff_ir_annotations([make_pose(0.5)])
+
+    assert LabelStudioTaskDiff.model_validate_json(diff.model_dump_json()) == diff
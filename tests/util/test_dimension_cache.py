@@ -0,0 +1,126 @@
+import os
+
+import PIL.Image
+
+from dagshub_annotation_converter.util import dimension_cache
+from dagshub_annotation_converter.util.dimension_cache import ImageDimensionCache
+
+
+def make_image(path, size):
+    PIL.Image.new("RGB", size).save(path)
+
+
+def test_cache_hit(tmp_path):
+    img = tmp_path / "img.png"
+    make_image(img, (10, 20))
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get_dimensions(img) == (10, 20)
+        assert cache.misses == 1
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get_dimensions(img) == (10, 20)
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+
+def test_cache_invalidated_on_change(tmp_path):
+    img = tmp_path / "img.png"
+    make_image(img, (10, 20))
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite") as cache:
+        cache.get_dimensions(img)
+
+    make_image(img, (30, 40))
+    stat = os.stat(img)
+    os.utime(img, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get_dimensions(img) == (30, 40)
+        assert cache.misses == 1
+
+
+def test_lru_eviction(tmp_path):
+    images = []
+    for i in range(4):
+        img = tmp_path / f"{i}.png"
+        make_image(img, (i + 1, i + 1))
+        images.append(img)
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite", max_entries=3) as cache:
+        for img in images[:3]:
+            cache.get_dimensions(img)
+        cache.flush()
+        # Touch the first image, so the second one becomes the least recently used
+        cache.get_dimensions(images[0])
+        cache.get_dimensions(images[3])
+        assert len(cache) == 3
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite", max_entries=3) as cache:
+        for img in [images[0], images[2], images[3]]:
+            cache.get_dimensions(img)
+        assert cache.hits == 3
+        assert cache.get_dimensions(images[1]) == (2, 2)
+        assert cache.misses == 1
+
+
+def test_hits_are_flushed_without_close(tmp_path):
+    images = []
+    for i in range(3):
+        img = tmp_path / f"{i}.png"
+        make_image(img, (i + 1, i + 1))
+        images.append(img)
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite") as cache:
+        for img in images:
+            cache.get_dimensions(img)
+
+    cache = ImageDimensionCache(tmp_path / "cache.sqlite")
+    cache._flush_threshold = 2
+    for img in images:
+        cache.get_dimensions(img)
+    assert cache.hits == 3
+    # Only the touch of the last image is still pending, the others were persisted right away
+    assert len(cache._pending_touches) == 1
+    cache.close()
+
+
+def test_row_count_tracks_database(tmp_path):
+    images = []
+    for i in range(5):
+        img = tmp_path / f"{i}.png"
+        make_image(img, (i + 1, i + 1))
+        images.append(img)
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite", max_entries=3) as cache:
+        for img in images:
+            cache.get_dimensions(img)
+            cache.get_dimensions(img)
+        assert len(cache) == 3
+        (count,) = cache._conn.execute("SELECT COUNT(*) FROM dimensions").fetchone()
+        assert count == 3
+
+    with ImageDimensionCache(tmp_path / "cache.sqlite", max_entries=3) as cache:
+        assert len(cache) == 3
+
+
+def test_row_count_with_concurrent_misses(tmp_path, monkeypatch):
+    img = tmp_path / "img.png"
+    make_image(img, (10, 20))
+    cache = ImageDimensionCache(tmp_path / "cache.sqlite")
+    read_dimensions = dimension_cache.get_image_dimensions
+    nested = []
+
+    def racing_read(path):
+        # Another thread misses the same image and flushes it while this one is still reading
+        if not nested:
+            nested.append(path)
+            cache.get_dimensions(path)
+            cache.flush()
+        return read_dimensions(path)
+
+    monkeypatch.setattr(dimension_cache, "get_image_dimensions", racing_read)
+    assert cache.get_dimensions(img) == (10, 20)
+    assert cache.misses == 2
+    assert len(cache) == 1
+    cache.close()
@@ -0,0 +1,40 @@
+import pytest
+
+from dagshub_annotation_converter.util import BufferedFileWriter
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("atomic", [False, True])
+def test_writes_files(tmp_path, workers, atomic):
+    with BufferedFileWriter(workers=workers, max_pending=3, atomic=atomic) as writer:
+        for i in range(20):
+            writer.write(tmp_path / f"dir{i % 3}" / "nested" / f"{i}.txt", f"file {i}\nline 2")
+
+    assert writer.files_written == 20
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.txt")) == sorted(
+        f"dir{i % 3}/nested/{i}.txt" for i in range(20)
+    )
+    for i in range(20):
+        assert (tmp_path / f"dir{i % 3}" / "nested" / f"{i}.txt").read_text() == f"file {i}\nline 2"
+    # No temporary files are left over
+    assert len(list(tmp_path.rglob("*.tmp"))) == 0
+
+
+def test_overwrites_atomically(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_text("old content")
+
+    with BufferedFileWriter(atomic=True) as writer:
+        writer.write(path, "new")
+
+    assert path.read_text() == "new"
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_raises_write_errors(tmp_path, workers):
+    (tmp_path / "file").write_text("")
+
+    with pytest.raises(OSError):
+        with BufferedFileWriter(workers=workers) as writer:
+            # The parent of the file is a file, so the directory can't be created
+            writer.write(tmp_path / "file" / "nested.txt", "content")
@@ -0,0 +1,46 @@
+import io
+
+import PIL.Image
+import pytest
+
+from dagshub_annotation_converter.util.image_dimensions import get_image_dimensions, probe_image_dimensions
+
+WIDTH = 37
+HEIGHT = 23
+
+
+@pytest.mark.parametrize(
+    "filename, mode, save_kwargs",
+    (
+        ("img.png", "RGB", {}),
+        ("img.jpg", "RGB", {}),
+        ("img_progressive.jpg", "RGB", {"progressive": True}),
+        ("img.webp", "RGB", {}),
+        ("img_lossless.webp", "RGB", {"lossless": True}),
+        ("img_alpha.webp", "RGBA", {}),
+        ("img.bmp", "RGB", {}),
+        ("img.gif", "RGB", {}),
+        ("img.tiff", "RGB", {}),
+        ("img_compressed.tiff", "RGB", {"compression": "tiff_lzw"}),
+    ),
+)
+def test_header_probing(tmp_path, filename, mode, save_kwargs):
+    path = tmp_path / filename
+    PIL.Image.new(mode, (WIDTH, HEIGHT)).save(path, **save_kwargs)
+
+    with open(path, "rb") as f:
+        assert probe_image_dimensions(f) == (WIDTH, HEIGHT)
+    assert get_image_dimensions(path) == (WIDTH, HEIGHT)
+
+
+def test_fallback_to_pil(tmp_path):
+    path = tmp_path / "img.ppm"
+    PIL.Image.new("RGB", (WIDTH, HEIGHT)).save(path)
+
+    with open(path, "rb") as f:
+        assert probe_image_dimensions(f) is None
+    assert get_image_dimensions(path) == (WIDTH, HEIGHT)
+
+
+def test_truncated_header():
+    assert probe_image_dimensions(io.BytesIO(b"\x89PNG\r\n\x1a\n")) is None
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from dagshub_annotation_converter.converters.yolo import annotations_to_string
+from dagshub_annotation_converter.formats.yolo import (
+    export_lookup,
+    import_bbox_from_string,
+    import_segmentation_from_string,
+    import_pose_from_string,
+)
+from dagshub_annotation_converter.formats.yolo.bulk import (
+    parse_bbox_labels,
+    parse_segmentation_labels,
+    parse_pose_labels,
+    parse_label_files,
+    import_annotations_from_text,
+)
+
+BBOX_TEXT = "0 0.75 0.75 0.5 0.5\n1 0.25 0.5 0.1 0.2\n"
+SEGMENTATION_TEXT = "0 0.1 0.1 0.5 0.1 0.5 0.5\n1 0.2 0.2 0.3 0.3 0.4 0.4 0.2 0.4\n"
+POSE_3DIM_TEXT = (
+    "0 0.75 0.75 0.5 0.5 0.5 0.5 1 0.75 0.75 0 0.5 0.75 1\n1 0.5 0.5 0.2 0.2 0.4 0.4 1 0.6 0.6 0 0.5 0.5 1\n"
+)
+POSE_2DIM_TEXT = "0 0.75 0.75 0.5 0.5 0.5 0.5 0.75 0.75 0.5 0.75\n"
+
+
+def test_parse_bbox_labels():
+    actual = parse_bbox_labels(BBOX_TEXT)
+
+    assert actual.class_ids.tolist() == [0, 1]
+    assert actual.boxes.tolist() == [[0.75, 0.75, 0.5, 0.5], [0.25, 0.5, 0.1, 0.2]]
+
+
+def test_parse_segmentation_labels():
+    actual = parse_segmentation_labels(SEGMENTATION_TEXT)
+
+    assert actual.class_ids.tolist() == [0, 1]
+    assert actual.offsets.tolist() == [0, 3, 7]
+    assert actual.points.shape == (7, 2)
+    assert actual.points[3].tolist() == [0.2, 0.2]
+
+
+def test_parse_pose_labels():
+    actual = parse_pose_labels(POSE_3DIM_TEXT, keypoint_dim=3)
+
+    assert actual.class_ids.tolist() == [0, 1]
+    assert actual.boxes[1].tolist() == [0.5, 0.5, 0.2, 0.2]
+    assert actual.offsets.tolist() == [0, 3, 6]
+    assert actual.points[1].tolist() == [0.75, 0.75]
+    assert actual.visibility.tolist() == [1, 0, 1, 1, 0, 1]
+
+
+def test_parse_empty_file():
+    actual = parse_bbox_labels("\n")
+
+    assert len(actual.class_ids) == 0
+    assert actual.boxes.shape == (0, 4)
+
+
+def test_malformed_line():
+    with pytest.raises(ValueError):
+        parse_segmentation_labels("0 0.1 0.1 0.5")
+
+
+def test_parse_label_files(tmp_path):
+    (tmp_path / "1.txt").write_text(BBOX_TEXT)
+    (tmp_path / "2.txt").write_text("")
+    (tmp_path / "3.txt").write_text("1 0.5 0.5 0.5 0.5")
+
+    arrays, file_offsets = parse_label_files([tmp_path / f"{i}.txt" for i in range(1, 4)], "bbox")
+
+    assert file_offsets.tolist() == [0, 2, 2, 3]
+    assert np.array_equal(arrays.class_ids, [0, 1, 1])
+
+
+@pytest.mark.parametrize(
+    "annotation_type, keypoint_dim, text, import_fn",
+    (
+        ("bbox", 3, BBOX_TEXT, import_bbox_from_string),
+        ("segmentation", 3, SEGMENTATION_TEXT, import_segmentation_from_string),
+        ("pose", 3, POSE_3DIM_TEXT, import_pose_from_string),
+        ("pose", 2, POSE_2DIM_TEXT, import_pose_from_string),
+    ),
+)
+def test_bulk_import_matches_line_import(yolo_context, annotation_type, keypoint_dim, text, import_fn):
+    yolo_context.annotation_type = annotation_type
+    yolo_context.keypoint_dim = keypoint_dim
+
+    expected = [import_fn(line, yolo_context, 100, 200).with_filename("img.jpg") for line in text.strip().split("\n")]
+    actual = import_annotations_from_text(text, yolo_context, 100, 200, filename="img.jpg")
+
+    assert actual == expected
+
+
+def test_bulk_import_unknown_category(yolo_context):
+    with pytest.raises(ValueError):
+        import_annotations_from_text("5 0.5 0.5 0.5 0.5", yolo_context, 100, 200)
+
+
+@pytest.mark.parametrize(
+    "annotation_type, keypoint_dim, text",
+    (
+        ("bbox", 3, BBOX_TEXT),
+        ("segmentation", 3, SEGMENTATION_TEXT),
+        ("pose", 3, POSE_3DIM_TEXT),
+        ("pose", 2, POSE_2DIM_TEXT),
+    ),
+)
+def test_fixed_precision_export_matches_line_export(yolo_context, annotation_type, keypoint_dim, text):
+    yolo_context.annotation_type = annotation_type
+    yolo_context.keypoint_dim = keypoint_dim
+    annotations = import_annotations_from_text(text, yolo_context, 100, 200, filename="img.jpg")
+    if annotation_type == "pose":
+        # Hidden points are left out of 2 dimensional poses
+        annotations[0].points[1].visible = False
+    yolo_context.float_precision = 3
+
+    expected = "\n".join(export_lookup[annotation_type](ann, yolo_context) for ann in annotations)
+    actual = annotations_to_string(annotations, yolo_context)
+
+    assert actual == expected
+
+
+def test_fixed_precision_export(yolo_context):
+    yolo_context.float_precision = 2
+    annotations = import_annotations_from_text(BBOX_TEXT, yolo_context, 100, 200, filename="img.jpg")
+
+    assert annotations_to_string(annotations, yolo_context) == "0 0.75 0.75 0.50 0.50\n1 0.25 0.50 0.10 0.20"
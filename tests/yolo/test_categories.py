@@ -0,0 +1,48 @@
+from dagshub_annotation_converter.formats.yolo.categories import Categories, Category
+
+
+def test_add_generates_next_id():
+    categories = Categories()
+    categories.add("cat")
+    categories.add("dog", 10)
+    bird = categories.add("bird")
+
+    assert bird.id == 11
+    assert categories[11] is bird
+    assert categories["bird"] is bird
+    assert len(categories) == 3
+
+
+def test_get_or_create():
+    categories = Categories()
+    cat = categories.get_or_create("cat")
+
+    assert categories.get_or_create("cat") is cat
+    assert categories.get_or_create("dog").id == 1
+    assert len(categories) == 2
+
+
+def test_from_mapping():
+    categories = Categories.from_mapping({3: "cat", 0: "dog"})
+
+    assert [(c.id, c.name) for c in categories] == [(3, "cat"), (0, "dog")]
+    assert categories["cat"].id == 3
+    assert categories.add("bird").id == 4
+
+
+def test_extend_with_names():
+    categories = Categories()
+    categories.add("cat", 5)
+
+    added = categories.extend(["dog", "bird"])
+
+    assert [(c.id, c.name) for c in added] == [(6, "dog"), (7, "bird")]
+    assert categories[7].name == "bird"
+    assert len(categories) == 3
+
+
+def test_lookups_built_from_constructor():
+    categories = Categories(categories=[Category(name="cat", id=0), Category(name="dog", id=4)])
+
+    assert categories["dog"].id == 4
+    assert categories.add("bird").id == 5
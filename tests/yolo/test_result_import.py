@@ -3,7 +3,7 @@ import numpy as np
 import torch
 from ultralytics.engine.results import Results
 
-from dagshub_annotation_converter.formats.yolo import import_yolo_result
+from dagshub_annotation_converter.formats.yolo import import_yolo_result, import_yolo_results
 from dagshub_annotation_converter.ir.image import (
     IRBBoxImageAnnotation,
     CoordinateStyle,
@@ -159,3 +159,20 @@ def test_pose_import(yolo_result):
         ),
     ]
     assert actual == expected
+
+
+@pytest.mark.parametrize("annotation_type", ("bbox", "segmentation", "pose"))
+def test_batch_import(yolo_result, annotation_type):
+    img = np.ndarray(shape=(200, 100, 3), dtype=np.uint8)
+    empty_result = Results(orig_img=img, path="empty.jpg", names={0: "cat", 1: "dog"}, boxes=torch.zeros((0, 6)))
+
+    actual = import_yolo_results(annotation_type, [yolo_result, yolo_result, empty_result])
+
+    expected = import_yolo_result(annotation_type, yolo_result)
+    assert len(expected) == 2
+    assert actual == [expected, expected, []]
+
+
+def test_batch_import_unknown_type(yolo_result):
+    with pytest.raises(ValueError):
+        import_yolo_results("ellipse", [yolo_result])  # type: ignore[arg-type]